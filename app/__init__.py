@@ -9,18 +9,62 @@ from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect, CSRFError
 from flask_login import LoginManager
 
-from .models import db, User
+from .models import db
+from .models.db import enforce_foreign_keys
 from .config import Config
+from .serialization import JSONProvider
+from .storage import storage
+from .jobs import jobs
+from .alignment import aligner
+from .middleware import metrics
+from .database import routing
+from .user_cache import CachedUser, user_cache
+from .passwords import passwords
+from .static_assets import assets
 from .api.auth import auth
 from .api.notes import notes
 from .api.experiments import experiments
+from .api.search import search
+from .api.sequences import sequences
+from .api.export import export
+from .api.imports import imports
+from .api.metrics import metrics_api
+from .api.stats import stats_api
+from .cli import (
+    assets_cli,
+    import_cli,
+    jobs_cli,
+    search_cli,
+    sequences_cli,
+    stats_cli,
+    steps_cli,
+    storage_cli,
+)
 
 app: Flask = Flask(__name__, static_folder="../frontend/dist", static_url_path="/")
 app.config.from_object(Config)
+app.json = JSONProvider(app)
+# Registered first so its before_request hook times the others too.
+metrics.init_app(app)
+# Before CSRFProtect, whose form check opens the request stream and so fixes
+# its size limit.
+storage.init_app(app)
 csrf = CSRFProtect(app)
 db.init_app(app)
+enforce_foreign_keys(app)
+routing.init_app(app)
+jobs.init_app(app)
+aligner.init_app(app)
+user_cache.init_app(app)
+passwords.init_app(app)
+assets.init_app(app)
 Migrate(app, db)
-CORS(app, origins=["http://localhost:8000"], supports_credentials=True)
+CORS(
+    app,
+    origins=["http://localhost:8000"],
+    supports_credentials=True,
+    expose_headers=["X-Next-Cursor", "Link", "ETag", "Last-Modified"],
+)
 
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -29,11 +73,26 @@ login_manager.init_app(app)
 app.register_blueprint(auth, url_prefix="/api/auth")
 app.register_blueprint(notes, url_prefix="/api/notes")
 app.register_blueprint(experiments, url_prefix="/api/experiments")
+app.register_blueprint(search, url_prefix="/api/search")
+app.register_blueprint(sequences, url_prefix="/api/sequences")
+app.register_blueprint(export, url_prefix="/api/export")
+app.register_blueprint(imports, url_prefix="/api/import")
+app.register_blueprint(metrics_api, url_prefix="/api/metrics")
+app.register_blueprint(stats_api, url_prefix="/api/stats")
+
+app.cli.add_command(search_cli)
+app.cli.add_command(steps_cli)
+app.cli.add_command(storage_cli)
+app.cli.add_command(jobs_cli)
+app.cli.add_command(sequences_cli)
+app.cli.add_command(import_cli)
+app.cli.add_command(assets_cli)
+app.cli.add_command(stats_cli)
 
 
 @login_manager.user_loader
-def load_user(user_id: str) -> User | None:
-    return User.query.get(uuid.UUID(user_id))
+def load_user(user_id: str) -> CachedUser | None:
+    return user_cache.get(uuid.UUID(user_id))
 
 
 @login_manager.unauthorized_handler
@@ -45,7 +104,7 @@ def unauthorized() -> tuple[Response, int]:
 def not_found(_) -> Response | tuple[Response, int]:
     if request.path.startswith("/api/"):
         return jsonify({"error": "Resource not found", "status_code": 404}), 404
-    return cast(Response, app.send_static_file("index.html"))
+    return assets.index()
 
 
 @app.errorhandler(CSRFError)
@@ -73,6 +132,11 @@ def handle_method_not_allowed(_) -> tuple[Response, int]:
     return jsonify({"error": "Method not allowed", "status_code": 405}), 405
 
 
+@app.errorhandler(413)
+def handle_payload_too_large(_) -> tuple[Response, int]:
+    return jsonify({"error": "Upload too large", "status_code": 413}), 413
+
+
 @app.errorhandler(500)
 def handle_server_error(e) -> tuple[Response, int]:
     app.logger.error(f"Server error: {str(e)}")
@@ -88,4 +152,4 @@ def react_root(path: str) -> tuple[Response, int] | Response:
             Response,
             app.send_from_directory("public", "favicon.ico"),  # pyright: ignore
         )
-    return cast(Response, app.send_static_file("index.html"))
+    return assets.index()
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from Bio.Align import substitution_matrices
+from sqlalchemy.exc import IntegrityError
+
+from workers.alignment import align
+
+from .models import db, AlignmentResult
+
+# Scoring options accepted from the API, with their types and defaults.
+SCORING = {
+    "mode": (str, "global"),
+    "match_score": ((int, float), 1.0),
+    "mismatch_score": ((int, float), -1.0),
+    "open_gap_score": ((int, float), -2.0),
+    "extend_gap_score": ((int, float), -0.5),
+    "substitution_matrix": ((str, type(None)), None),
+}
+MODES = ("global", "local")
+
+
+def scoring_options(data):
+    """Validate scoring options and fill in defaults."""
+    if not isinstance(data, dict):
+        raise ValueError("scoring must be an object")
+    unknown = set(data) - set(SCORING)
+    if unknown:
+        raise ValueError(f"Unknown scoring option: {sorted(unknown)[0]}")
+
+    options = {}
+    for name, (types, default) in SCORING.items():
+        value = data.get(name, default)
+        if isinstance(value, bool) or not isinstance(value, types):
+            raise ValueError(f"Invalid value for {name}")
+        options[name] = value
+    if options["mode"] not in MODES:
+        raise ValueError("mode must be 'global' or 'local'")
+    matrix = options["substitution_matrix"]
+    if matrix is not None and matrix not in substitution_matrices.load():
+        raise ValueError(f"Unknown substitution matrix: {matrix}")
+    return options
+
+
+def cache_key(target, query, options):
+    payload = json.dumps([target, query, options], sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+class AlignmentCache:
+    """In-process LRU in front of the alignment_results table."""
+
+    def __init__(self, size=256):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        result = db.session.scalar(
+            db.select(AlignmentResult.result).where(AlignmentResult.key == key)
+        )
+        if result is not None:
+            self._remember(key, result)
+        return result
+
+    def put(self, key, result):
+        self._remember(key, result)
+        try:
+            db.session.merge(AlignmentResult(key=key, result=result))
+            db.session.commit()
+        except IntegrityError:
+            # Another process stored the same alignment first.
+            db.session.rollback()
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+class Aligner:
+    """Aligns small inputs inline and larger ones in a process pool.
+
+    A request waits up to ALIGNMENT_TIME_BUDGET seconds for a pooled
+    alignment. If the budget runs out the worker carries on, and its result
+    is cached when it finishes, so repeating the request picks it up.
+    Identical requests in flight share one computation.
+    """
+
+    def __init__(self, app=None):
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.inline_cells = app.config["ALIGNMENT_INLINE_CELLS"]
+        self.time_budget = app.config["ALIGNMENT_TIME_BUDGET"]
+        self.max_workers = app.config["ALIGNMENT_WORKERS"]
+        self.cache = AlignmentCache(app.config["ALIGNMENT_CACHE_SIZE"])
+        app.extensions["aligner"] = self
+
+    def _executor(self):
+        # Created lazily, and again after a fork, like the job pool.
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._pending = {}
+                self._pid = os.getpid()
+            return self._pool
+
+    def align(self, target, query, options):
+        """Return ``(result, cached)``.
+
+        Raises concurrent.futures.TimeoutError when a pooled alignment runs
+        past the time budget.
+        """
+        key = cache_key(target, query, options)
+        result = self.cache.get(key)
+        if result is not None:
+            return result, True
+
+        if len(target) * len(query) <= self.inline_cells:
+            result = align(target, query, options)
+            self.cache.put(key, result)
+            return result, False
+
+        executor = self._executor()
+        with self._lock:
+            future = self._pending.get(key)
+            submitted = future is None
+            if submitted:
+                future = executor.submit(align, target, query, options)
+                self._pending[key] = future
+        if submitted:
+            future.add_done_callback(lambda future: self._store(key, future))
+        return future.result(timeout=self.time_budget), False
+
+    def _store(self, key, future):
+        with self._lock:
+            self._pending.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self.app.app_context():
+            self.cache.put(key, future.result())
+
+
+aligner = Aligner()
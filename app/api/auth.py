@@ -5,10 +5,19 @@ import traceback
 
 from app.models.user import User
 from app.models.db import db
+from app.passwords import HasherBusy, passwords
 
 auth = Blueprint("auth", __name__)
 
 
+def _busy():
+    return (
+        jsonify({"error": "Too many sign-ins in progress, please retry"}),
+        503,
+        {"Retry-After": "1"},
+    )
+
+
 @auth.route("/register", methods=["POST"])
 def signup():
     try:
@@ -42,6 +51,8 @@ def signup():
         login_user(new_user)
 
         return jsonify(new_user.to_dict()), 201
+    except HasherBusy:
+        return _busy()
     except Exception as e:
         print(f"Registration error: {str(e)}")
         print(traceback.format_exc())
@@ -62,9 +73,18 @@ def login():
         if not user or not user.check_password(data["password"]):
             return jsonify({"error": "Invalid credentials"}), 401
 
+        if passwords.needs_rehash(user.hashed_password):
+            try:
+                user.password = data["password"]
+                db.session.commit()
+            except HasherBusy:
+                pass  # Not worth failing a valid login; rehash next time
+
         login_user(user)
 
         return jsonify(user.to_dict()), 200
+    except HasherBusy:
+        return _busy()
     except Exception as e:
         print(f"Login error: {str(e)}")
         print(traceback.format_exc())
@@ -1,37 +1,467 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify, send_file, url_for
 from flask_login import current_user, login_required
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import load_only
 import uuid
+from collections import Counter, defaultdict
 from datetime import datetime
 
-from app.models import Experiment, ExperimentStep, ExperimentAttachment, db
+from app.models import (
+    AnalysisJob,
+    Experiment,
+    ExperimentStep,
+    ExperimentAttachment,
+    SequenceRecord,
+    db,
+)
+from app.models.notebook import CHILD_LOADERS
+from app.conditional import (
+    collection_validators,
+    not_modified,
+    precondition_failed,
+    resource_etag,
+    set_validators,
+)
+from app.pagination import keyset_page, list_view, page_headers
+from app.serialization import requested_fields
+from app.database import routing
+from app.stats import experiment_deltas, record_stats, status_change
+from app.bulk import batch_error, batch_result, chunked, parse_operations
+from app.storage import large_upload, storage
+from app.ordering import GAP, assign_positions, place_step, reposition
+from app.sequences import (
+    delete_records,
+    detect_format,
+    fetch_sequence,
+    ingest_attachment,
+)
+from workers.analyses import ANALYSES, ANALYSIS_OPTIONS
+from app.jobs import jobs
 
 experiments = Blueprint("experiments", __name__)
+routing.route(experiments)
+
+EDITABLE_FIELDS = [
+    "title",
+    "hypothesis",
+    "materials",
+    "methods",
+    "results",
+    "conclusion",
+    "references",
+]
+TITLE_LENGTH = Experiment.__table__.c.title.type.length
+
+
+@experiments.record_once
+def _check_load_strategy(state):
+    # Fail at startup, not as a 400 on the first experiments request.
+    strategy = state.app.config["EXPERIMENT_LOAD_STRATEGY"]
+    if strategy not in CHILD_LOADERS:
+        raise ValueError(
+            f"EXPERIMENT_LOAD_STRATEGY must be one of {', '.join(CHILD_LOADERS)}, "
+            f"not {strategy!r}"
+        )
+
+
+def _load_children(children=Experiment.EXTRA_FIELDS):
+    return Experiment.load_children(
+        current_app.config["EXPERIMENT_LOAD_STRATEGY"], children
+    )
+
+
+def _child_fields(fields):
+    if fields is None:
+        return Experiment.EXTRA_FIELDS
+    return tuple(name for name in fields if name in Experiment.EXTRA_FIELDS)
+
+
+def _status_timestamps(old_status, new_status, now):
+    if old_status != "in_progress" and new_status == "in_progress":
+        return {"started_at": now}
+    if old_status != "completed" and new_status == "completed":
+        return {"completed_at": now}
+    return {}
+
+
+def _fields_error(data):
+    for field in EDITABLE_FIELDS:
+        if data.get(field) is not None and not isinstance(data[field], str):
+            return f"{field} must be a string"
+    if len(data.get("title") or "") > TITLE_LENGTH:
+        return f"title must be at most {TITLE_LENGTH} characters"
+    return None
+
+
+def _status_error(status):
+    if status not in Experiment.STATUSES:
+        return f"status must be one of {', '.join(Experiment.STATUSES)}"
+    return None
+
+
+def _valid_timestamp(value):
+    # Step timestamps are ISO 8601 strings; null or "" leaves them unset.
+    if value is None or value == "":
+        return True
+    if not isinstance(value, str):
+        return False
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _steps_error(steps):
+    if not isinstance(steps, list):
+        return "steps must be a list"
+    for step_data in steps:
+        if not isinstance(step_data, dict) or not step_data.get("description"):
+            return "Each step needs a description"
+        if not all(
+            _valid_timestamp(step_data.get(field))
+            for field in ("started_at", "completed_at")
+        ):
+            return "Invalid step timestamp"
+    return None
+
+
+def _uuid_or_none(value):
+    try:
+        return uuid.UUID(str(value)) if value else None
+    except ValueError:
+        return None
+
+
+def _step_fields(step_data):
+    fields = {"description": step_data["description"]}
+    if "observation" in step_data:
+        fields["observation"] = step_data["observation"] or ""
+    for field in ("started_at", "completed_at"):
+        if field in step_data:
+            value = step_data[field]
+            fields[field] = datetime.fromisoformat(value) if value else None
+    return fields
+
+
+def _existing_steps(experiment_ids):
+    columns = (
+        ExperimentStep.id,
+        ExperimentStep.experiment_id,
+        ExperimentStep.position,
+        ExperimentStep.description,
+        ExperimentStep.observation,
+        ExperimentStep.started_at,
+        ExperimentStep.completed_at,
+    )
+    existing = defaultdict(dict)
+    for chunk in chunked(experiment_ids):
+        rows = db.session.execute(
+            db.select(*columns).where(ExperimentStep.experiment_id.in_(chunk))
+        )
+        for row in rows:
+            existing[row.experiment_id][row.id] = row
+    return existing
+
+
+def _diff_steps(experiment_id, existing, steps, now):
+    """Plan the writes that turn the ``existing`` step rows into ``steps``.
+
+    Incoming steps are matched to existing rows by id. A matched row keeps its
+    id and created_at, and only the columns that differ are updated. Unmatched
+    steps are inserted, and rows missing from the payload are deleted.
+    """
+    matched, kept = [], set()
+    for step_data in steps:
+        current = existing.get(_uuid_or_none(step_data.get("id")))
+        if current is not None and current.id in kept:
+            current = None
+        if current is not None:
+            kept.add(current.id)
+        matched.append(current)
+
+    positions = assign_positions(
+        [current.position if current else None for current in matched]
+    )
+
+    inserts, updates = [], []
+    for step_data, current, position in zip(steps, matched, positions):
+        fields = _step_fields(step_data)
+        fields["position"] = position
+
+        if current is None:
+            inserts.append(
+                {
+                    "id": uuid.uuid4(),
+                    "experiment_id": experiment_id,
+                    "observation": "",
+                    "started_at": None,
+                    "completed_at": None,
+                    **fields,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            continue
+
+        changes = {
+            field: value
+            for field, value in fields.items()
+            if getattr(current, field) != value
+        }
+        if changes:
+            updates.append({"id": current.id, **changes, "updated_at": now})
+
+    deletes = [step_id for step_id in existing if step_id not in kept]
+    return inserts, updates, deletes
+
+
+def _apply_step_writes(inserts, updates, deletes):
+    for chunk in chunked(deletes):
+        db.session.execute(
+            db.delete(ExperimentStep)
+            .where(ExperimentStep.id.in_(chunk))
+            .execution_options(synchronize_session=False)
+        )
+
+    moves = [
+        {"id": update["id"], "position": update.pop("position")}
+        for update in updates
+        if "position" in update
+    ]
+    reposition(moves)
+
+    updates = [update for update in updates if update.keys() - {"id", "updated_at"}]
+    if updates:
+        db.session.execute(db.update(ExperimentStep), updates)
+    if inserts:
+        db.session.execute(db.insert(ExperimentStep), inserts)
 
 
 @experiments.route("", methods=["GET"])
 @login_required
 def get_experiments():
-    user_experiments = (
-        Experiment.query.filter_by(user_id=current_user.id)
-        .order_by(Experiment.updated_at.desc())
-        .all()
+    try:
+        view = list_view()
+        fields = requested_fields(Experiment)
+
+        etag, last_modified = collection_validators(
+            Experiment, Experiment.user_id == current_user.id
+        )
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+
+        query = Experiment.query.filter_by(user_id=current_user.id)
+
+        if fields is None and view == "summary":
+            fields = Experiment.SUMMARY_COLUMNS
+        if fields is not None:
+            columns = Experiment.field_columns(fields)
+            query = query.options(load_only(*columns, Experiment.updated_at))
+        children = _child_fields(fields)
+        if children:
+            query = query.options(*_load_children(children))
+
+        user_experiments, next_cursor = keyset_page(query, Experiment)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if children:
+        body = [experiment.to_dict(fields=fields) for experiment in user_experiments]
+    else:
+        body = Experiment.plan(fields).many(user_experiments)
+
+    response = set_validators(jsonify(body), etag, last_modified)
+    return response, 200, page_headers(next_cursor)
+
+
+@experiments.route("/batch", methods=["POST"])
+@login_required
+def batch_experiments():
+    try:
+        operations, results = parse_operations(
+            request.json, current_app.config["BATCH_MAX_OPERATIONS"]
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    statuses = {}
+    for chunk in chunked([row_id for _, op, row_id, _ in operations if row_id]):
+        statuses.update(
+            db.session.execute(
+                db.select(Experiment.id, Experiment.status).where(
+                    Experiment.id.in_(chunk), Experiment.user_id == current_user.id
+                )
+            ).all()
+        )
+
+    existing_steps = _existing_steps(
+        [
+            row_id
+            for _, op, row_id, data in operations
+            if op == "update" and "steps" in data and row_id in statuses
+        ]
     )
-    return jsonify([experiment.to_dict() for experiment in user_experiments]), 200
+
+    now = datetime.utcnow()
+    creates, updates, deletes = [], [], []
+    step_inserts, step_updates, step_deletes = [], [], []
+    deltas = Counter()
+
+    for index, op, row_id, data in operations:
+        if op != "create" and row_id not in statuses:
+            results[index] = batch_error(index, "Experiment not found", 404)
+            continue
+
+        if op == "delete":
+            deletes.append(row_id)
+            deltas.update(experiment_deltas([statuses[row_id]], sign=-1))
+            results[index] = batch_result(index, row_id, 200)
+            continue
+
+        required = ("title", "hypothesis", "methods")
+        if op == "create" and not all(data.get(field) for field in required):
+            results[index] = batch_error(index, "Missing required fields")
+            continue
+        if any(not data[field] for field in required if field in data):
+            results[index] = batch_error(
+                index, "title, hypothesis and methods cannot be empty"
+            )
+            continue
+        fields_error = _fields_error(data)
+        if fields_error:
+            results[index] = batch_error(index, fields_error)
+            continue
+        status_error = _status_error(data["status"]) if "status" in data else None
+        if status_error:
+            results[index] = batch_error(index, status_error)
+            continue
+        steps_error = _steps_error(data["steps"]) if "steps" in data else None
+        if steps_error:
+            results[index] = batch_error(index, steps_error)
+            continue
+
+        row = {field: data[field] for field in EDITABLE_FIELDS if field in data}
+        row["updated_at"] = now
+
+        if op == "create":
+            row_id = uuid.uuid4()
+            status = data.get("status", "planned")
+            row.update(
+                id=row_id,
+                user_id=current_user.id,
+                status=status,
+                created_at=now,
+                **_status_timestamps(None, status, now),
+            )
+            row.setdefault("materials", "")
+        else:
+            row["id"] = row_id
+            if "status" in data:
+                row["status"] = data["status"]
+                old_status = statuses[row_id]
+                row.update(_status_timestamps(old_status, data["status"], now))
+
+        if "steps" in data:
+            inserts, changes, removed = _diff_steps(
+                row_id, existing_steps.get(row_id, {}), data["steps"], now
+            )
+            step_inserts.extend(inserts)
+            step_updates.extend(changes)
+            step_deletes.extend(removed)
+
+        if op == "create":
+            creates.append(row)
+            deltas.update(experiment_deltas([row["status"]]))
+            results[index] = batch_result(index, row_id, 201)
+        else:
+            updates.append(row)
+            if "status" in data:
+                deltas.update(status_change(statuses[row_id], data["status"]))
+            results[index] = batch_result(index, row_id, 200)
+
+    try:
+        for chunk in chunked(deletes):
+            attachment_ids = db.select(ExperimentAttachment.id).where(
+                ExperimentAttachment.experiment_id.in_(chunk)
+            )
+            delete_records(
+                db.select(SequenceRecord.id).where(
+                    SequenceRecord.attachment_id.in_(attachment_ids)
+                )
+            )
+            db.session.execute(
+                db.delete(AnalysisJob)
+                .where(AnalysisJob.experiment_id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.execute(
+                db.delete(ExperimentStep)
+                .where(ExperimentStep.experiment_id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.execute(
+                db.delete(ExperimentAttachment)
+                .where(ExperimentAttachment.experiment_id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.execute(
+                db.delete(Experiment)
+                .where(Experiment.id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+        if creates:
+            db.session.execute(db.insert(Experiment), creates)
+        if updates:
+            db.session.execute(db.update(Experiment), updates)
+        _apply_step_writes(step_inserts, step_updates, step_deletes)
+        record_stats(current_user.id, deltas)
+
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Experiment batch error: {str(e)}")
+        return jsonify({"error": "An error occurred while applying the batch"}), 500
+
+    return jsonify([results[index] for index in sorted(results)]), 200
 
 
 @experiments.route("/<experiment_id>", methods=["GET"])
 @login_required
 def get_experiment(experiment_id):
+    try:
+        fields = requested_fields(Experiment)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     try:
         experiment_uuid = uuid.UUID(experiment_id)
-        experiment = Experiment.query.filter_by(
-            id=experiment_uuid, user_id=current_user.id
-        ).first()
+        updated_at = (
+            db.session.query(Experiment.updated_at)
+            .filter_by(id=experiment_uuid, user_id=current_user.id)
+            .scalar()
+        )
+
+        if not updated_at:
+            return jsonify({"error": "Experiment not found"}), 404
+
+        etag = resource_etag(experiment_uuid, updated_at)
+        cached = not_modified(etag, updated_at)
+        if cached:
+            return cached
+
+        experiment = (
+            Experiment.query.options(*_load_children(_child_fields(fields)))
+            .filter_by(id=experiment_uuid, user_id=current_user.id)
+            .first()
+        )
 
         if not experiment:
             return jsonify({"error": "Experiment not found"}), 404
 
-        return jsonify(experiment.to_dict()), 200
+        response = jsonify(experiment.to_dict(fields=fields))
+        return set_validators(response, etag, experiment.updated_at), 200
     except ValueError:
         return jsonify({"error": "Invalid experiment ID format"}), 400
 
@@ -49,25 +479,34 @@ def create_experiment():
     ):
         return jsonify({"error": "Missing required fields"}), 400
 
+    error = _fields_error(data) or _status_error(data.get("status", "planned"))
+    if not error and data.get("steps"):
+        error = _steps_error(data["steps"])
+    if error:
+        return jsonify({"error": error}), 400
+
+    status = data.get("status", "planned")
     new_experiment = Experiment(
         user_id=current_user.id,
         title=data["title"],
         hypothesis=data["hypothesis"],
         materials=data.get("materials", ""),
         methods=data["methods"],
-        status="planned",
+        status=status,
+        **_status_timestamps(None, status, datetime.utcnow()),
     )
 
     if data.get("steps"):
         for i, step_data in enumerate(data["steps"]):
             step = ExperimentStep(
-                step_number=i + 1,
+                position=GAP * (i + 1),
                 description=step_data["description"],
                 observation=step_data.get("observation", ""),
             )
             new_experiment.steps.append(step)
 
     db.session.add(new_experiment)
+    record_stats(current_user.id, experiment_deltas([new_experiment.status]))
     db.session.commit()
 
     return jsonify(new_experiment.to_dict()), 201
@@ -90,54 +529,55 @@ def update_experiment(experiment_id):
         if not experiment:
             return jsonify({"error": "Experiment not found"}), 404
 
-        for field in [
-            "title",
-            "hypothesis",
-            "materials",
-            "methods",
-            "results",
-            "conclusion",
-            "references",
-        ]:
+        conflict = precondition_failed(
+            resource_etag(experiment.id, experiment.updated_at)
+        )
+        if conflict:
+            return conflict
+
+        error = _fields_error(data)
+        if not error and "status" in data:
+            error = _status_error(data["status"])
+        if not error and "steps" in data:
+            error = _steps_error(data["steps"])
+        if error:
+            return jsonify({"error": error}), 400
+
+        for field in EDITABLE_FIELDS:
             if field in data:
                 setattr(experiment, field, data[field])
 
         if "status" in data:
-            old_status = experiment.status
-            new_status = data["status"]
-            experiment.status = new_status
-
-            if old_status != "in_progress" and new_status == "in_progress":
-                experiment.started_at = datetime.utcnow()
-            elif old_status != "completed" and new_status == "completed":
-                experiment.completed_at = datetime.utcnow()
+            timestamps = _status_timestamps(
+                experiment.status, data["status"], datetime.utcnow()
+            )
+            record_stats(
+                current_user.id, status_change(experiment.status, data["status"])
+            )
+            experiment.status = data["status"]
+            for field, value in timestamps.items():
+                setattr(experiment, field, value)
 
         if "steps" in data:
-            for step in experiment.steps:
-                db.session.delete(step)
-
-            for i, step_data in enumerate(data["steps"]):
-                step = ExperimentStep(
-                    experiment_id=experiment.id,
-                    step_number=i + 1,
-                    description=step_data["description"],
-                    observation=step_data.get("observation", ""),
-                    started_at=(
-                        datetime.fromisoformat(step_data["started_at"])
-                        if step_data.get("started_at")
-                        else None
-                    ),
-                    completed_at=(
-                        datetime.fromisoformat(step_data["completed_at"])
-                        if step_data.get("completed_at")
-                        else None
-                    ),
-                )
-                experiment.steps.append(step)
+            now = datetime.utcnow()
+            existing = _existing_steps([experiment.id])[experiment.id]
+            _apply_step_writes(
+                *_diff_steps(experiment.id, existing, data["steps"], now)
+            )
+            experiment.updated_at = now
 
         db.session.commit()
 
-        return jsonify(experiment.to_dict()), 200
+        experiment = (
+            Experiment.query.options(*_load_children())
+            .populate_existing()
+            .filter_by(id=experiment.id)
+            .one()
+        )
+
+        response = jsonify(experiment.to_dict())
+        etag = resource_etag(experiment.id, experiment.updated_at)
+        return set_validators(response, etag, experiment.updated_at), 200
     except ValueError:
         return jsonify({"error": "Invalid experiment ID format"}), 400
     except Exception as e:
@@ -157,6 +597,7 @@ def delete_experiment(experiment_id):
             return jsonify({"error": "Experiment not found"}), 404
 
         db.session.delete(experiment)
+        record_stats(current_user.id, experiment_deltas([experiment.status], sign=-1))
         db.session.commit()
 
         return jsonify({"message": "Experiment deleted successfully"}), 200
@@ -181,21 +622,24 @@ def add_experiment_step(experiment_id):
         if not experiment:
             return jsonify({"error": "Experiment not found"}), 404
 
-        highest_step = (
-            db.session.query(db.func.max(ExperimentStep.step_number))
-            .filter_by(experiment_id=experiment.id)
-            .scalar()
-            or 0
-        )
+        after_step_id = _uuid_or_none(data.get("after_step_id"))
+        if data.get("after_step_id") and not after_step_id:
+            return jsonify({"error": "Invalid step ID format"}), 400
 
         new_step = ExperimentStep(
             experiment_id=experiment.id,
-            step_number=highest_step + 1,
             description=data["description"],
             observation=data.get("observation", ""),
         )
 
-        db.session.add(new_step)
+        try:
+            place_step(new_step, after_step_id, append="after_step_id" not in data)
+        except LookupError:
+            return jsonify({"error": "Step not found"}), 404
+        except IntegrityError:
+            return jsonify({"error": "Steps changed concurrently, retry"}), 409
+
+        experiment.updated_at = datetime.utcnow()
         db.session.commit()
 
         return jsonify(new_step.to_dict()), 201
@@ -203,6 +647,50 @@ def add_experiment_step(experiment_id):
         return jsonify({"error": "Invalid experiment ID format"}), 400
 
 
+@experiments.route("/<experiment_id>/steps/<step_id>/move", methods=["POST"])
+@login_required
+def move_experiment_step(experiment_id, step_id):
+    data = request.json
+
+    if not data or "after_step_id" not in data:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    try:
+        experiment_uuid = uuid.UUID(experiment_id)
+        step_uuid = uuid.UUID(step_id)
+        after_step_id = (
+            uuid.UUID(str(data["after_step_id"])) if data["after_step_id"] else None
+        )
+        if after_step_id == step_uuid:
+            return jsonify({"error": "A step cannot follow itself"}), 400
+
+        experiment = Experiment.query.filter_by(
+            id=experiment_uuid, user_id=current_user.id
+        ).first()
+        if not experiment:
+            return jsonify({"error": "Experiment not found"}), 404
+
+        step = ExperimentStep.query.filter_by(
+            id=step_uuid, experiment_id=experiment.id
+        ).first()
+        if not step:
+            return jsonify({"error": "Step not found"}), 404
+
+        try:
+            place_step(step, after_step_id)
+        except LookupError:
+            return jsonify({"error": "Step not found"}), 404
+        except IntegrityError:
+            return jsonify({"error": "Steps changed concurrently, retry"}), 409
+
+        experiment.updated_at = datetime.utcnow()
+        db.session.commit()
+
+        return jsonify(step.to_dict()), 200
+    except ValueError:
+        return jsonify({"error": "Invalid ID format"}), 400
+
+
 @experiments.route("/<experiment_id>/steps/<step_id>", methods=["PUT"])
 @login_required
 def update_experiment_step(experiment_id, step_id):
@@ -237,6 +725,7 @@ def update_experiment_step(experiment_id, step_id):
         if "completed_at" in data and data["completed_at"]:
             step.completed_at = datetime.fromisoformat(data["completed_at"])
 
+        experiment.updated_at = datetime.utcnow()
         db.session.commit()
 
         return jsonify(step.to_dict()), 200
@@ -263,14 +752,8 @@ def delete_experiment_step(experiment_id, step_id):
         if not step:
             return jsonify({"error": "Step not found"}), 404
 
-        step_number = step.step_number
-
         db.session.delete(step)
-
-        for s in experiment.steps:
-            if s.step_number > step_number:
-                s.step_number -= 1
-
+        experiment.updated_at = datetime.utcnow()
         db.session.commit()
 
         return jsonify({"message": "Step deleted successfully"}), 200
@@ -278,10 +761,58 @@ def delete_experiment_step(experiment_id, step_id):
         return jsonify({"error": "Invalid ID format"}), 400
 
 
+def _get_attachment(experiment_uuid, attachment_uuid):
+    return (
+        ExperimentAttachment.query.join(Experiment)
+        .filter(
+            ExperimentAttachment.id == attachment_uuid,
+            ExperimentAttachment.experiment_id == experiment_uuid,
+            Experiment.user_id == current_user.id,
+        )
+        .first()
+    )
+
+
+def _content_url(attachment):
+    return url_for(
+        "experiments.download_attachment_content",
+        experiment_id=attachment.experiment_id,
+        attachment_id=attachment.id,
+    )
+
+
+def _index_sequences(attachment):
+    # Index FASTA/GenBank uploads as they arrive. A file that fails to parse is
+    # still stored; it can be re-ingested through the sequences API.
+    if not detect_format(attachment.file_name):
+        return
+    try:
+        with db.session.begin_nested():
+            ingest_attachment(attachment, current_user.id)
+    except ValueError as e:
+        current_app.logger.warning(
+            f"Could not index sequences in attachment {attachment.id}: {str(e)}"
+        )
+
+
 @experiments.route("/<experiment_id>/attachments", methods=["POST"])
+@large_upload
 @login_required
 def add_experiment_attachment(experiment_id):
-    data = request.json
+    upload = None
+    if request.mimetype == "multipart/form-data":
+        upload = request.files.get("file")
+        if not upload or not upload.filename:
+            return jsonify({"error": "Missing file"}), 400
+        data = {
+            "file_name": request.form.get("file_name") or upload.filename,
+            "file_type": request.form.get("file_type")
+            or upload.mimetype
+            or "application/octet-stream",
+            "description": request.form.get("description", ""),
+        }
+    else:
+        data = request.json
 
     if not data or not data.get("file_name") or not data.get("file_type"):
         return jsonify({"error": "Missing required fields"}), 400
@@ -296,6 +827,7 @@ def add_experiment_attachment(experiment_id):
             return jsonify({"error": "Experiment not found"}), 404
 
         new_attachment = ExperimentAttachment(
+            id=uuid.uuid4(),
             experiment_id=experiment.id,
             file_name=data["file_name"],
             file_type=data["file_type"],
@@ -305,7 +837,16 @@ def add_experiment_attachment(experiment_id):
             description=data.get("description", ""),
         )
 
+        if upload:
+            digest, size = storage.save(upload.stream)
+            new_attachment.sha256 = digest
+            new_attachment.size_bytes = size
+            new_attachment.file_path = _content_url(new_attachment)
+
         db.session.add(new_attachment)
+        if upload:
+            _index_sequences(new_attachment)
+        experiment.updated_at = datetime.utcnow()
         db.session.commit()
 
         return jsonify(new_attachment.to_dict()), 201
@@ -313,6 +854,70 @@ def add_experiment_attachment(experiment_id):
         return jsonify({"error": "Invalid experiment ID format"}), 400
 
 
+@experiments.route(
+    "/<experiment_id>/attachments/<attachment_id>/content", methods=["PUT"]
+)
+@large_upload
+@login_required
+def upload_attachment_content(experiment_id, attachment_id):
+    try:
+        attachment = _get_attachment(
+            uuid.UUID(experiment_id), uuid.UUID(attachment_id)
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid ID format"}), 400
+
+    if not attachment:
+        return jsonify({"error": "Attachment not found"}), 404
+
+    # Read the raw (possibly chunked) body straight into the store.
+    digest, size = storage.save(request.stream)
+
+    attachment.sha256 = digest
+    attachment.size_bytes = size
+    attachment.file_path = _content_url(attachment)
+    _index_sequences(attachment)
+    attachment.experiment.updated_at = datetime.utcnow()
+    db.session.commit()
+
+    return jsonify(attachment.to_dict()), 200
+
+
+@experiments.route(
+    "/<experiment_id>/attachments/<attachment_id>/content", methods=["GET"]
+)
+@login_required
+def download_attachment_content(experiment_id, attachment_id):
+    try:
+        attachment = _get_attachment(
+            uuid.UUID(experiment_id), uuid.UUID(attachment_id)
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid ID format"}), 400
+
+    if not attachment:
+        return jsonify({"error": "Attachment not found"}), 404
+    if not attachment.sha256 or not storage.exists(attachment.sha256):
+        return jsonify({"error": "Attachment has no stored content"}), 404
+
+    # conditional=True answers Range and If-None-Match requests, and the file
+    # is handed to the server's wsgi.file_wrapper (sendfile under gunicorn).
+    # The type is whatever the uploader claimed, so the file is never shown
+    # inline or sniffed as something else by the browser.
+    response = send_file(
+        storage.path(attachment.sha256),
+        mimetype=attachment.file_type,
+        as_attachment=True,
+        download_name=attachment.file_name,
+        conditional=True,
+        etag=attachment.sha256,
+        last_modified=attachment.created_at,
+    )
+    response.cache_control.private = True
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    return response
+
+
 @experiments.route("/<experiment_id>/attachments/<attachment_id>", methods=["DELETE"])
 @login_required
 def delete_experiment_attachment(experiment_id, attachment_id):
@@ -333,8 +938,184 @@ def delete_experiment_attachment(experiment_id, attachment_id):
             return jsonify({"error": "Attachment not found"}), 404
 
         db.session.delete(attachment)
+        experiment.updated_at = datetime.utcnow()
         db.session.commit()
 
         return jsonify({"message": "Attachment deleted successfully"}), 200
     except ValueError:
         return jsonify({"error": "Invalid ID format"}), 400
+
+
+def _job_options(kind, options):
+    allowed = ANALYSIS_OPTIONS[kind]
+    if not isinstance(options, dict):
+        return None, "options must be an object"
+    for name, value in options.items():
+        if name not in allowed:
+            return None, f"Unknown option for {kind}: {name}"
+        if not isinstance(value, allowed[name]) or isinstance(value, bool):
+            return None, f"{name} must be of type {allowed[name].__name__}"
+    return options, None
+
+
+def _job_sequence(data):
+    """Resolve a job's input to ``(sequence, params)`` or raise LookupError."""
+    if data.get("sequence_id"):
+        try:
+            sequence_uuid = uuid.UUID(data["sequence_id"])
+        except ValueError as e:
+            raise ValueError("Invalid sequence ID format") from e
+        record = SequenceRecord.query.filter_by(
+            id=sequence_uuid, user_id=current_user.id
+        ).first()
+        if not record or not storage.exists(record.attachment.sha256):
+            raise LookupError("Sequence not found")
+
+        start, end = data.get("start", 0), data.get("end")
+        if not isinstance(start, int) or not isinstance(end, (int, type(None))):
+            raise ValueError("start and end must be integers")
+        sequence = fetch_sequence(record, start, end)
+        return sequence, {"sequence_id": str(record.id), "start": start, "end": end}
+
+    sequence = data.get("sequence")
+    if not isinstance(sequence, str) or not sequence.isalpha():
+        raise ValueError("Missing sequence or sequence_id")
+    return sequence, {"sequence_length": len(sequence)}
+
+
+def _get_job(experiment_id, job_id):
+    return AnalysisJob.query.filter_by(
+        id=uuid.UUID(job_id),
+        experiment_id=uuid.UUID(experiment_id),
+        user_id=current_user.id,
+    ).first()
+
+
+@experiments.route("/<experiment_id>/jobs", methods=["POST"])
+@login_required
+def submit_experiment_job(experiment_id):
+    data = request.json
+    if not data or data.get("kind") not in ANALYSES:
+        return jsonify({"error": "kind must be one of: " + ", ".join(ANALYSES)}), 400
+
+    options, error = _job_options(data["kind"], data.get("options", {}))
+    if error:
+        return jsonify({"error": error}), 400
+
+    try:
+        experiment_uuid = uuid.UUID(experiment_id)
+    except ValueError:
+        return jsonify({"error": "Invalid experiment ID format"}), 400
+
+    experiment = Experiment.query.filter_by(
+        id=experiment_uuid, user_id=current_user.id
+    ).first()
+    if not experiment:
+        return jsonify({"error": "Experiment not found"}), 404
+
+    try:
+        sequence, params = _job_sequence(data)
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    job = AnalysisJob(
+        id=uuid.uuid4(),
+        user_id=current_user.id,
+        experiment_id=experiment.id,
+        kind=data["kind"],
+        params={**params, "options": options},
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    try:
+        jobs.submit(job, sequence, options)
+    except Exception as e:
+        current_app.logger.error(f"Job submit error: {str(e)}")
+        job.status = "failed"
+        job.error = "Could not start job"
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return jsonify(job.to_dict()), 503
+
+    location = url_for(
+        "experiments.get_experiment_job", experiment_id=experiment.id, job_id=job.id
+    )
+    return jsonify(job.to_dict()), 202, {"Location": location}
+
+
+@experiments.route("/<experiment_id>/jobs", methods=["GET"])
+@login_required
+def get_experiment_jobs(experiment_id):
+    try:
+        experiment_uuid = uuid.UUID(experiment_id)
+    except ValueError:
+        return jsonify({"error": "Invalid experiment ID format"}), 400
+
+    query = AnalysisJob.query.filter_by(
+        experiment_id=experiment_uuid, user_id=current_user.id
+    )
+    if "status" in request.args:
+        query = query.filter(AnalysisJob.status.in_(request.args.getlist("status")))
+
+    try:
+        job_list, next_cursor = keyset_page(query, AnalysisJob, AnalysisJob.created_at)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify([job.to_dict() for job in job_list]), 200, page_headers(next_cursor)
+
+
+@experiments.route("/<experiment_id>/jobs/<job_id>", methods=["GET"])
+@login_required
+def get_experiment_job(experiment_id, job_id):
+    try:
+        job = _get_job(experiment_id, job_id)
+    except ValueError:
+        return jsonify({"error": "Invalid ID format"}), 400
+
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    # Clients poll this until the job finishes.
+    response = jsonify(job.to_dict())
+    response.cache_control.no_store = True
+    return response, 200
+
+
+@experiments.route("/<experiment_id>/jobs/<job_id>/result", methods=["GET"])
+@login_required
+def get_experiment_job_result(experiment_id, job_id):
+    try:
+        job = _get_job(experiment_id, job_id)
+    except ValueError:
+        return jsonify({"error": "Invalid ID format"}), 400
+
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if job.status != "succeeded":
+        return jsonify({"error": f"Job is {job.status}", "status": job.status}), 409
+
+    return jsonify(job.result), 200
+
+
+@experiments.route("/<experiment_id>/jobs/<job_id>", methods=["DELETE"])
+@login_required
+def cancel_experiment_job(experiment_id, job_id):
+    try:
+        job = _get_job(experiment_id, job_id)
+    except ValueError:
+        return jsonify({"error": "Invalid ID format"}), 400
+
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if job.finished:
+        return jsonify({"error": f"Job is already {job.status}"}), 409
+
+    # The process running the job picks the request up on its next poll.
+    job.cancel_requested = True
+    db.session.commit()
+
+    return jsonify(job.to_dict()), 202
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_login import current_user, login_required
+
+from app.export import export_ndjson, export_zip
+
+export = Blueprint("export", __name__)
+
+FORMATS = {
+    "ndjson": (export_ndjson, "application/x-ndjson"),
+    "zip": (export_zip, "application/zip"),
+}
+
+
+@export.route("", methods=["GET"])
+@login_required
+def export_notebook():
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in FORMATS:
+        return jsonify({"error": "format must be 'ndjson' or 'zip'"}), 400
+
+    generate, mimetype = FORMATS[export_format]
+    file_name = f"notebook-{datetime.utcnow():%Y%m%d-%H%M%S}.{export_format}"
+    # stream_with_context keeps the request, and so the database session,
+    # alive while the body is generated.
+    response = Response(
+        stream_with_context(generate(current_user.id)), mimetype=mimetype
+    )
+    response.headers["Content-Disposition"] = f'attachment; filename="{file_name}"'
+    response.headers["X-Accel-Buffering"] = "no"
+    response.cache_control.no_store = True
+    return response
@@ -0,0 +1,44 @@
+from flask import Blueprint, current_app, request, jsonify
+from flask_login import current_user, login_required
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models import db
+from app.importer import KINDS, detect_format, import_rows
+from app.storage import large_upload
+
+imports = Blueprint("imports", __name__)
+
+
+@imports.route("/<kind>", methods=["POST"])
+@large_upload
+@login_required
+def import_file(kind):
+    if kind not in KINDS:
+        return jsonify({"error": "kind must be 'notes' or 'experiments'"}), 404
+
+    upload = request.files.get("file")
+    if upload is None or not upload.filename:
+        return jsonify({"error": "No file provided"}), 400
+
+    file_format = request.args.get("format") or detect_format(upload.filename)
+    if file_format is None:
+        return jsonify({"error": "Could not detect the file format"}), 400
+    dry_run = request.args.get("dry_run", "").lower() in ("1", "true")
+
+    try:
+        summary = import_rows(
+            upload.stream, file_format, kind, current_user.id, dry_run=dry_run
+        )
+    except (ValueError, UnicodeDecodeError) as e:
+        db.session.rollback()
+        return jsonify({"error": f"Could not parse file: {e}"}), 400
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Import error: {str(e)}")
+        return jsonify({"error": "An error occurred while importing"}), 500
+
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    return jsonify(summary), 200
@@ -0,0 +1,18 @@
+import hmac
+
+from flask import Blueprint, Response, current_app, request, jsonify
+
+from app.middleware import metrics
+
+metrics_api = Blueprint("metrics", __name__)
+
+
+@metrics_api.route("", methods=["GET"])
+def get_metrics():
+    token = current_app.config["METRICS_TOKEN"]
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return jsonify({"error": "Unauthorized", "status_code": 401}), 401
+
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
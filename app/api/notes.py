@@ -1,35 +1,260 @@
 import uuid
+from datetime import datetime
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_login import current_user, login_required
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import load_only
 
-from app.models import Note, db
+from app.models import Note, Tag, note_tags, db
+from app.conditional import (
+    collection_validators,
+    not_modified,
+    precondition_failed,
+    resource_etag,
+    set_validators,
+)
+from app.pagination import keyset_page, list_view, page_headers
+from app.serialization import requested_fields
+from app.database import routing
+from app.stats import record_stats
+from app.bulk import (
+    batch_error,
+    batch_result,
+    chunked,
+    parse_operations,
+    resolve_tag_ids,
+    select_ids,
+)
 
 notes = Blueprint("notes", __name__)
+routing.route(notes)
+
+
+TITLE_LENGTH = Note.__table__.c.title.type.length
+
+
+def _fields_error(data):
+    for field in ("title", "content"):
+        if field in data and not isinstance(data[field], str):
+            return f"{field} must be a string"
+    if len(data.get("title") or "") > TITLE_LENGTH:
+        return f"title must be at most {TITLE_LENGTH} characters"
+    return _tags_error(data.get("tags"))
+
+
+def _tags_error(tags):
+    if tags is None:
+        return None
+    if not isinstance(tags, list):
+        return "tags must be a list"
+    for tag in tags:
+        if not isinstance(tag, str) or "," in tag:
+            return "Tags must be strings without commas"
+        if len(tag.strip()) > Tag.MAX_LENGTH:
+            return f"Tags must be at most {Tag.MAX_LENGTH} characters"
+    return None
+
+
+def _tagged_note_ids(tags, match_all):
+    query = (
+        db.select(note_tags.c.note_id)
+        .join(Tag, Tag.id == note_tags.c.tag_id)
+        .where(Tag.user_id == current_user.id, Tag.name.in_(tags))
+        .group_by(note_tags.c.note_id)
+    )
+    if match_all:
+        query = query.having(db.func.count() == len(tags))
+    return query
+
+
+def _replace_note_tags(tag_sets):
+    tag_ids = resolve_tag_ids(
+        current_user.id, {name for names in tag_sets.values() for name in names}
+    )
+
+    for chunk in chunked(list(tag_sets)):
+        db.session.execute(db.delete(note_tags).where(note_tags.c.note_id.in_(chunk)))
+
+    links = [
+        {"note_id": note_id, "tag_id": tag_ids[name]}
+        for note_id, names in tag_sets.items()
+        for name in names
+    ]
+    if links:
+        db.session.execute(db.insert(note_tags), links)
 
 
 @notes.route("", methods=["GET"])
 @login_required
 def get_notes():
-    user_notes = (
-        Note.query.filter_by(user_id=current_user.id)
-        .order_by(Note.updated_at.desc())
+    try:
+        view = list_view()
+        fields = requested_fields(Note)
+
+        etag, last_modified = collection_validators(
+            Note, Note.user_id == current_user.id
+        )
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+
+        query = Note.query.filter_by(user_id=current_user.id)
+
+        tags = Tag.normalize(request.args.getlist("tag"))
+        if tags:
+            match = request.args.get("match", "all")
+            if match not in ("all", "any"):
+                raise ValueError("match must be 'all' or 'any'")
+            query = query.filter(Note.id.in_(_tagged_note_ids(tags, match == "all")))
+
+        if fields is None and view == "summary":
+            fields = Note.SUMMARY_COLUMNS
+        if fields is not None:
+            columns = Note.field_columns(fields)
+            query = query.options(load_only(*columns, Note.updated_at))
+
+        user_notes, next_cursor = keyset_page(query, Note)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    body = Note.plan(fields).many(user_notes)
+
+    response = set_validators(jsonify(body), etag, last_modified)
+    return response, 200, page_headers(next_cursor)
+
+
+@notes.route("/tags", methods=["GET"])
+@login_required
+def get_tag_facets():
+    note_count = db.func.count(note_tags.c.note_id)
+    facets = (
+        db.session.query(Tag.name, note_count)
+        .join(note_tags, note_tags.c.tag_id == Tag.id)
+        .filter(Tag.user_id == current_user.id)
+        .group_by(Tag.id, Tag.name)
+        .order_by(note_count.desc(), Tag.name)
         .all()
     )
-    return jsonify([note.to_dict() for note in user_notes]), 200
+    return jsonify([{"name": name, "count": count} for name, count in facets]), 200
+
+
+@notes.route("/batch", methods=["POST"])
+@login_required
+def batch_notes():
+    try:
+        operations, results = parse_operations(
+            request.json, current_app.config["BATCH_MAX_OPERATIONS"]
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    owned = select_ids(
+        Note.id,
+        [row_id for _, op, row_id, _ in operations if row_id],
+        Note.user_id == current_user.id,
+    )
+
+    now = datetime.utcnow()
+    creates, updates, deletes, tag_sets = [], [], [], {}
+
+    for index, op, row_id, data in operations:
+        if op != "create" and row_id not in owned:
+            results[index] = batch_error(index, "Note not found", 404)
+            continue
+
+        if op == "delete":
+            deletes.append(row_id)
+            results[index] = batch_result(index, row_id, 200)
+            continue
+
+        if op == "create" and (not data.get("title") or not data.get("content")):
+            results[index] = batch_error(index, "Missing required fields")
+            continue
+        if any(not data[field] for field in ("title", "content") if field in data):
+            results[index] = batch_error(index, "title and content cannot be empty")
+            continue
+        fields_error = _fields_error(data)
+        if fields_error:
+            results[index] = batch_error(index, fields_error)
+            continue
+
+        row = {field: data[field] for field in ("title", "content") if field in data}
+        row["updated_at"] = now
+
+        if op == "create":
+            row_id = uuid.uuid4()
+            row.update(id=row_id, user_id=current_user.id, created_at=now, tags="")
+            creates.append(row)
+            results[index] = batch_result(index, row_id, 201)
+        else:
+            row["id"] = row_id
+            updates.append(row)
+            results[index] = batch_result(index, row_id, 200)
+
+        if "tags" in data:
+            names = Tag.normalize(data["tags"])
+            row["tags"] = ",".join(names)
+            tag_sets[row_id] = names
+
+    try:
+        deleted = 0
+        for chunk in chunked(deletes):
+            db.session.execute(
+                db.delete(note_tags).where(note_tags.c.note_id.in_(chunk))
+            )
+            deleted += db.session.execute(
+                db.delete(Note)
+                .where(Note.id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        if creates:
+            db.session.execute(db.insert(Note), creates)
+        if updates:
+            db.session.execute(db.update(Note), updates)
+        if tag_sets:
+            _replace_note_tags(tag_sets)
+        record_stats(current_user.id, {"notes": len(creates) - deleted})
+
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Note batch error: {str(e)}")
+        return jsonify({"error": "An error occurred while applying the batch"}), 500
+
+    return jsonify([results[index] for index in sorted(results)]), 200
 
 
 @notes.route("/<note_id>", methods=["GET"])
 @login_required
 def get_note(note_id):
+    try:
+        fields = requested_fields(Note)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     try:
         note_uuid = uuid.UUID(note_id)
-        note = Note.query.filter_by(id=note_uuid, user_id=current_user.id).first()
+        updated_at = (
+            db.session.query(Note.updated_at)
+            .filter_by(id=note_uuid, user_id=current_user.id)
+            .scalar()
+        )
 
+        if not updated_at:
+            return jsonify({"error": "Note not found"}), 404
+
+        etag = resource_etag(note_uuid, updated_at)
+        cached = not_modified(etag, updated_at)
+        if cached:
+            return cached
+
+        note = Note.query.filter_by(id=note_uuid, user_id=current_user.id).first()
         if not note:
             return jsonify({"error": "Note not found"}), 404
 
-        return jsonify(note.to_dict()), 200
+        response = jsonify(note.to_dict(fields))
+        return set_validators(response, etag, note.updated_at), 200
     except ValueError:
         return jsonify({"error": "Invalid note ID format"}), 400
 
@@ -42,17 +267,19 @@ def create_note():
     if not data or not data.get("title") or not data.get("content"):
         return jsonify({"error": "Missing required fields"}), 400
 
-    tags = data.get("tags")
-    tags_string = ",".join(tags) if tags else ""
+    fields_error = _fields_error(data)
+    if fields_error:
+        return jsonify({"error": fields_error}), 400
 
     new_note = Note(
         user_id=current_user.id,
         title=data["title"],
         content=data["content"],
-        tags=tags_string,
     )
+    new_note.set_tags(data.get("tags"))
 
     db.session.add(new_note)
+    record_stats(current_user.id, {"notes": 1})
     db.session.commit()
 
     return jsonify(new_note.to_dict()), 201
@@ -73,6 +300,14 @@ def update_note(note_id):
         if not note:
             return jsonify({"error": "Note not found"}), 404
 
+        conflict = precondition_failed(resource_etag(note.id, note.updated_at))
+        if conflict:
+            return conflict
+
+        fields_error = _fields_error(data)
+        if fields_error:
+            return jsonify({"error": fields_error}), 400
+
         if "title" in data:
             note.title = data["title"]
 
@@ -80,11 +315,13 @@ def update_note(note_id):
             note.content = data["content"]
 
         if "tags" in data:
-            note.tags = ",".join(data["tags"]) if data["tags"] else ""
+            note.set_tags(data["tags"])
 
         db.session.commit()
 
-        return jsonify(note.to_dict()), 200
+        response = jsonify(note.to_dict())
+        etag = resource_etag(note.id, note.updated_at)
+        return set_validators(response, etag, note.updated_at), 200
     except ValueError:
         return jsonify({"error": "Invalid note ID format"}), 400
 
@@ -100,6 +337,7 @@ def delete_note(note_id):
             return jsonify({"error": "Note not found"}), 404
 
         db.session.delete(note)
+        record_stats(current_user.id, {"notes": -1})
         db.session.commit()
 
         return jsonify({"message": "Note deleted successfully"}), 200
@@ -0,0 +1,38 @@
+from flask import Blueprint, request, jsonify
+from flask_login import current_user, login_required
+
+from app.pagination import page_headers, page_size
+from app.search_index import SEARCH_KINDS, search as run_search
+
+search = Blueprint("search", __name__)
+
+
+@search.route("", methods=["GET"])
+@login_required
+def search_notebook():
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Missing search query"}), 400
+
+    kinds = request.args.getlist("type") or list(SEARCH_KINDS)
+    if any(kind not in SEARCH_KINDS for kind in kinds):
+        return jsonify({"error": "type must be 'note' or 'experiment'"}), 400
+
+    try:
+        limit = page_size()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    offset = request.args.get("cursor", "0")
+    if not offset.isdigit():
+        return jsonify({"error": "Invalid pagination cursor"}), 400
+    offset = int(offset)
+
+    results = run_search(current_user.id, query, kinds, limit + 1, offset)
+
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = str(offset + limit)
+
+    return jsonify(results), 200, page_headers(next_cursor)
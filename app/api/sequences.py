@@ -0,0 +1,513 @@
+from flask import Blueprint, Response, current_app, request, jsonify
+from flask_login import current_user, login_required
+import csv
+import io
+import math
+import uuid
+from concurrent.futures import TimeoutError
+
+import numpy as np
+
+from app.models import (
+    Experiment,
+    ExperimentAttachment,
+    RestrictionSite,
+    SequenceRecord,
+    db,
+)
+from app.restriction import ENZYMES, fragments
+from app.pagination import InvalidCursor, keyset_page, page_headers
+from app.sequences import INDEXERS, fetch_sequence, ingest_attachment
+from app.alignment import aligner, scoring_options
+from app.seqstats import COLUMNS, column_values, sequence_stats
+from app.sketches import sketch, user_matrix
+from app.storage import storage
+
+sequences = Blueprint("sequences", __name__)
+
+FASTA_LINE_WIDTH = 60
+
+# Decimal places per float column in stats output.
+STATS_DECIMALS = {
+    "gc_fraction": 4,
+    "molecular_weight": 2,
+    "tm_wallace": 2,
+    "tm_gc": 2,
+    "tm_nn": 2,
+}
+STATS_CONDITIONS = {"na": 50, "dnac1": 25, "dnac2": 25}
+SIMILAR_LIMIT = 10
+SIMILAR_MAX_LIMIT = 100
+
+
+def _get_record(sequence_id):
+    query = SequenceRecord.query.filter(SequenceRecord.user_id == current_user.id)
+    try:
+        return query.filter(SequenceRecord.id == uuid.UUID(sequence_id)).first()
+    except ValueError:
+        # Not a UUID, so look the record up by its identifier in the file.
+        return (
+            query.filter(SequenceRecord.record_id == sequence_id)
+            .order_by(SequenceRecord.created_at.desc())
+            .first()
+        )
+
+
+def _range_arg(name):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    if not value.isdigit():
+        raise ValueError(f"{name} must be a non-negative integer")
+    return int(value)
+
+
+@sequences.route("", methods=["GET"])
+@login_required
+def get_sequences():
+    query = SequenceRecord.query.filter(SequenceRecord.user_id == current_user.id)
+
+    if "attachment_id" in request.args:
+        try:
+            attachment_uuid = uuid.UUID(request.args["attachment_id"])
+        except ValueError:
+            return jsonify({"error": "Invalid attachment ID format"}), 400
+        query = query.filter(SequenceRecord.attachment_id == attachment_uuid)
+    if "record_id" in request.args:
+        query = query.filter(SequenceRecord.record_id == request.args["record_id"])
+
+    try:
+        records, next_cursor = keyset_page(
+            query, SequenceRecord, SequenceRecord.created_at
+        )
+    except (InvalidCursor, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return (
+        jsonify([record.to_dict() for record in records]),
+        200,
+        page_headers(next_cursor),
+    )
+
+
+@sequences.route("/ingest", methods=["POST"])
+@login_required
+def ingest_sequences():
+    data = request.json
+    if not data or not data.get("attachment_id"):
+        return jsonify({"error": "Missing required fields"}), 400
+
+    sequence_format = data.get("format")
+    if sequence_format is not None and sequence_format not in INDEXERS:
+        return jsonify({"error": "format must be 'fasta' or 'genbank'"}), 400
+
+    try:
+        attachment = (
+            ExperimentAttachment.query.join(Experiment)
+            .filter(
+                ExperimentAttachment.id == uuid.UUID(data["attachment_id"]),
+                Experiment.user_id == current_user.id,
+            )
+            .first()
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid attachment ID format"}), 400
+
+    if not attachment:
+        return jsonify({"error": "Attachment not found"}), 404
+    if not attachment.sha256 or not storage.exists(attachment.sha256):
+        return jsonify({"error": "Attachment has no stored content"}), 404
+
+    try:
+        records = ingest_attachment(attachment, current_user.id, sequence_format)
+        db.session.commit()
+    except ValueError as e:
+        db.session.rollback()
+        current_app.logger.warning(f"Sequence ingest error: {str(e)}")
+        return jsonify({"error": f"Could not parse attachment: {str(e)}"}), 422
+
+    return jsonify([record.to_dict() for record in records]), 201
+
+
+@sequences.route("/<sequence_id>", methods=["GET"])
+@login_required
+def get_sequence(sequence_id):
+    record = _get_record(sequence_id)
+    if not record:
+        return jsonify({"error": "Sequence not found"}), 404
+
+    return jsonify(record.to_dict()), 200
+
+
+@sequences.route("/<sequence_id>/sequence", methods=["GET"])
+@login_required
+def get_sequence_residues(sequence_id):
+    try:
+        start = _range_arg("start") or 0
+        end = _range_arg("end")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if end is not None and end < start:
+        return jsonify({"error": "end must not be less than start"}), 400
+
+    record = _get_record(sequence_id)
+    if not record:
+        return jsonify({"error": "Sequence not found"}), 404
+    if not storage.exists(record.attachment.sha256):
+        return jsonify({"error": "Attachment has no stored content"}), 404
+
+    end = record.length if end is None else min(end, record.length)
+    residues = fetch_sequence(record, start, end)
+
+    if request.args.get("format") == "fasta":
+        lines = [f">{record.record_id}:{start + 1}-{end}"]
+        lines.extend(
+            residues[i : i + FASTA_LINE_WIDTH]
+            for i in range(0, len(residues), FASTA_LINE_WIDTH)
+        )
+        return Response("\n".join(lines) + "\n", mimetype="text/x-fasta")
+
+    return (
+        jsonify(
+            {
+                "id": str(record.id),
+                "record_id": record.record_id,
+                "start": min(start, end),
+                "end": end,
+                "length": record.length,
+                "sequence": residues,
+            }
+        ),
+        200,
+    )
+
+
+def _stats_input(data):
+    """Resolve a stats request to ids and, for each, its sequence text or the
+    stored record to read it from."""
+    if "sequences" in data:
+        entries = data["sequences"]
+        if not isinstance(entries, list):
+            raise ValueError("sequences must be a list")
+        ids, sources = [], []
+        for index, entry in enumerate(entries):
+            if isinstance(entry, dict):
+                ids.append(str(entry.get("id", index)))
+                entry = entry.get("sequence")
+            else:
+                ids.append(str(index))
+            if not isinstance(entry, str) or not entry.isascii():
+                raise ValueError(f"Invalid sequence at index {index}")
+            if not entry.isalpha():
+                raise ValueError(f"Sequence at index {index} must be letters only")
+            sources.append(entry)
+        return ids, sources
+
+    query = SequenceRecord.query.filter(SequenceRecord.user_id == current_user.id)
+    if "attachment_id" in data:
+        try:
+            attachment_uuid = uuid.UUID(data["attachment_id"])
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError("Invalid attachment ID format") from e
+        query = query.filter(SequenceRecord.attachment_id == attachment_uuid)
+    elif "sequence_ids" in data:
+        try:
+            sequence_uuids = [uuid.UUID(value) for value in data["sequence_ids"]]
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError("Invalid sequence ID format") from e
+        query = query.filter(SequenceRecord.id.in_(sequence_uuids))
+    else:
+        raise ValueError("Provide sequences, sequence_ids or attachment_id")
+
+    records = query.order_by(
+        SequenceRecord.attachment_id, SequenceRecord.offset
+    ).all()
+    return [record.record_id for record in records], records
+
+
+@sequences.route("/stats", methods=["POST"])
+@login_required
+def get_sequence_stats():
+    data = request.json
+    if not isinstance(data, dict):
+        return jsonify({"error": "Missing required fields"}), 400
+
+    conditions = {}
+    for name, default in STATS_CONDITIONS.items():
+        value = data.get(name, default)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return jsonify({"error": f"{name} must be a number"}), 400
+        conditions[name] = value
+    if conditions["na"] <= 0 or conditions["dnac1"] <= conditions["dnac2"] / 2:
+        return jsonify({"error": "Invalid salt or strand concentrations"}), 400
+
+    try:
+        ids, sources = _stats_input(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    lengths = [
+        len(source) if isinstance(source, str) else source.length
+        for source in sources
+    ]
+    if not all(lengths):
+        return jsonify({"error": "Sequences cannot be empty"}), 400
+    if sum(lengths) > current_app.config["SEQUENCE_STATS_MAX_RESIDUES"]:
+        return jsonify({"error": "Too many residues in one request"}), 413
+
+    residues = [
+        source if isinstance(source, str) else fetch_sequence(source)
+        for source in sources
+    ]
+    stats = sequence_stats(residues, **conditions)
+    columns = {"id": ids}
+    columns.update(
+        (name, column_values(values, STATS_DECIMALS.get(name)))
+        for name, values in stats.items()
+    )
+
+    if request.args.get("format") == "csv":
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(COLUMNS)
+        writer.writerows(zip(*(columns[name] for name in COLUMNS)))
+        return Response(output.getvalue(), mimetype="text/csv")
+
+    return jsonify({"count": len(ids), "columns": columns}), 200
+
+
+@sequences.route("/similar", methods=["POST"])
+@login_required
+def find_similar_sequences():
+    data = request.json
+    if not isinstance(data, dict):
+        return jsonify({"error": "Missing required fields"}), 400
+
+    limit = data.get("limit", SIMILAR_LIMIT)
+    min_identity = data.get("min_identity", 0)
+    if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    if not isinstance(min_identity, (int, float)) or not 0 <= min_identity <= 1:
+        return jsonify({"error": "min_identity must be between 0 and 1"}), 400
+    limit = min(limit, SIMILAR_MAX_LIMIT)
+
+    exclude_id = None
+    if data.get("sequence_id"):
+        record = _get_record(str(data["sequence_id"]))
+        if not record:
+            return jsonify({"error": "Sequence not found"}), 404
+        if record.sketch:
+            query = np.frombuffer(record.sketch.hashes, dtype="<u8")
+        else:
+            query = sketch(fetch_sequence(record))[0]
+        exclude_id = record.id
+    elif isinstance(data.get("sequence"), str) and data["sequence"].isalpha():
+        query = sketch(data["sequence"])[0]
+    else:
+        return jsonify({"error": "Provide a sequence or sequence_id"}), 400
+
+    matches = [
+        match
+        for match in user_matrix(current_user.id).search(query, limit + 1)
+        if match[0] != exclude_id and match[2] >= min_identity
+    ][:limit]
+
+    records = {
+        record.id: record
+        for record in SequenceRecord.query.filter(
+            SequenceRecord.id.in_([sequence_id for sequence_id, *_ in matches])
+        )
+    }
+    return (
+        jsonify(
+            [
+                {
+                    "sequence": records[sequence_id].to_dict(),
+                    "jaccard": round(jaccard, 4),
+                    "identity": round(identity, 4),
+                    "shared_hashes": shared,
+                }
+                for sequence_id, jaccard, identity, shared in matches
+                if sequence_id in records
+            ]
+        ),
+        200,
+    )
+
+
+def _alignment_input(value, name):
+    """Resolve an alignment operand to its sequence text."""
+    if isinstance(value, str):
+        value = {"sequence": value}
+    if not isinstance(value, dict):
+        raise ValueError(f"{name} must be a sequence or an object")
+
+    if value.get("sequence_id"):
+        record = _get_record(str(value["sequence_id"]))
+        if not record or not storage.exists(record.attachment.sha256):
+            raise LookupError(f"{name} sequence not found")
+        start, end = value.get("start", 0), value.get("end")
+        if not isinstance(start, int) or not isinstance(end, (int, type(None))):
+            raise ValueError(f"{name} start and end must be integers")
+        return fetch_sequence(record, start, end)
+
+    sequence = value.get("sequence")
+    if not isinstance(sequence, str) or not sequence.isascii():
+        raise ValueError(f"Missing {name} sequence")
+    if not sequence.isalpha():
+        raise ValueError(f"{name} sequence must be letters only")
+    return sequence
+
+
+@sequences.route("/align", methods=["POST"])
+@login_required
+def align_sequences():
+    data = request.json
+    if not isinstance(data, dict):
+        return jsonify({"error": "Missing required fields"}), 400
+
+    try:
+        options = scoring_options(data.get("scoring", {}))
+        target = _alignment_input(data.get("target"), "target")
+        query = _alignment_input(data.get("query"), "query")
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not target or not query:
+        return jsonify({"error": "Sequences cannot be empty"}), 400
+    if len(target) * len(query) > current_app.config["ALIGNMENT_MAX_CELLS"]:
+        return jsonify({"error": "Sequences are too long to align"}), 413
+
+    try:
+        result, cached = aligner.align(target, query, options)
+    except TimeoutError:
+        # The alignment keeps running and is cached when it finishes.
+        retry_after = math.ceil(aligner.time_budget)
+        return (
+            jsonify({"status": "running", "retry_after": retry_after}),
+            202,
+            {"Retry-After": str(retry_after)},
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({**result, "scoring": options, "cached": cached}), 200
+
+
+def _enzyme_args():
+    names = request.args.getlist("enzyme")
+    unknown = [name for name in names if name not in ENZYMES]
+    if unknown:
+        raise ValueError(f"Unknown or non-commercial enzyme: {unknown[0]}")
+    return names
+
+
+def _mapped_record(sequence_id):
+    record = _get_record(sequence_id)
+    if not record:
+        return None, (jsonify({"error": "Sequence not found"}), 404)
+    if not record.restriction_mapped:
+        return None, (jsonify({"error": "Sequence has no restriction map"}), 409)
+    return record, None
+
+
+def _enzyme_dict(name, positions):
+    return {
+        "enzyme": name,
+        "site": ENZYMES[name].site,
+        "cut_count": len(positions),
+        "positions": positions,
+    }
+
+
+@sequences.route("/<sequence_id>/enzymes", methods=["GET"])
+@login_required
+def get_sequence_enzymes(sequence_id):
+    try:
+        names = _enzyme_args()
+        cuts = _range_arg("cuts")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    record, error = _mapped_record(sequence_id)
+    if error:
+        return error
+
+    if cuts == 0:
+        # Only cutting enzymes are stored; the rest of the set cuts nowhere.
+        cutters = set(
+            db.session.scalars(
+                db.select(RestrictionSite.enzyme).where(
+                    RestrictionSite.sequence_id == record.id
+                )
+            )
+        )
+        candidates = names or sorted(ENZYMES)
+        enzymes = [
+            _enzyme_dict(name, []) for name in candidates if name not in cutters
+        ]
+    else:
+        query = RestrictionSite.query.filter(RestrictionSite.sequence_id == record.id)
+        if cuts is not None:
+            query = query.filter(RestrictionSite.cut_count == cuts)
+        if names:
+            query = query.filter(RestrictionSite.enzyme.in_(names))
+        enzymes = [
+            _enzyme_dict(site.enzyme, site.positions)
+            for site in query.order_by(RestrictionSite.enzyme)
+        ]
+
+    return (
+        jsonify(
+            {
+                "sequence_id": str(record.id),
+                "length": record.length,
+                "circular": record.circular,
+                "enzymes": enzymes,
+            }
+        ),
+        200,
+    )
+
+
+@sequences.route("/<sequence_id>/fragments", methods=["GET"])
+@login_required
+def get_sequence_fragments(sequence_id):
+    try:
+        names = _enzyme_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not names:
+        return jsonify({"error": "Provide at least one enzyme"}), 400
+
+    record, error = _mapped_record(sequence_id)
+    if error:
+        return error
+
+    sites = db.session.execute(
+        db.select(RestrictionSite.enzyme, RestrictionSite.positions).where(
+            RestrictionSite.sequence_id == record.id,
+            RestrictionSite.enzyme.in_(names),
+        )
+    ).all()
+    cuts = sorted({position for _, positions in sites for position in positions})
+    pieces = fragments(cuts, record.length, record.circular)
+
+    return (
+        jsonify(
+            {
+                "sequence_id": str(record.id),
+                "length": record.length,
+                "circular": record.circular,
+                "enzymes": sorted(names),
+                "cuts": cuts,
+                "fragments": [
+                    {"start": start, "end": end, "length": end - start}
+                    for start, end in pieces
+                ],
+            }
+        ),
+        200,
+    )
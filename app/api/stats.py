@@ -0,0 +1,28 @@
+from flask import Blueprint, request, jsonify
+from flask_login import current_user, login_required
+
+from app.database import routing
+from app.stats import read_stats, recent_activity
+
+RECENT_ITEMS = 5
+MAX_RECENT_ITEMS = 50
+
+stats_api = Blueprint("stats", __name__)
+routing.route(stats_api)
+
+
+@stats_api.route("", methods=["GET"])
+@login_required
+def get_stats():
+    recent = request.args.get("recent", str(RECENT_ITEMS))
+    if not recent.isdigit() or int(recent) > MAX_RECENT_ITEMS:
+        return (
+            jsonify({"error": f"recent must be between 0 and {MAX_RECENT_ITEMS}"}),
+            400,
+        )
+
+    summary = read_stats(current_user.id)
+    summary["recent"] = (
+        recent_activity(current_user.id, int(recent)) if int(recent) else []
+    )
+    return jsonify(summary), 200
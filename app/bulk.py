@@ -0,0 +1,109 @@
+import uuid
+from itertools import islice
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .models import db, Tag
+
+# Keeps IN lists and multi-row VALUES under SQLite's bound parameter limit.
+CHUNK_SIZE = 500
+
+
+def chunked(items, size=CHUNK_SIZE):
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def insert_ignore(table):
+    """INSERT that skips rows violating a unique constraint."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    return insert(table).prefix_with("IGNORE")
+
+
+def resolve_tag_ids(user_id, names):
+    """Map tag ``names`` to ids, creating the ones ``user_id`` doesn't have."""
+    if not names:
+        return {}
+
+    db.session.execute(
+        insert_ignore(Tag.__table__),
+        [{"id": uuid.uuid4(), "user_id": user_id, "name": n} for n in names],
+    )
+
+    tag_ids = {}
+    for chunk in chunked(sorted(names)):
+        tag_ids.update(
+            db.session.execute(
+                db.select(Tag.name, Tag.id).where(
+                    Tag.user_id == user_id, Tag.name.in_(chunk)
+                )
+            ).all()
+        )
+    return tag_ids
+
+
+def select_ids(column, ids, *criteria):
+    """Return the subset of ``ids`` present in ``column`` under ``criteria``."""
+    found = set()
+    for chunk in chunked(ids):
+        found.update(
+            db.session.scalars(db.select(column).where(column.in_(chunk), *criteria))
+        )
+    return found
+
+
+def parse_operations(operations, max_operations):
+    """Validate the envelope of a batch request.
+
+    Returns ``(parsed, results)`` where ``parsed`` holds ``(index, op, id, data)``
+    tuples for well-formed operations and ``results`` holds an error entry for
+    every malformed one, keyed by its position in the request.
+    """
+    if not isinstance(operations, list):
+        raise ValueError("Expected a JSON array of operations")
+    if len(operations) > max_operations:
+        raise ValueError(f"A batch may contain at most {max_operations} operations")
+
+    parsed, results, seen = [], {}, set()
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            results[index] = batch_error(index, "Operation must be an object")
+            continue
+
+        op = operation.get("op")
+        data = operation.get("data") or {}
+        if op not in ("create", "update", "delete"):
+            results[index] = batch_error(index, "op must be create, update or delete")
+            continue
+        if not isinstance(data, dict):
+            results[index] = batch_error(index, "data must be an object")
+            continue
+
+        row_id = None
+        if op != "create":
+            try:
+                row_id = uuid.UUID(str(operation.get("id")))
+            except ValueError:
+                results[index] = batch_error(index, "Invalid ID format")
+                continue
+            if row_id in seen:
+                results[index] = batch_error(index, "Duplicate ID in batch")
+                continue
+            seen.add(row_id)
+
+        parsed.append((index, op, row_id, data))
+    return parsed, results
+
+
+def batch_error(index, message, status=400):
+    return {"index": index, "status": status, "error": message}
+
+
+def batch_result(index, row_id, status):
+    return {"index": index, "status": status, "id": str(row_id)}
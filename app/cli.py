@@ -0,0 +1,238 @@
+import click
+from datetime import datetime, timedelta
+from flask import current_app
+from flask.cli import AppGroup
+
+from .models import (
+    db,
+    AlignmentResult,
+    ExperimentAttachment,
+    SequenceRecord,
+    User,
+)
+from .importer import CHUNK_ROWS, KINDS, detect_format, import_rows
+from .jobs import fail_stale_jobs
+from .ordering import rebalance, uneven_experiments
+from .search_index import rebuild_index
+from .restriction import map_record
+from .sequences import fetch_sequence
+from .sketches import sketch_record, unsketched_records
+from .static_assets import assets
+from .stats import rebuild_stats
+from .storage import storage
+
+search_cli = AppGroup("search", help="Manage the full-text search index.")
+steps_cli = AppGroup("steps", help="Maintain experiment step ordering.")
+storage_cli = AppGroup("storage", help="Manage stored attachment content.")
+jobs_cli = AppGroup("jobs", help="Manage background analysis jobs.")
+sequences_cli = AppGroup("sequences", help="Maintain the sequence store.")
+import_cli = AppGroup("import", help="Bulk-import notes and experiments.")
+assets_cli = AppGroup("assets", help="Prepare the built frontend for serving.")
+stats_cli = AppGroup("stats", help="Maintain the per-user dashboard counts.")
+
+
+@search_cli.command("rebuild")
+def rebuild_search_index():
+    """Rebuild the SQLite FTS index from the notes and experiments tables."""
+    if rebuild_index():
+        click.echo("Search index rebuilt.")
+    else:
+        click.echo("Nothing to do: Postgres maintains its search indexes itself.")
+
+
+@steps_cli.command("rebalance")
+@click.option(
+    "--min-gap",
+    default=16,
+    show_default=True,
+    help="Renumber experiments with neighbouring steps closer than this.",
+)
+def rebalance_steps(min_gap):
+    """Respace step keys in experiments whose gaps are running out."""
+    experiment_ids = uneven_experiments(min_gap)
+    for experiment_id in experiment_ids:
+        rebalance(experiment_id)
+        db.session.commit()
+    click.echo(f"Rebalanced {len(experiment_ids)} experiment(s).")
+
+
+@storage_cli.command("gc")
+@click.option(
+    "--grace",
+    default=3600,
+    show_default=True,
+    help="Keep unreferenced blobs younger than this many seconds.",
+)
+def collect_garbage(grace):
+    """Delete blobs no attachment references any more."""
+    referenced = set(
+        db.session.scalars(
+            db.select(ExperimentAttachment.sha256)
+            .where(ExperimentAttachment.sha256.isnot(None))
+            .distinct()
+        )
+    )
+    removed = 0
+    for digest in list(storage.digests(older_than=grace)):
+        if digest not in referenced:
+            storage.delete(digest)
+            removed += 1
+    click.echo(f"Removed {removed} unreferenced blob(s).")
+
+
+@jobs_cli.command("fail-stale")
+@click.option(
+    "--older-than",
+    default=600,
+    show_default=True,
+    help="Fail unfinished jobs not updated for this many seconds.",
+)
+def fail_stale(older_than):
+    """Fail jobs orphaned by a restarted or crashed web worker."""
+    failed = fail_stale_jobs(older_than)
+    db.session.commit()
+    click.echo(f"Marked {failed} stale job(s) as failed.")
+
+
+@sequences_cli.command("sketch")
+def sketch_sequences():
+    """Build similarity sketches for sequence records that lack one."""
+    sketched = 0
+    for records in unsketched_records():
+        for record in records:
+            if storage.exists(record.attachment.sha256):
+                sketch_record(record, record.user_id, fetch_sequence(record))
+        sketched += len(records)
+        db.session.commit()
+    click.echo(f"Checked {sketched} unsketched record(s).")
+
+
+@sequences_cli.command("prune-alignments")
+@click.option(
+    "--older-than",
+    default=30,
+    show_default=True,
+    help="Delete cached alignments older than this many days.",
+)
+def prune_alignments(older_than):
+    """Trim the persisted pairwise alignment cache."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than)
+    removed = db.session.execute(
+        db.delete(AlignmentResult).where(AlignmentResult.created_at < cutoff)
+    ).rowcount
+    db.session.commit()
+    click.echo(f"Removed {removed} cached alignment(s).")
+
+
+@sequences_cli.command("map-restriction")
+@click.option(
+    "--max-length",
+    type=int,
+    help="Map sequences up to this length (default RESTRICTION_MAX_LENGTH).",
+)
+def map_restriction_sites(max_length):
+    """Compute restriction maps for records that do not have one yet."""
+    max_length = max_length or current_app.config["RESTRICTION_MAX_LENGTH"]
+    mapped = 0
+    last_id = None
+    while True:
+        query = SequenceRecord.query.filter(
+            SequenceRecord.restriction_mapped.is_(False),
+            SequenceRecord.length <= max_length,
+        )
+        if last_id is not None:
+            query = query.filter(SequenceRecord.id > last_id)
+        records = query.order_by(SequenceRecord.id).limit(100).all()
+        if not records:
+            break
+        last_id = records[-1].id
+
+        for record in records:
+            if storage.exists(record.attachment.sha256):
+                map_record(record, fetch_sequence(record), max_length)
+                mapped += record.restriction_mapped
+        db.session.commit()
+    click.echo(f"Mapped {mapped} record(s).")
+
+
+@import_cli.command("file")
+@click.argument("kind", type=click.Choice(sorted(KINDS)))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--user", "username", required=True, help="Owner of the rows.")
+@click.option(
+    "--format",
+    "file_format",
+    type=click.Choice(["csv", "json", "ndjson"]),
+    help="File format (default: from the file extension).",
+)
+@click.option(
+    "--chunk-rows",
+    default=CHUNK_ROWS,
+    show_default=True,
+    help="Rows validated and loaded per pass.",
+)
+@click.option("--dry-run", is_flag=True, help="Validate without writing anything.")
+def import_file(kind, path, username, file_format, chunk_rows, dry_run):
+    """Import notes or experiments from a CSV, JSON or NDJSON file."""
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        raise click.BadParameter(f"No user named {username}", param_hint="--user")
+    file_format = file_format or detect_format(path)
+    if file_format is None:
+        raise click.BadParameter(
+            "Could not detect the file format", param_hint="--format"
+        )
+
+    try:
+        with open(path, "rb") as stream:
+            summary = import_rows(
+                stream,
+                file_format,
+                kind,
+                user.id,
+                dry_run=dry_run,
+                chunk_rows=chunk_rows,
+            )
+    except (ValueError, UnicodeDecodeError) as e:
+        db.session.rollback()
+        raise click.ClickException(f"Could not parse {path}: {e}")
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+
+    for error in summary["errors"]:
+        click.echo(f"row {error['row']}: {'; '.join(error['errors'])}", err=True)
+    if summary["errors_truncated"]:
+        click.echo("(further errors omitted)", err=True)
+    verb = "Validated" if dry_run else "Imported"
+    click.echo(
+        f"{verb} {summary['imported']} of {summary['rows']} {kind}; "
+        f"{summary['failed']} row(s) rejected."
+    )
+
+
+@assets_cli.command("compress")
+@click.option("--force", is_flag=True, help="Rebuild variants that are up to date.")
+def compress_assets(force):
+    """Write gzip and brotli variants next to the built frontend files.
+
+    Run at deploy time so workers load them instead of compressing at startup.
+    """
+    written = assets.compress(force=force)
+    click.echo(f"Wrote {written} compressed file(s) under {assets.root}.")
+
+
+@stats_cli.command("rebuild")
+@click.option("--user", "username", help="Only this user (default: everyone).")
+def rebuild_user_stats(username):
+    """Recount the dashboard stats from the notes and experiments tables."""
+    user_id = None
+    if username:
+        user = User.query.filter_by(username=username).first()
+        if user is None:
+            raise click.BadParameter(f"No user named {username}", param_hint="--user")
+        user_id = user.id
+    rows = rebuild_stats(user_id)
+    db.session.commit()
+    click.echo(f"Rebuilt {rows} stat row(s).")
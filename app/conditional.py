@@ -0,0 +1,80 @@
+import hashlib
+from datetime import datetime, timezone
+
+from flask import Response, jsonify, make_response, request
+
+from .models import db
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode())
+    return digest.hexdigest()[:32]
+
+
+def resource_etag(row_id, updated_at: datetime) -> str:
+    return make_etag(row_id, updated_at.isoformat())
+
+
+def collection_validators(model, *criteria) -> tuple[str, datetime | None]:
+    """Validators for a list endpoint, computed from one aggregate query.
+
+    ``max(updated_at)`` changes on every insert and update and ``count``
+    changes on every delete, so neither rows nor serialization are needed to
+    tell whether the collection changed. The query string is folded in so
+    different pages and views get different tags.
+    """
+    latest, count = (
+        db.session.query(db.func.max(model.updated_at), db.func.count(model.id))
+        .filter(*criteria)
+        .one()
+    )
+    etag = make_etag(
+        model.__tablename__,
+        latest.isoformat() if latest else "",
+        count,
+        request.query_string.decode(),
+    )
+    return etag, latest
+
+
+def _http_date(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc, microsecond=0)
+
+
+def set_validators(
+    response: Response, etag: str, last_modified: datetime | None = None
+) -> Response:
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = _http_date(last_modified)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def not_modified(
+    etag: str, last_modified: datetime | None = None
+) -> Response | None:
+    """Return a 304 response if the client's cached copy is still current."""
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified:
+        fresh = _http_date(last_modified) <= request.if_modified_since
+    else:
+        fresh = False
+
+    if not fresh:
+        return None
+    return set_validators(make_response("", 304), etag, last_modified)
+
+
+def precondition_failed(etag: str) -> tuple[Response, int] | None:
+    """Reject a write whose If-Match header names a stale representation."""
+    if not request.if_match or request.if_match.contains(etag):
+        return None
+
+    response = jsonify(
+        {"error": "Resource has been modified", "status_code": 412}
+    )
+    response.set_etag(etag)
+    return response, 412
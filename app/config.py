@@ -1,14 +1,84 @@
 import os
 
 
+def _database_url(name, default=None):
+    url = os.environ.get(name, default)
+    if url and url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://")
+    return url
+
+
+def _engine_options(url):
+    """Pool settings shared by the primary and the replica."""
+    options = {
+        "pool_pre_ping": os.environ.get("DB_POOL_PRE_PING", "").lower() == "true"
+    }
+    for option, name, cast in (
+        ("pool_size", "DB_POOL_SIZE", int),
+        ("max_overflow", "DB_MAX_OVERFLOW", int),
+        ("pool_timeout", "DB_POOL_TIMEOUT", float),
+        # Seconds before a connection is replaced, e.g. under a proxy's idle limit
+        ("pool_recycle", "DB_POOL_RECYCLE", int),
+    ):
+        if os.environ.get(name):
+            options[option] = cast(os.environ[name])
+    # Milliseconds; SQLite has no equivalent
+    timeout = os.environ.get("DB_STATEMENT_TIMEOUT")
+    if timeout and url.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={int(timeout)}"}
+    return options
+
+
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY")
     FLASK_RUN_PORT = os.environ.get("FLASK_RUN_PORT", 8000)
-    SQLALCHEMY_ECHO = True
+    SQLALCHEMY_ECHO = os.environ.get("SQLALCHEMY_ECHO", "").lower() == "true"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    PAGE_SIZE = int(os.environ.get("PAGE_SIZE", 50))
+    MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", 200))
+    BATCH_MAX_OPERATIONS = int(os.environ.get("BATCH_MAX_OPERATIONS", 5000))
+    STORAGE_ROOT = os.environ.get("STORAGE_ROOT")  # Defaults to instance/uploads
+    MAX_CONTENT_LENGTH = int(os.environ.get("MAX_REQUEST_BYTES", 16 * 1024**2))
+    # Only for views marked with storage.large_upload
+    MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", 2 * 1024**3))
+    USE_X_SENDFILE = os.environ.get("USE_X_SENDFILE", "").lower() == "true"
+    # selectin, subquery or joined; see Experiment.load_children
+    EXPERIMENT_LOAD_STRATEGY = os.environ.get("EXPERIMENT_LOAD_STRATEGY", "selectin")
+    # Per web worker process; each runs its own pool.
+    JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+    JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", 0.5))
+    SEQUENCE_STATS_MAX_RESIDUES = int(
+        os.environ.get("SEQUENCE_STATS_MAX_RESIDUES", 50_000_000)
+    )
+    ALIGNMENT_WORKERS = int(os.environ.get("ALIGNMENT_WORKERS", 2))
+    ALIGNMENT_CACHE_SIZE = int(os.environ.get("ALIGNMENT_CACHE_SIZE", 256))
+    # Alignments larger than this many DP cells run in the pool
+    ALIGNMENT_INLINE_CELLS = int(os.environ.get("ALIGNMENT_INLINE_CELLS", 1_000_000))
+    ALIGNMENT_MAX_CELLS = int(os.environ.get("ALIGNMENT_MAX_CELLS", 400_000_000))
+    ALIGNMENT_TIME_BUDGET = float(os.environ.get("ALIGNMENT_TIME_BUDGET", 10))
+    # Longest sequence given a restriction map at ingest
+    RESTRICTION_MAX_LENGTH = int(os.environ.get("RESTRICTION_MAX_LENGTH", 100_000))
+    # Bearer token required to scrape /api/metrics; open when unset
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+    # Seconds a loaded user is served from memory; 0 disables the cache
+    USER_CACHE_TTL = float(os.environ.get("USER_CACHE_TTL", 60))
+    USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", 10_000))
+    # werkzeug hash method; raising the cost rehashes each user at next login
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+    # Hashes allowed to wait for a worker before logins are turned away
+    PASSWORD_HASH_QUEUE = int(os.environ.get("PASSWORD_HASH_QUEUE", 32))
 
-    database_url = os.environ.get("DATABASE_URL", "sqlite:///dev.db")
-    if database_url.startswith("postgres://"):
-        database_url = database_url.replace("postgres://", "postgresql://")
+    database_url = _database_url("DATABASE_URL", "sqlite:///dev.db")
+    replica_url = _database_url("DATABASE_REPLICA_URL")
 
     SQLALCHEMY_DATABASE_URI = database_url
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(database_url)
+    # Reads of routed blueprints go to the replica bind when one is set
+    SQLALCHEMY_BINDS = (
+        {"replica": {"url": replica_url, **_engine_options(replica_url)}}
+        if replica_url
+        else {}
+    )
+    # Seconds a client keeps reading from the primary after it writes
+    DATABASE_REPLICA_STICKY = float(os.environ.get("DATABASE_REPLICA_STICKY", 5))
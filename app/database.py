@@ -0,0 +1,106 @@
+import threading
+import time
+
+from flask import g, request, session
+from sqlalchemy import event
+
+from .models import db
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class DatabaseRouting:
+    """Read-replica routing for opted-in blueprints, plus pool statistics.
+
+    Blueprints passed to ``route`` read from the "replica" bind on safe
+    requests (see RoutingSession). After a client's successful write its
+    reads stay on the primary for DATABASE_REPLICA_STICKY seconds, so it
+    sees its own changes despite replication lag.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self._checkouts = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = "replica" in app.config["SQLALCHEMY_BINDS"]
+        self.sticky = app.config["DATABASE_REPLICA_STICKY"]
+        if self.enabled and self.sticky > 0:
+            app.after_request(self._pin_to_primary)
+        with app.app_context():
+            for key, engine in db.engines.items():
+                self._count_checkouts(key or "default", engine)
+        if "metrics" in app.extensions:
+            app.extensions["metrics"].register(self.render_metrics)
+        app.extensions["database_routing"] = self
+
+    def route(self, blueprint):
+        """Send the blueprint's safe requests to the replica, if there is one."""
+        blueprint.before_request(self._route_reads)
+
+    def _route_reads(self):
+        g.read_replica = (
+            self.enabled
+            and request.method in SAFE_METHODS
+            and session.get("primary_until", 0) < time.time()
+        )
+
+    def _pin_to_primary(self, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            session["primary_until"] = time.time() + self.sticky
+        return response
+
+    def _count_checkouts(self, key, engine):
+        self._checkouts.setdefault(key, 0)
+
+        def checkout(dbapi_connection, record, proxy):
+            with self._lock:
+                self._checkouts[key] += 1
+
+        event.listen(engine.pool, "checkout", checkout)
+
+    def pool_stats(self):
+        """Per-bind pool state; fields a pool class doesn't track are left out."""
+        stats = {}
+        for key, engine in db.engines.items():
+            pool = engine.pool
+            entry = {"pool": type(pool).__name__}
+            for field in ("size", "checkedin", "checkedout", "overflow"):
+                if callable(getattr(pool, field, None)):
+                    entry[field] = getattr(pool, field)()
+            if "overflow" in entry:
+                # QueuePool counts up from -size until the pool is full.
+                entry["overflow"] = max(entry["overflow"], 0)
+            with self._lock:
+                entry["checkouts"] = self._checkouts.get(key or "default", 0)
+            stats[key or "default"] = entry
+        return stats
+
+    def render_metrics(self):
+        gauges = (
+            ("size", "db_pool_size", "Connections the pool keeps open."),
+            ("checkedout", "db_pool_checked_out", "Connections in use."),
+            ("checkedin", "db_pool_checked_in", "Idle connections in the pool."),
+            ("overflow", "db_pool_overflow", "Connections opened past the size."),
+        )
+        stats = self.pool_stats()
+        lines = []
+        for field, name, help in gauges:
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+            for bind, entry in stats.items():
+                if field in entry:
+                    lines.append(f'{name}{{bind="{bind}"}} {entry[field]}')
+        lines += [
+            "# HELP db_pool_checkouts_total Connections handed out by the pool.",
+            "# TYPE db_pool_checkouts_total counter",
+        ]
+        for bind, entry in stats.items():
+            checkouts = entry["checkouts"]
+            lines.append(f'db_pool_checkouts_total{{bind="{bind}"}} {checkouts}')
+        return lines
+
+
+routing = DatabaseRouting()
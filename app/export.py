@@ -0,0 +1,156 @@
+import io
+import json
+import zipfile
+from datetime import datetime
+
+from .models import db, Note, Experiment, ExperimentStep, ExperimentAttachment
+from .storage import storage
+
+# Rows fetched per round trip. yield_per streams results (a server-side
+# cursor on Postgres), so memory stays flat however large the notebook is.
+BATCH_SIZE = 500
+
+
+def _stream(statement):
+    return db.session.scalars(statement.execution_options(yield_per=BATCH_SIZE))
+
+
+def _notes(user_id):
+    for note in _stream(
+        db.select(Note).where(Note.user_id == user_id).order_by(Note.id)
+    ):
+        yield note.to_dict()
+
+
+def _experiments(user_id):
+    for experiment in _stream(
+        db.select(Experiment)
+        .where(Experiment.user_id == user_id)
+        .order_by(Experiment.id)
+    ):
+        yield experiment.to_dict(children=False)
+
+
+def _steps(user_id):
+    experiment_id, step_number = None, 0
+    for step in _stream(
+        db.select(ExperimentStep)
+        .join(Experiment)
+        .where(Experiment.user_id == user_id)
+        .order_by(ExperimentStep.experiment_id, ExperimentStep.position)
+    ):
+        if step.experiment_id != experiment_id:
+            experiment_id, step_number = step.experiment_id, 0
+        step_number += 1
+        yield step.to_dict(step_number=step_number)
+
+
+def _attachments(user_id):
+    for attachment in _stream(
+        db.select(ExperimentAttachment)
+        .join(Experiment)
+        .where(Experiment.user_id == user_id)
+        .order_by(ExperimentAttachment.experiment_id, ExperimentAttachment.id)
+    ):
+        yield attachment.to_dict()
+
+
+SECTIONS = (
+    ("note", "notes", _notes),
+    ("experiment", "experiments", _experiments),
+    ("experiment_step", "experiment_steps", _steps),
+    ("attachment", "attachments", _attachments),
+)
+
+
+def _line(record):
+    return json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+
+def export_ndjson(user_id):
+    """Yield the notebook as NDJSON lines of ``{"type": ..., "data": ...}``,
+    one chunk per batch of rows."""
+    lines = []
+    for kind, _, rows in SECTIONS:
+        for row in rows(user_id):
+            lines.append(_line({"type": kind, "data": row}))
+            if len(lines) == BATCH_SIZE:
+                yield b"".join(lines)
+                lines.clear()
+    if lines:
+        yield b"".join(lines)
+
+
+class _Pipe(io.RawIOBase):
+    """Write-only file that buffers what zipfile writes until it is drained."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        """Yield what has been written since the last drain, if anything.
+        An empty chunk would end a chunked HTTP response early."""
+        if self._chunks:
+            data = b"".join(self._chunks)
+            self._chunks.clear()
+            yield data
+
+
+def export_zip(user_id):
+    """Yield a ZIP archive of the notebook as it is written.
+
+    Each section is an NDJSON file, and every stored attachment blob is
+    included once under ``blobs/<sha256>``. The output is never seekable,
+    so zipfile writes data descriptors and the archive needs no buffering.
+    """
+    pipe = _Pipe()
+    counts = {}
+    started = datetime.utcnow()
+    with zipfile.ZipFile(pipe, "w", zipfile.ZIP_DEFLATED) as archive:
+        for _, name, rows in SECTIONS:
+            counts[name] = 0
+            with archive.open(f"{name}.ndjson", "w", force_zip64=True) as entry:
+                for row in rows(user_id):
+                    entry.write(_line(row))
+                    counts[name] += 1
+                    if counts[name] % BATCH_SIZE == 0:
+                        yield from pipe.drain()
+            yield from pipe.drain()
+
+        counts["blobs"] = 0
+        for digest in _stream(
+            db.select(ExperimentAttachment.sha256)
+            .join(Experiment)
+            .where(
+                Experiment.user_id == user_id,
+                ExperimentAttachment.sha256.isnot(None),
+            )
+            .distinct()
+            .order_by(ExperimentAttachment.sha256)
+        ):
+            if not storage.exists(digest):
+                continue
+            info = zipfile.ZipInfo(f"blobs/{digest}", started.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            with storage.open(digest) as blob, archive.open(
+                info, "w", force_zip64=True
+            ) as entry:
+                while chunk := blob.read(storage.chunk_size):
+                    entry.write(chunk)
+                    yield from pipe.drain()
+            counts["blobs"] += 1
+
+        manifest = {
+            "user_id": str(user_id),
+            "exported_at": started.isoformat(),
+            "counts": counts,
+        }
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+    yield from pipe.drain()
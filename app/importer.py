@@ -0,0 +1,240 @@
+import io
+import os
+import uuid
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy.exc import DBAPIError
+
+from .bulk import resolve_tag_ids
+from .models import db, Experiment, Note, Tag, note_tags
+from .stats import record_stats, status_name
+
+# Rows parsed, validated and loaded per pass. Validation works on whole
+# columns and loading is one COPY (or executemany) per chunk, so no ORM
+# object is ever built for an imported row.
+CHUNK_ROWS = 10_000
+# Per-row errors reported back; the counts still cover every row.
+MAX_ERRORS = 1000
+
+FORMATS = {
+    ".csv": "csv",
+    ".json": "json",
+    ".jsonl": "ndjson",
+    ".ndjson": "ndjson",
+}
+STATUSES = Experiment.STATUSES
+TITLE_LENGTH = 255
+
+KINDS = {
+    "notes": {
+        "model": Note,
+        "required": ("title", "content"),
+        "optional": (),
+        "dates": ("created_at", "updated_at"),
+    },
+    "experiments": {
+        "model": Experiment,
+        "required": ("title", "hypothesis", "methods"),
+        "optional": ("materials", "results", "conclusion", "references", "status"),
+        "dates": ("started_at", "completed_at", "created_at", "updated_at"),
+    },
+}
+
+
+def detect_format(file_name):
+    return FORMATS.get(os.path.splitext(file_name.lower())[1])
+
+
+def read_chunks(stream, format, chunk_rows=CHUNK_ROWS):
+    """Yield DataFrames of at most ``chunk_rows`` rows from a binary stream."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig")
+    if format == "csv":
+        yield from pd.read_csv(
+            text, dtype=str, keep_default_na=False, chunksize=chunk_rows
+        )
+    elif format == "ndjson":
+        yield from pd.read_json(
+            text,
+            lines=True,
+            dtype=False,
+            convert_dates=False,
+            chunksize=chunk_rows,
+        )
+    elif format == "json":
+        # A JSON array has to be parsed whole before it can be sliced.
+        frame = pd.read_json(text, orient="records", dtype=False, convert_dates=False)
+        for start in range(0, len(frame), chunk_rows):
+            yield frame.iloc[start : start + chunk_rows]
+    else:
+        raise ValueError("format must be 'csv', 'json' or 'ndjson'")
+
+
+def _text(frame, column):
+    if column not in frame:
+        return pd.Series(pd.NA, index=frame.index, dtype="string")
+    return frame[column].astype("string")
+
+
+def _blank(values):
+    return values.str.strip().eq("").fillna(True).to_numpy(bool)
+
+
+def _tags(frame, errors):
+    """Normalise the tags column to one row per (record, tag)."""
+    if "tags" not in frame:
+        return pd.Series(dtype="string")
+
+    lists = frame["tags"].map(
+        lambda value: value.split(",") if isinstance(value, str) else value
+    )
+    tags = lists.explode().dropna().astype("string").str.strip()
+    tags = tags[tags != ""]
+    tags = tags[~tags.reset_index().duplicated().to_numpy()]
+
+    too_long = tags.str.len().gt(Tag.MAX_LENGTH).to_numpy(bool)
+    for row in tags.index[too_long].unique():
+        errors.setdefault(row, []).append(
+            f"tags must be at most {Tag.MAX_LENGTH} characters"
+        )
+    return tags
+
+
+def validate(frame, kind, now):
+    """Return ``(rows, tags, errors)`` for one chunk.
+
+    ``rows`` holds the valid rows ready to load, ``tags`` maps their index to
+    tag names (notes only) and ``errors`` maps the index of every rejected
+    row to its messages.
+    """
+    spec = KINDS[kind]
+    errors = {}
+
+    def reject(mask, message):
+        for row in frame.index[mask]:
+            errors.setdefault(row, []).append(message)
+
+    rows = pd.DataFrame(index=frame.index)
+    for column in spec["required"]:
+        values = _text(frame, column)
+        reject(_blank(values), f"{column} is required")
+        rows[column] = values
+    for column in spec["optional"]:
+        values = _text(frame, column)
+        rows[column] = values.mask(_blank(values))
+
+    reject(
+        rows["title"].str.len().gt(TITLE_LENGTH).fillna(False).to_numpy(bool),
+        f"title must be at most {TITLE_LENGTH} characters",
+    )
+
+    if "status" in rows:
+        status = rows["status"].fillna("planned")
+        reject(~status.isin(STATUSES).to_numpy(bool), "status is not valid")
+        rows["status"] = status
+
+    for column in spec["dates"]:
+        values = _text(frame, column)
+        values = values.mask(_blank(values))
+        parsed = pd.to_datetime(values, errors="coerce", format="ISO8601", utc=True)
+        reject(
+            (parsed.isna() & values.notna()).to_numpy(bool),
+            f"{column} must be an ISO 8601 date",
+        )
+        rows[column] = parsed.dt.tz_localize(None)
+    rows["created_at"] = rows["created_at"].fillna(now)
+    rows["updated_at"] = rows["updated_at"].fillna(rows["created_at"])
+
+    tags = _tags(frame, errors) if kind == "notes" else pd.Series(dtype="string")
+
+    valid = ~rows.index.isin(list(errors))
+    rows = rows[valid].copy()
+    tags = tags[tags.index.isin(rows.index)]
+    if kind == "notes":
+        rows["tags"] = tags.groupby(level=0, sort=False).agg(",".join)
+    return rows, tags, errors
+
+
+def _copy(table, frame):
+    connection = db.session.connection()
+    preparer = connection.dialect.identifier_preparer
+    statement = "COPY {} ({}) FROM STDIN WITH (FORMAT csv)".format(
+        preparer.format_table(table),
+        ", ".join(preparer.quote(column) for column in frame.columns),
+    )
+    # Blank optional values were turned into NULLs during validation, so an
+    # unquoted empty field is always NULL and never an empty string.
+    buffer = io.StringIO()
+    frame.to_csv(
+        buffer, index=False, header=False, date_format="%Y-%m-%d %H:%M:%S.%f"
+    )
+    buffer.seek(0)
+
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    except connection.dialect.loaded_dbapi.Error as e:
+        raise DBAPIError(statement, None, e) from e
+    finally:
+        cursor.close()
+
+
+def _load(table, frame):
+    if frame.empty:
+        return
+    if db.session.get_bind().dialect.name == "postgresql":
+        _copy(table, frame)
+        return
+    records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    db.session.execute(db.insert(table), records)
+
+
+def import_rows(stream, format, kind, user_id, dry_run=False, chunk_rows=CHUNK_ROWS):
+    """Validate and load every row of ``stream`` as notes or experiments.
+
+    Valid rows are loaded and invalid ones reported, all in the caller's
+    transaction. With ``dry_run`` nothing is written.
+    """
+    if kind not in KINDS:
+        raise ValueError("kind must be 'notes' or 'experiments'")
+    table = KINDS[kind]["model"].__table__
+    now = datetime.utcnow()
+    summary = {"kind": kind, "rows": 0, "imported": 0, "failed": 0, "errors": []}
+
+    for frame in read_chunks(stream, format, chunk_rows):
+        offset = summary["rows"]
+        frame = frame.set_axis(pd.RangeIndex(offset, offset + len(frame)))
+        rows, tags, errors = validate(frame, kind, now)
+
+        summary["rows"] += len(frame)
+        summary["imported"] += len(rows)
+        summary["failed"] += len(errors)
+        room = MAX_ERRORS - len(summary["errors"])
+        summary["errors"].extend(
+            {"row": row + 1, "errors": errors[row]} for row in sorted(errors)[:room]
+        )
+        if dry_run or rows.empty:
+            continue
+
+        ids = pd.Series([uuid.uuid4() for _ in range(len(rows))], index=rows.index)
+        rows.insert(0, "user_id", user_id)
+        rows.insert(0, "id", ids)
+        _load(table, rows)
+        deltas = {kind: len(rows)}
+        if kind == "experiments":
+            for status, count in rows["status"].value_counts().items():
+                deltas[status_name(status)] = int(count)
+        record_stats(user_id, deltas)
+
+        if kind == "notes" and not tags.empty:
+            tag_ids = resolve_tag_ids(user_id, set(tags))
+            links = pd.DataFrame(
+                {
+                    "note_id": ids.loc[tags.index].to_numpy(),
+                    "tag_id": tags.map(tag_ids).to_numpy(),
+                }
+            )
+            _load(note_tags, links)
+
+    summary["errors_truncated"] = summary["failed"] > len(summary["errors"])
+    return summary
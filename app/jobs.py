@@ -0,0 +1,202 @@
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+
+from workers.jobs import JobCancelled, init_worker, run
+
+from .models import db, AnalysisJob
+
+HEARTBEAT_INTERVAL = 60
+
+
+class JobRunner:
+    """Runs CPU-bound analyses in a local process pool.
+
+    Job state lives in the analysis_jobs table so any web worker can answer a
+    poll or record a cancel request. The process that submitted a job owns its
+    future; a monitor thread there copies progress and results into the
+    database and forwards cancel requests to the pool.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.max_workers = app.config["JOB_WORKERS"]
+        self.poll_interval = app.config["JOB_POLL_INTERVAL"]
+        app.extensions["jobs"] = self
+
+    def _start(self):
+        # Pools are created lazily, and again after a fork, because gunicorn
+        # forks workers after the app is imported.
+        if self._pid == os.getpid():
+            return
+        context = multiprocessing.get_context("spawn")
+        self._manager = context.Manager()
+        self._progress = self._manager.Queue()
+        self._cancelled = self._manager.dict()
+        self._executor = self._new_executor(context)
+        self._futures = {}
+        self._finished = queue.Queue()
+        self._heartbeat = datetime.utcnow()
+        self._pid = os.getpid()
+        threading.Thread(target=self._monitor, name="jobs", daemon=True).start()
+
+    def _new_executor(self, context):
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=init_worker,
+            initargs=(self._progress, self._cancelled),
+        )
+
+    def submit(self, job, sequence, options):
+        """Queue ``job``. It must already be committed so the monitor sees it."""
+        with self._lock:
+            self._start()
+            try:
+                future = self._executor.submit(
+                    run, job.id, job.kind, sequence, options
+                )
+            except BrokenProcessPool:
+                self._executor = self._new_executor(
+                    multiprocessing.get_context("spawn")
+                )
+                future = self._executor.submit(
+                    run, job.id, job.kind, sequence, options
+                )
+            self._futures[job.id] = future
+        future.add_done_callback(
+            lambda future, job_id=job.id: self._finished.put((job_id, future))
+        )
+
+    def _monitor(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    self._record_progress()
+                    self._record_finished()
+                    self._forward_cancellations()
+                    db.session.commit()
+            except Exception:
+                self.app.logger.exception("Job monitor error")
+            self._wait()
+
+    def _wait(self):
+        try:
+            job_id, future = self._finished.get(timeout=self.poll_interval)
+        except queue.Empty:
+            return
+        self._finished.put((job_id, future))
+
+    def _record_progress(self):
+        latest = {}
+        while True:
+            try:
+                job_id, fraction = self._progress.get_nowait()
+            except queue.Empty:
+                break
+            latest[job_id] = fraction
+
+        now = datetime.utcnow()
+        for job_id, fraction in latest.items():
+            job = db.session.get(AnalysisJob, job_id)
+            if not job or job.finished:
+                continue
+            if job.status == "queued":
+                job.status = "running"
+                job.started_at = now
+            job.progress = fraction
+
+    def _record_finished(self):
+        while True:
+            try:
+                job_id, future = self._finished.get_nowait()
+            except queue.Empty:
+                break
+
+            with self._lock:
+                self._futures.pop(job_id, None)
+            self._cancelled.pop(job_id, None)
+
+            job = db.session.get(AnalysisJob, job_id)
+            if not job:
+                continue
+            job.finished_at = datetime.utcnow()
+            try:
+                job.result = future.result()
+                job.status = "succeeded"
+                job.progress = 1.0
+            except (CancelledError, JobCancelled):
+                job.status = "cancelled"
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e) or type(e).__name__
+
+    def _forward_cancellations(self):
+        with self._lock:
+            pending = list(self._futures.items())
+        if not pending:
+            return
+
+        requested = set(
+            db.session.scalars(
+                db.select(AnalysisJob.id).where(
+                    AnalysisJob.id.in_([job_id for job_id, _ in pending]),
+                    AnalysisJob.cancel_requested.is_(True),
+                )
+            )
+        )
+        now = datetime.utcnow()
+        if now - self._heartbeat > timedelta(seconds=HEARTBEAT_INTERVAL):
+            self._heartbeat = now
+            db.session.execute(
+                db.update(AnalysisJob)
+                .where(AnalysisJob.id.in_([job_id for job_id, _ in pending]))
+                .values(updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+
+        for job_id, future in pending:
+            # A queued future is dropped by cancel(); a running one stops at
+            # its next progress report. Either way the done callback records it.
+            if job_id in requested and not future.cancel():
+                self._cancelled[job_id] = True
+
+
+def fail_stale_jobs(older_than):
+    """Mark unfinished jobs with no update for ``older_than`` seconds as failed.
+
+    Jobs are owned by the process that submitted them, so a restart or crash
+    leaves them unfinished for good. Live owners touch their jobs every
+    HEARTBEAT_INTERVAL seconds, so any threshold well above that is safe.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=older_than)
+    return (
+        db.session.execute(
+            db.update(AnalysisJob)
+            .where(
+                AnalysisJob.status.in_(("queued", "running")),
+                AnalysisJob.updated_at < cutoff,
+            )
+            .values(
+                status="failed",
+                error="Worker lost",
+                finished_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    )
+
+
+jobs = JobRunner()
@@ -1,6 +1,12 @@
+import threading
+import time
+from bisect import bisect_left
 from functools import wraps
-from flask import jsonify
+
+from flask import g, has_request_context, jsonify, request
 from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 
 def require_auth(func):
@@ -11,3 +17,173 @@ def require_auth(func):
         return func(*args, **kwargs)
 
     return decorated
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Prometheus-style histogram keyed by a tuple of label values."""
+
+    def __init__(self, name, help, labels, buckets):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, values, amount):
+        with self._lock:
+            series = self._series.get(values)
+            if series is None:
+                series = self._series[values] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect_left(self.buckets, amount)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += amount
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {
+                values: (list(counts), total, count)
+                for values, (counts, total, count) in self._series.items()
+            }
+        for values, (counts, total, count) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _labels(self.labels, values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _labels(self.labels, values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {count}")
+            labels = _labels(self.labels, values)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Metrics:
+    """Per-request latency, SQL and response size metrics.
+
+    SQL statements are counted with engine events and attributed to the
+    request that ran them; statements outside a request (CLI commands, the
+    job monitor) are not recorded. Each process keeps its own registry, so
+    under gunicorn a scrape reports the worker that served it.
+    """
+
+    def __init__(self, app=None):
+        labels = ("method", "endpoint", "status")
+        self.latency = Histogram(
+            "http_request_duration_seconds",
+            "Time spent handling a request.",
+            labels,
+            LATENCY_BUCKETS,
+        )
+        self.statements = Histogram(
+            "http_request_sql_statements",
+            "SQL statements executed per request.",
+            labels,
+            STATEMENT_BUCKETS,
+        )
+        self.sql_time = Histogram(
+            "http_request_sql_duration_seconds",
+            "Time spent in SQL statements per request.",
+            labels,
+            LATENCY_BUCKETS,
+        )
+        self.response_size = Histogram(
+            "http_response_size_bytes",
+            "Size of response bodies with a known length.",
+            labels,
+            SIZE_BUCKETS,
+        )
+        self.histograms = (
+            self.latency,
+            self.statements,
+            self.sql_time,
+            self.response_size,
+        )
+        self.collectors = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        if not event.contains(Engine, "before_cursor_execute", _before_execute):
+            event.listen(Engine, "before_cursor_execute", _before_execute)
+            event.listen(Engine, "after_cursor_execute", _after_execute)
+            event.listen(Engine, "handle_error", _execute_failed)
+        app.extensions["metrics"] = self
+
+    def _start_request(self):
+        g.metrics_started = time.perf_counter()
+        g.sql_statements = 0
+        g.sql_time = 0.0
+
+    def _finish_request(self, response):
+        started = g.get("metrics_started")
+        if started is None:
+            return response
+
+        endpoint = request.endpoint or "unmatched"
+        values = (request.method, endpoint, response.status_code)
+        self.latency.observe(values, time.perf_counter() - started)
+        self.statements.observe(values, g.sql_statements)
+        self.sql_time.observe(values, g.sql_time)
+        # Streamed bodies have no length until they are sent.
+        if response.content_length is not None:
+            self.response_size.observe(values, response.content_length)
+        return response
+
+    def register(self, collector):
+        """Add a callable returning extra exposition lines to every scrape."""
+        self.collectors.append(collector)
+
+    def render(self):
+        lines = []
+        for histogram in self.histograms:
+            lines.extend(histogram.render())
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and conn.info.get("metrics_started"):
+        elapsed = time.perf_counter() - conn.info["metrics_started"].pop()
+        if "sql_statements" in g:
+            g.sql_statements += 1
+            g.sql_time += elapsed
+
+
+def _execute_failed(context):
+    # after_cursor_execute doesn't fire for a failed statement.
+    if context.connection is not None and context.connection.info.get(
+        "metrics_started"
+    ):
+        context.connection.info["metrics_started"].pop()
+
+
+metrics = Metrics()
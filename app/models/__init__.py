@@ -1,3 +1,18 @@
 from .db import db, SCHEMA
 from .user import User
-from .notebook import Note, Experiment, ExperimentStep, ExperimentAttachment
+from .notebook import (
+    Note,
+    Tag,
+    note_tags,
+    Experiment,
+    ExperimentStep,
+    ExperimentAttachment,
+)
+from .sequence import (
+    AlignmentResult,
+    RestrictionSite,
+    SequenceRecord,
+    SequenceSketch,
+)
+from .job import AnalysisJob
+from .stats import UserStat
@@ -1,8 +1,50 @@
 import os
 
-from sqlalchemy import MetaData
+from flask import g, has_request_context
+from sqlalchemy import MetaData, event
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 
 SCHEMA = os.environ.get("SCHEMA")
 metadata = MetaData(schema=SCHEMA)
-db = SQLAlchemy(metadata=metadata)
+
+
+class RoutingSession(Session):
+    """Sends SELECTs to the "replica" bind in requests that allow it.
+
+    Flushes, DML and anything not built as a SELECT stay on the primary, so a
+    routed request that writes still writes to the right place.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and getattr(clause, "is_select", False)
+            and has_request_context()
+            and g.get("read_replica")
+        ):
+            return self._db.engines["replica"]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(metadata=metadata, session_options={"class_": RoutingSession})
+
+
+def _enable_foreign_keys(dbapi_connection, record):
+    # SQLite ignores ON DELETE CASCADE unless each connection opts in.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def enforce_foreign_keys(app):
+    """Turn on foreign key enforcement for the app's SQLite engines.
+
+    note_tags relies on ON DELETE CASCADE when a note or tag is deleted.
+    Migrations build their own engine and are unaffected.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite":
+                event.listen(engine, "connect", _enable_foreign_keys)
@@ -0,0 +1,62 @@
+import uuid
+from datetime import datetime
+from .db import db, SCHEMA
+
+
+class AnalysisJob(db.Model):
+    __tablename__ = "analysis_jobs"
+    __table_args__ = (
+        db.Index(
+            "ix_analysis_jobs_experiment_id_created_at", "experiment_id", "created_at"
+        ),
+        db.Index("ix_analysis_jobs_status", "status"),
+        {"schema": SCHEMA},
+    )
+
+    FINISHED = ("succeeded", "failed", "cancelled")
+
+    id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("users.id"), nullable=False
+    )
+    experiment_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("experiments.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    kind = db.Column(db.String(50), nullable=False)  # See workers.analyses.ANALYSES
+    status = db.Column(
+        db.String(20), default="queued", nullable=False
+    )  # queued, running, succeeded, failed, cancelled
+    progress = db.Column(db.Float, default=0.0, nullable=False)
+    params = db.Column(db.JSON, nullable=False)
+    result = db.deferred(db.Column(db.JSON))
+    error = db.Column(db.Text)
+    cancel_requested = db.Column(db.Boolean, default=False, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    experiment = db.relationship("Experiment", back_populates="jobs")
+
+    @property
+    def finished(self):
+        return self.status in self.FINISHED
+
+    def to_dict(self):
+        return {
+            "id": str(self.id),
+            "experiment_id": str(self.experiment_id),
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "params": self.params,
+            "error": self.error,
+            "cancel_requested": self.cancel_requested,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
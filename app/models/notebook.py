@@ -1,11 +1,108 @@
 import uuid
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload, subqueryload
 from .db import db, SCHEMA
+from ..serialization import Serializable
 
+CHILD_LOADERS = {
+    "selectin": selectinload,
+    "subquery": subqueryload,
+    "joined": joinedload,
+}
 
-class Note(db.Model):
+
+note_tags = db.Table(
+    "note_tags",
+    db.Column(
+        "note_id",
+        db.UUID(as_uuid=True),
+        db.ForeignKey("notes.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    db.Column(
+        "tag_id",
+        db.UUID(as_uuid=True),
+        db.ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    db.Index("ix_note_tags_tag_id_note_id", "tag_id", "note_id"),
+    schema=SCHEMA,
+)
+
+
+class Tag(db.Model):
+    __tablename__ = "tags"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "name", name="uq_tags_user_id_name"),
+        {"schema": SCHEMA},
+    )
+
+    MAX_LENGTH = 100
+
+    id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("users.id"), nullable=False
+    )
+    name = db.Column(db.String(MAX_LENGTH), nullable=False)
+
+    notes = db.relationship("Note", secondary=note_tags, back_populates="tag_records")
+
+    @staticmethod
+    def normalize(names):
+        seen = {}
+        for name in names or []:
+            name = str(name).strip()
+            if name:
+                seen.setdefault(name, None)
+        return list(seen)
+
+    @classmethod
+    def resolve(cls, user_id, names):
+        """Return Tag rows for ``names``, creating any the user doesn't have yet."""
+        if not names:
+            return []
+
+        existing = {
+            tag.name: tag
+            for tag in cls.query.filter(cls.user_id == user_id, cls.name.in_(names))
+        }
+        for name in names:
+            if name in existing:
+                continue
+            tag = cls(user_id=user_id, name=name)
+            try:
+                with db.session.begin_nested():
+                    db.session.add(tag)
+            except IntegrityError:
+                # Another request created the same tag first
+                tag = cls.query.filter_by(user_id=user_id, name=name).one()
+            existing[name] = tag
+        return [existing[name] for name in names]
+
+
+def _split_tags(tags):
+    return tags.split(",") if tags else []
+
+
+class Note(db.Model, Serializable):
     __tablename__ = "notes"
-    __table_args__ = {"schema": SCHEMA}
+    __table_args__ = (
+        db.Index("ix_notes_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        {"schema": SCHEMA},
+    )
+
+    SERIALIZED_FIELDS = (
+        "id",
+        "user_id",
+        "title",
+        "content",
+        "created_at",
+        "updated_at",
+        "tags",
+    )
+    SUMMARY_COLUMNS = ("id", "user_id", "title", "created_at", "updated_at", "tags")
+    FORMATTERS = {"tags": _split_tags}
 
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = db.Column(
@@ -17,25 +114,64 @@ class Note(db.Model):
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
-    tags = db.Column(db.String(255))  # Comma-separated tags
+    # Comma-separated copy of tag_records, kept so to_dict() needs no join
+    tags = db.Column(db.Text)
 
     user = db.relationship("User", back_populates="notes")
+    tag_records = db.relationship(
+        "Tag", secondary=note_tags, back_populates="notes", passive_deletes=True
+    )
 
-    def to_dict(self):
-        return {
-            "id": str(self.id),
-            "user_id": str(self.user_id),
-            "title": self.title,
-            "content": self.content,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "tags": self.tags.split(",") if self.tags else [],
-        }
+    def set_tags(self, names):
+        names = Tag.normalize(names)
+        self.tags = ",".join(names)
+        self.tag_records = Tag.resolve(self.user_id, names)
 
+    def to_dict(self, fields=None):
+        return self.serialize(fields)
 
-class Experiment(db.Model):
+    def to_summary_dict(self):
+        return self.serialize(self.SUMMARY_COLUMNS)
+
+
+class Experiment(db.Model, Serializable):
     __tablename__ = "experiments"
-    __table_args__ = {"schema": SCHEMA}
+    __table_args__ = (
+        db.Index(
+            "ix_experiments_user_id_updated_at_id", "user_id", "updated_at", "id"
+        ),
+        {"schema": SCHEMA},
+    )
+
+    STATUSES = ("planned", "in_progress", "completed", "failed")
+
+    SERIALIZED_FIELDS = (
+        "id",
+        "user_id",
+        "title",
+        "hypothesis",
+        "materials",
+        "methods",
+        "results",
+        "conclusion",
+        "status",
+        "started_at",
+        "completed_at",
+        "created_at",
+        "updated_at",
+        "references",
+    )
+    EXTRA_FIELDS = ("steps", "attachments")
+    SUMMARY_COLUMNS = (
+        "id",
+        "user_id",
+        "title",
+        "status",
+        "started_at",
+        "completed_at",
+        "created_at",
+        "updated_at",
+    )
 
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = db.Column(
@@ -47,9 +183,7 @@ class Experiment(db.Model):
     methods = db.Column(db.Text, nullable=False)
     results = db.Column(db.Text)
     conclusion = db.Column(db.Text)
-    status = db.Column(
-        db.String(50), default="planned"
-    )  # planned, in_progress, completed, failed
+    status = db.Column(db.String(50), default="planned")  # One of STATUSES
     started_at = db.Column(db.DateTime)
     completed_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -60,46 +194,76 @@ class Experiment(db.Model):
 
     user = db.relationship("User", back_populates="experiments")
     steps = db.relationship(
-        "ExperimentStep", back_populates="experiment", cascade="all, delete-orphan"
+        "ExperimentStep",
+        back_populates="experiment",
+        cascade="all, delete-orphan",
+        order_by="ExperimentStep.position",
     )
     attachments = db.relationship(
         "ExperimentAttachment",
         back_populates="experiment",
         cascade="all, delete-orphan",
+        order_by="ExperimentAttachment.created_at",
+    )
+    jobs = db.relationship(
+        "AnalysisJob",
+        back_populates="experiment",
+        cascade="all, delete-orphan",
     )
 
-    def to_dict(self):
-        return {
-            "id": str(self.id),
-            "user_id": str(self.user_id),
-            "title": self.title,
-            "hypothesis": self.hypothesis,
-            "materials": self.materials,
-            "methods": self.methods,
-            "results": self.results,
-            "conclusion": self.conclusion,
-            "status": self.status,
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": (
-                self.completed_at.isoformat() if self.completed_at else None
-            ),
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "references": self.references,
-            "steps": [step.to_dict() for step in self.steps],
-            "attachments": [attachment.to_dict() for attachment in self.attachments],
-        }
+    @classmethod
+    def load_children(cls, strategy="selectin", children=EXTRA_FIELDS):
+        """Loader options that fetch steps and attachments for a whole result
+        set in a fixed number of queries instead of one per experiment."""
+        if strategy not in CHILD_LOADERS:
+            raise ValueError(f"Unknown loader strategy: {strategy}")
+        loader = CHILD_LOADERS[strategy]
+        return tuple(loader(getattr(cls, name)) for name in children)
+
+    def to_dict(self, children=True, fields=None):
+        data = self.serialize(fields)
+        if children and (fields is None or "steps" in fields):
+            data["steps"] = [
+                step.to_dict(step_number=i + 1) for i, step in enumerate(self.steps)
+            ]
+        if children and (fields is None or "attachments" in fields):
+            data["attachments"] = [
+                attachment.to_dict() for attachment in self.attachments
+            ]
+        return data
+
+    def to_summary_dict(self):
+        return self.serialize(self.SUMMARY_COLUMNS)
 
 
-class ExperimentStep(db.Model):
+class ExperimentStep(db.Model, Serializable):
     __tablename__ = "experiment_steps"
-    __table_args__ = {"schema": SCHEMA}
+    __table_args__ = (
+        db.UniqueConstraint(
+            "experiment_id",
+            "position",
+            name="uq_experiment_steps_experiment_id_position",
+        ),
+        {"schema": SCHEMA},
+    )
+
+    SERIALIZED_FIELDS = (
+        "id",
+        "experiment_id",
+        "description",
+        "observation",
+        "started_at",
+        "completed_at",
+        "created_at",
+        "updated_at",
+    )
 
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     experiment_id = db.Column(
         db.UUID(as_uuid=True), db.ForeignKey("experiments.id"), nullable=False
     )
-    step_number = db.Column(db.Integer, nullable=False)
+    # Sparse sort key; see app.ordering. step_number is derived from it.
+    position = db.Column(db.BigInteger, nullable=False)
     description = db.Column(db.Text, nullable=False)
     observation = db.Column(db.Text)
     started_at = db.Column(db.DateTime)
@@ -111,26 +275,46 @@ class ExperimentStep(db.Model):
 
     experiment = db.relationship("Experiment", back_populates="steps")
 
-    def to_dict(self):
-        return {
-            "id": str(self.id),
-            "experiment_id": str(self.experiment_id),
-            "step_number": self.step_number,
-            "description": self.description,
-            "observation": self.observation,
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": (
-                self.completed_at.isoformat() if self.completed_at else None
-            ),
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-        }
+    def to_dict(self, step_number=None):
+        data = self.serialize()
+        data["step_number"] = step_number or self.step_number
+        return data
+
 
+# A Core alias rather than aliased(): building an ORM alias here would
+# configure the mappers before ExperimentAttachment is defined.
+_preceding_step = ExperimentStep.__table__.alias("preceding_step")
 
-class ExperimentAttachment(db.Model):
+# 1-based rank of a step within its experiment. Deferred so it is only queried
+# when a single step is serialized; Experiment.to_dict numbers steps itself.
+ExperimentStep.step_number = db.column_property(
+    db.select(db.func.count(_preceding_step.c.id))
+    .where(
+        _preceding_step.c.experiment_id == ExperimentStep.experiment_id,
+        _preceding_step.c.position <= ExperimentStep.position,
+    )
+    .correlate_except(_preceding_step)
+    .scalar_subquery(),
+    deferred=True,
+)
+
+
+class ExperimentAttachment(db.Model, Serializable):
     __tablename__ = "experiment_attachments"
     __table_args__ = {"schema": SCHEMA}
 
+    SERIALIZED_FIELDS = (
+        "id",
+        "experiment_id",
+        "file_name",
+        "file_type",
+        "file_path",
+        "description",
+        "size_bytes",
+        "sha256",
+        "created_at",
+    )
+
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     experiment_id = db.Column(
         db.UUID(as_uuid=True), db.ForeignKey("experiments.id"), nullable=False
@@ -139,17 +323,14 @@ class ExperimentAttachment(db.Model):
     file_type = db.Column(db.String(100), nullable=False)
     file_path = db.Column(db.String(500), nullable=False)
     description = db.Column(db.Text)
+    size_bytes = db.Column(db.BigInteger)
+    sha256 = db.Column(db.String(64), index=True)  # Storage key, None until uploaded
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
     experiment = db.relationship("Experiment", back_populates="attachments")
+    sequences = db.relationship(
+        "SequenceRecord", back_populates="attachment", cascade="all, delete-orphan"
+    )
 
     def to_dict(self):
-        return {
-            "id": str(self.id),
-            "experiment_id": str(self.experiment_id),
-            "file_name": self.file_name,
-            "file_type": self.file_type,
-            "file_path": self.file_path,
-            "description": self.description,
-            "created_at": self.created_at.isoformat(),
-        }
+        return self.serialize()
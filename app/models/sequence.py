@@ -0,0 +1,115 @@
+import uuid
+from datetime import datetime
+from .db import db, SCHEMA
+
+
+class SequenceRecord(db.Model):
+    __tablename__ = "sequence_records"
+    __table_args__ = (
+        db.Index("ix_sequence_records_user_id_record_id", "user_id", "record_id"),
+        {"schema": SCHEMA},
+    )
+
+    id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("users.id"), nullable=False
+    )
+    attachment_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("experiment_attachments.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    record_id = db.Column(db.String(255), nullable=False)  # Identifier in the file
+    description = db.Column(db.Text)
+    format = db.Column(db.String(20), nullable=False)  # fasta, genbank
+    length = db.Column(db.BigInteger, nullable=False)
+    circular = db.Column(db.Boolean, default=False, nullable=False)
+    # Byte range of the whole record within the attachment's blob
+    offset = db.Column(db.BigInteger, nullable=False)
+    raw_length = db.Column(db.BigInteger, nullable=False)
+    # Line geometry of the sequence (as in a .fai index; for GenBank, of the
+    # ORIGIN block); None when lines are irregular
+    seq_offset = db.Column(db.BigInteger)
+    line_bases = db.Column(db.Integer)
+    line_width = db.Column(db.Integer)
+    restriction_mapped = db.Column(db.Boolean, default=False, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    attachment = db.relationship("ExperimentAttachment", back_populates="sequences")
+    sketch = db.relationship(
+        "SequenceSketch",
+        back_populates="sequence",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
+    restriction_sites = db.relationship(
+        "RestrictionSite", back_populates="sequence", cascade="all, delete-orphan"
+    )
+
+    def to_dict(self):
+        return {
+            "id": str(self.id),
+            "attachment_id": str(self.attachment_id),
+            "record_id": self.record_id,
+            "description": self.description,
+            "format": self.format,
+            "length": self.length,
+            "circular": self.circular,
+            "restriction_mapped": self.restriction_mapped,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+class SequenceSketch(db.Model):
+    __tablename__ = "sequence_sketches"
+    __table_args__ = (
+        db.Index("ix_sequence_sketches_user_id", "user_id"),
+        {"schema": SCHEMA},
+    )
+
+    sequence_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("sequence_records.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id = db.Column(
+        db.UUID(as_uuid=True), db.ForeignKey("users.id"), nullable=False
+    )
+    k = db.Column(db.SmallInteger, nullable=False)
+    kmer_count = db.Column(db.BigInteger, nullable=False)  # Valid k-mers hashed
+    # Sorted bottom-s MinHash values as little-endian uint64s
+    hashes = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    sequence = db.relationship("SequenceRecord", back_populates="sketch")
+
+
+class RestrictionSite(db.Model):
+    __tablename__ = "restriction_sites"
+    __table_args__ = (
+        db.Index(
+            "ix_restriction_sites_sequence_id_cut_count", "sequence_id", "cut_count"
+        ),
+        {"schema": SCHEMA},
+    )
+
+    sequence_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("sequence_records.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    enzyme = db.Column(db.String(40), primary_key=True)
+    cut_count = db.Column(db.Integer, nullable=False)
+    positions = db.Column(db.JSON, nullable=False)  # 1-based, as Bio.Restriction
+
+    sequence = db.relationship("SequenceRecord", back_populates="restriction_sites")
+
+
+class AlignmentResult(db.Model):
+    __tablename__ = "alignment_results"
+    __table_args__ = {"schema": SCHEMA}
+
+    key = db.Column(db.String(64), primary_key=True)  # See app.alignment.cache_key
+    result = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,19 @@
+from .db import db, SCHEMA
+
+
+class UserStat(db.Model):
+    """One running count per user and name, maintained by app.stats.
+
+    Names are "notes", "experiments" and "experiments:<status>".
+    """
+
+    __tablename__ = "user_stats"
+    __table_args__ = {"schema": SCHEMA}
+
+    user_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    name = db.Column(db.String(80), primary_key=True)
+    value = db.Column(db.BigInteger, default=0, nullable=False)
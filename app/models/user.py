@@ -1,15 +1,18 @@
 import uuid
 
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
 
 from .db import db, SCHEMA
+from ..passwords import passwords
+from ..serialization import Serializable
 
 
-class User(db.Model, UserMixin):
+class User(db.Model, UserMixin, Serializable):
     __tablename__ = "users"
     __table_args__ = {"schema": SCHEMA}
 
+    SERIALIZED_FIELDS = ("id", "username", "email")
+
     id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -26,14 +29,10 @@ class User(db.Model, UserMixin):
 
     @password.setter
     def password(self, password):
-        self.hashed_password = generate_password_hash(password)
+        self.hashed_password = passwords.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.hashed_password, password)
+        return passwords.verify(self.hashed_password, password)
 
     def to_dict(self):
-        return {
-            "id": self.id,
-            "username": self.username,
-            "email": self.email,
-        }
+        return self.serialize()
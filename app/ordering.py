@@ -0,0 +1,195 @@
+from bisect import bisect_left
+
+from sqlalchemy.exc import IntegrityError
+
+from .models import db, ExperimentStep
+
+# Steps are ordered by sparse integer keys so an insert, delete or move writes
+# a single row. New keys are placed halfway between their neighbours. When two
+# neighbours become adjacent the experiment is renumbered (rebalanced).
+GAP = 1024
+
+# Temporary keys used while renumbering. (experiment_id, position) is unique,
+# so a row is parked out of the way before it moves onto another row's old key.
+PARKING_BASE = -(2**62)
+
+
+def between(before, after):
+    """Return a key strictly between two neighbours, or None if there is no room."""
+    if before is None and after is None:
+        return GAP
+    if before is None:
+        return after - GAP
+    if after is None:
+        return before + GAP
+    if after - before < 2:
+        return None
+    return (before + after) // 2
+
+
+def spread(before, after, count):
+    """Return ``count`` increasing keys strictly between two neighbours."""
+    if before is None and after is None:
+        return [GAP * (k + 1) for k in range(count)]
+    if before is None:
+        return [after - GAP * (count - k) for k in range(count)]
+    if after is None:
+        return [before + GAP * (k + 1) for k in range(count)]
+
+    step = (after - before) // (count + 1)
+    if step < 1:
+        return None
+    return [before + step * (k + 1) for k in range(count)]
+
+
+def _longest_increasing(keys):
+    """Indexes of a longest strictly increasing run of the non-None ``keys``."""
+    tails, tail_indexes, previous = [], [], {}
+    for index, key in enumerate(keys):
+        if key is None:
+            continue
+        slot = bisect_left(tails, key)
+        previous[index] = tail_indexes[slot - 1] if slot else None
+        if slot == len(tails):
+            tails.append(key)
+            tail_indexes.append(index)
+        else:
+            tails[slot] = key
+            tail_indexes[slot] = index
+
+    kept = set()
+    index = tail_indexes[-1] if tail_indexes else None
+    while index is not None:
+        kept.add(index)
+        index = previous[index]
+    return kept
+
+
+def assign_positions(current):
+    """Choose keys for items listed in their desired order.
+
+    ``current`` holds each item's existing key, or None for new items. As many
+    items as possible keep their key. The rest are placed in the gaps between
+    them, and everything is renumbered only when a gap is too small.
+    """
+    kept = _longest_increasing(current)
+    positions = [key if index in kept else None for index, key in enumerate(current)]
+
+    start = 0
+    while start < len(positions):
+        if positions[start] is not None:
+            start += 1
+            continue
+
+        end = start
+        while end < len(positions) and positions[end] is None:
+            end += 1
+
+        before = positions[start - 1] if start > 0 else None
+        after = positions[end] if end < len(positions) else None
+        keys = spread(before, after, end - start)
+        if keys is None:
+            return [GAP * (k + 1) for k in range(len(current))]
+
+        positions[start:end] = keys
+        start = end
+    return positions
+
+
+def reposition(rows):
+    """Bulk-move steps to new keys without tripping the unique constraint."""
+    if not rows:
+        return
+
+    db.session.execute(
+        db.update(ExperimentStep),
+        [{"id": row["id"], "position": PARKING_BASE + i} for i, row in enumerate(rows)],
+    )
+    db.session.execute(db.update(ExperimentStep), rows)
+
+
+def rebalance(experiment_id):
+    step_ids = db.session.scalars(
+        db.select(ExperimentStep.id)
+        .where(ExperimentStep.experiment_id == experiment_id)
+        .order_by(ExperimentStep.position)
+    ).all()
+    reposition(
+        [
+            {"id": step_id, "position": GAP * (i + 1)}
+            for i, step_id in enumerate(step_ids)
+        ]
+    )
+
+
+def _neighbours(experiment_id, after_step_id, append, exclude_id=None):
+    siblings = [ExperimentStep.experiment_id == experiment_id]
+    if exclude_id:
+        siblings.append(ExperimentStep.id != exclude_id)
+
+    if append:
+        last = db.session.scalar(
+            db.select(db.func.max(ExperimentStep.position)).where(*siblings)
+        )
+        return last, None
+
+    before = None
+    if after_step_id:
+        before = db.session.scalar(
+            db.select(ExperimentStep.position).where(
+                ExperimentStep.id == after_step_id, *siblings
+            )
+        )
+        if before is None:
+            raise LookupError("Step not found")
+        siblings.append(ExperimentStep.position > before)
+
+    after = db.session.scalar(
+        db.select(db.func.min(ExperimentStep.position)).where(*siblings)
+    )
+    return before, after
+
+
+def slot_position(experiment_id, after_step_id=None, append=False, exclude_id=None):
+    """Key for a step placed after ``after_step_id``, at the front when it is
+    None, or at the end when ``append`` is set."""
+    position = between(
+        *_neighbours(experiment_id, after_step_id, append, exclude_id)
+    )
+    if position is None:
+        rebalance(experiment_id)
+        position = between(
+            *_neighbours(experiment_id, after_step_id, append, exclude_id)
+        )
+    return position
+
+
+def place_step(step, after_step_id=None, append=False, attempts=3):
+    """Give ``step`` a key and flush it, retrying if a concurrent insert or move
+    claimed the same key first."""
+    for attempt in range(attempts):
+        try:
+            with db.session.begin_nested():
+                step.position = slot_position(
+                    step.experiment_id, after_step_id, append, exclude_id=step.id
+                )
+                db.session.add(step)
+            return
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
+
+
+def uneven_experiments(min_gap=2):
+    """Experiments with two neighbouring steps less than ``min_gap`` apart."""
+    gap = (
+        ExperimentStep.position
+        - db.func.lag(ExperimentStep.position).over(
+            partition_by=ExperimentStep.experiment_id,
+            order_by=ExperimentStep.position,
+        )
+    ).label("gap")
+    gaps = db.select(ExperimentStep.experiment_id, gap).subquery()
+    return db.session.scalars(
+        db.select(gaps.c.experiment_id).where(gaps.c.gap < min_gap).distinct()
+    ).all()
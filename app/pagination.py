@@ -0,0 +1,81 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+
+from flask import current_app, request, url_for
+
+from .models import db
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(updated_at: datetime, row_id: uuid.UUID) -> str:
+    payload = json.dumps([updated_at.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(updated_at), uuid.UUID(row_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+
+def page_size() -> int:
+    limit = request.args.get("limit", current_app.config["PAGE_SIZE"])
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError) as e:
+        raise ValueError("limit must be an integer") from e
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, current_app.config["MAX_PAGE_SIZE"])
+
+
+def keyset_page(query, model, column=None):
+    """Return one page of ``query`` ordered newest first, plus the next cursor.
+
+    Rows are ordered by ``(updated_at, id)`` descending so the
+    ``(user_id, updated_at, id)`` index can serve both the ordering and the
+    cursor predicate without a sort or an OFFSET scan. Pass ``column`` to key
+    on another timestamp, such as ``created_at`` for rows that never change.
+    """
+    column = model.updated_at if column is None else column
+    limit = page_size()
+    query = query.order_by(column.desc(), model.id.desc())
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.filter(
+            db.tuple_(column, model.id) < db.tuple_(timestamp, row_id)
+        )
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(getattr(rows[-1], column.key), rows[-1].id)
+
+
+def page_headers(next_cursor: str | None) -> dict[str, str]:
+    if not next_cursor:
+        return {}
+
+    args = {**request.args.to_dict(), "cursor": next_cursor}
+    next_url = url_for(request.endpoint, **(request.view_args or {}), **args)
+    return {"X-Next-Cursor": next_cursor, "Link": f'<{next_url}>; rel="next"'}
+
+
+def list_view() -> str:
+    view = request.args.get("view", "full")
+    if view not in ("full", "summary"):
+        raise ValueError("view must be 'full' or 'summary'")
+    return view
@@ -0,0 +1,77 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+
+
+class HasherBusy(Exception):
+    """Raised instead of queueing when too many hashes are already waiting."""
+
+
+class PasswordHasher:
+    """Runs password hashing in a small bounded thread pool.
+
+    hashlib's scrypt and PBKDF2 release the GIL, so under threaded workers
+    other requests keep being served while a hash is computed. At most
+    PASSWORD_HASH_WORKERS hashes run at once per process and
+    PASSWORD_HASH_QUEUE more may wait; past that, callers get HasherBusy
+    rather than piling up behind the KDF.
+    """
+
+    def __init__(self, app=None):
+        self.method = DEFAULT_METHOD
+        self.workers = 2
+        self.queue = 32
+        self._prefix = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config["PASSWORD_HASH_METHOD"]
+        self.workers = app.config["PASSWORD_HASH_WORKERS"]
+        self.queue = app.config["PASSWORD_HASH_QUEUE"]
+        self._prefix = None
+        app.extensions["passwords"] = self
+
+    def _pool(self):
+        # Threads don't survive a fork, so each process makes its own pool.
+        with self._lock:
+            if self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="passwords"
+                )
+                self._slots = threading.BoundedSemaphore(self.workers + self.queue)
+                self._pid = os.getpid()
+            return self._executor, self._slots
+
+    def _run(self, func, *args):
+        executor, slots = self._pool()
+        if not slots.acquire(blocking=False):
+            raise HasherBusy()
+        try:
+            return executor.submit(func, *args).result()
+        finally:
+            slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Whether a stored hash was made with other parameters than the
+        configured method, e.g. after PASSWORD_HASH_METHOD was raised."""
+        if self._prefix is None:
+            # werkzeug fills in defaults ("scrypt" -> "scrypt:32768:8:1"),
+            # so compare against the prefix it actually writes.
+            self._prefix = generate_password_hash("", self.method).split("$", 1)[0]
+        return password_hash.split("$", 1)[0] != self._prefix
+
+
+passwords = PasswordHasher()
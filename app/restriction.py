@@ -0,0 +1,52 @@
+import re
+
+from Bio.Restriction import Analysis, CommOnly
+from Bio.Seq import Seq
+
+from .models import db, RestrictionSite
+
+# Restriction maps are computed once per record at ingest against the
+# commercially available enzymes, and queried from restriction_sites after.
+ENZYMES = {str(enzyme): enzyme for enzyme in CommOnly}
+DNA = re.compile(r"[ACGTRYSWKMBDHVN]+", re.I)
+
+
+def mappable(sequence, max_length):
+    return 0 < len(sequence) <= max_length and DNA.fullmatch(sequence) is not None
+
+
+def map_record(record, sequence, max_length):
+    """Add a record's restriction sites to the session, if it is mappable DNA.
+
+    Positions are Biopython's: the 1-based index of the first base after each
+    top-strand cut.
+    """
+    if not mappable(sequence, max_length):
+        return
+    analysis = Analysis(CommOnly, Seq(sequence.upper()), linear=not record.circular)
+    db.session.add_all(
+        RestrictionSite(
+            sequence=record,
+            enzyme=str(enzyme),
+            cut_count=len(positions),
+            positions=positions,
+        )
+        for enzyme, positions in analysis.full().items()
+        if positions
+    )
+    record.restriction_mapped = True
+
+
+def fragments(cuts, length, circular):
+    """Split a sequence at 1-based ``cuts`` into ``(start, end)`` fragments
+    with 0-based, end-exclusive coordinates. A circular fragment that spans
+    the origin has ``end`` past ``length``."""
+    cuts = sorted(set(cuts))
+    if circular:
+        if not cuts:
+            return [(0, length)]
+        bounds = [cut - 1 for cut in cuts] + [cuts[0] - 1 + length]
+        return list(zip(bounds, bounds[1:]))
+
+    bounds = [0] + [cut - 1 for cut in cuts] + [length]
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
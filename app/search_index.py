@@ -0,0 +1,292 @@
+import html
+import re
+import uuid
+
+from sqlalchemy import bindparam, text
+
+from .models import db, Note, Experiment
+
+SEARCH_KINDS = ("note", "experiment")
+
+# Postgres answers queries from expression GIN indexes over these documents,
+# so the query text must match the index definitions in the migration exactly.
+NOTE_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "to_tsvector('english', coalesce(content, '') || ' ' || "
+    "replace(coalesce(tags, ''), ',', ' '))"
+)
+EXPERIMENT_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "to_tsvector('english', coalesce(hypothesis, '') || ' ' || "
+    "coalesce(methods, '') || ' ' || coalesce(results, '') || ' ' || "
+    "coalesce(conclusion, ''))"
+)
+# Matches are delimited with private-use characters, and the text is escaped
+# before they become <mark> tags, so titles and snippets are safe HTML.
+MARK_START, MARK_END = "\ue000", "\ue001"
+HEADLINE_OPTIONS = (
+    f"StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=35, MinWords=15"
+)
+
+# SQLite keeps an FTS5 table in step with notes and experiments through
+# triggers. search_documents maps each FTS rowid back to its source row.
+SQLITE_INDEX_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS search_documents (
+        docid INTEGER PRIMARY KEY,
+        kind VARCHAR(20) NOT NULL,
+        ref_id CHAR(32) NOT NULL,
+        user_id CHAR(32) NOT NULL,
+        UNIQUE (kind, ref_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_user_id "
+    "ON search_documents (user_id)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index "
+    "USING fts5(title, body, tokenize = 'porter unicode61')",
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_search_insert AFTER INSERT ON notes BEGIN
+        INSERT INTO search_documents (kind, ref_id, user_id)
+        VALUES ('note', new.id, new.user_id);
+        INSERT INTO search_index (rowid, title, body)
+        VALUES (
+            (SELECT docid FROM search_documents
+             WHERE kind = 'note' AND ref_id = new.id),
+            new.title,
+            new.content || ' ' || replace(coalesce(new.tags, ''), ',', ' ')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_search_update AFTER UPDATE ON notes BEGIN
+        UPDATE search_index
+        SET title = new.title,
+            body = new.content || ' ' || replace(coalesce(new.tags, ''), ',', ' ')
+        WHERE rowid = (SELECT docid FROM search_documents
+                       WHERE kind = 'note' AND ref_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_search_delete AFTER DELETE ON notes BEGIN
+        DELETE FROM search_index
+        WHERE rowid = (SELECT docid FROM search_documents
+                       WHERE kind = 'note' AND ref_id = old.id);
+        DELETE FROM search_documents WHERE kind = 'note' AND ref_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS experiments_search_insert
+    AFTER INSERT ON experiments BEGIN
+        INSERT INTO search_documents (kind, ref_id, user_id)
+        VALUES ('experiment', new.id, new.user_id);
+        INSERT INTO search_index (rowid, title, body)
+        VALUES (
+            (SELECT docid FROM search_documents
+             WHERE kind = 'experiment' AND ref_id = new.id),
+            new.title,
+            new.hypothesis || ' ' || new.methods || ' ' ||
+            coalesce(new.results, '') || ' ' || coalesce(new.conclusion, '')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS experiments_search_update
+    AFTER UPDATE ON experiments BEGIN
+        UPDATE search_index
+        SET title = new.title,
+            body = new.hypothesis || ' ' || new.methods || ' ' ||
+                   coalesce(new.results, '') || ' ' || coalesce(new.conclusion, '')
+        WHERE rowid = (SELECT docid FROM search_documents
+                       WHERE kind = 'experiment' AND ref_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS experiments_search_delete
+    AFTER DELETE ON experiments BEGIN
+        DELETE FROM search_index
+        WHERE rowid = (SELECT docid FROM search_documents
+                       WHERE kind = 'experiment' AND ref_id = old.id);
+        DELETE FROM search_documents
+        WHERE kind = 'experiment' AND ref_id = old.id;
+    END
+    """,
+]
+
+SQLITE_BACKFILL = [
+    "DELETE FROM search_index",
+    "DELETE FROM search_documents",
+    """
+    INSERT INTO search_documents (kind, ref_id, user_id)
+    SELECT 'note', id, user_id FROM notes
+    UNION ALL
+    SELECT 'experiment', id, user_id FROM experiments
+    """,
+    """
+    INSERT INTO search_index (rowid, title, body)
+    SELECT d.docid, n.title,
+           n.content || ' ' || replace(coalesce(n.tags, ''), ',', ' ')
+    FROM notes n JOIN search_documents d ON d.kind = 'note' AND d.ref_id = n.id
+    """,
+    """
+    INSERT INTO search_index (rowid, title, body)
+    SELECT d.docid, e.title,
+           e.hypothesis || ' ' || e.methods || ' ' ||
+           coalesce(e.results, '') || ' ' || coalesce(e.conclusion, '')
+    FROM experiments e
+    JOIN search_documents d ON d.kind = 'experiment' AND d.ref_id = e.id
+    """,
+]
+
+
+def rebuild_index():
+    """Recreate the SQLite FTS index from scratch. Postgres needs no rebuild
+    because its GIN indexes are maintained by the database itself."""
+    if db.engine.dialect.name != "sqlite":
+        return False
+
+    with db.engine.begin() as connection:
+        for statement in SQLITE_INDEX_DDL + SQLITE_BACKFILL:
+            connection.exec_driver_sql(statement)
+    return True
+
+
+def _fts5_query(query: str) -> str:
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return ""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _marked(value):
+    if value is None:
+        return None
+    return (
+        html.escape(value)
+        .replace(MARK_START, "<mark>")
+        .replace(MARK_END, "</mark>")
+    )
+
+
+def _search_sqlite(user_id, query, kinds, limit, offset):
+    match = _fts5_query(query)
+    if not match:
+        return []
+
+    rows = db.session.execute(
+        text(
+            """
+            SELECT d.kind, d.ref_id,
+                   highlight(search_index, 0, :start, :end) AS title,
+                   snippet(search_index, 1, :start, :end, '…', 24) AS snippet,
+                   bm25(search_index, 4.0, 1.0) AS rank
+            FROM search_index
+            JOIN search_documents d ON d.docid = search_index.rowid
+            WHERE search_index MATCH :match
+              AND d.user_id = :user_id
+              AND d.kind IN :kinds
+            ORDER BY rank
+            LIMIT :limit OFFSET :offset
+            """
+        ).bindparams(bindparam("kinds", expanding=True)),
+        {
+            "match": match,
+            "start": MARK_START,
+            "end": MARK_END,
+            "user_id": user_id.hex,
+            "kinds": list(kinds),
+            "limit": limit,
+            "offset": offset,
+        },
+    )
+    return [
+        {
+            "type": row.kind,
+            "id": str(uuid.UUID(row.ref_id)),
+            "title": _marked(row.title),
+            "snippet": _marked(row.snippet),
+            "rank": -row.rank,
+        }
+        for row in rows
+    ]
+
+
+def _search_postgres(user_id, query, kinds, limit, offset):
+    notes_table = Note.__table__.fullname
+    experiments_table = Experiment.__table__.fullname
+
+    hits = []
+    if "note" in kinds:
+        hits.append(
+            f"""
+            SELECT 'note' AS kind, id, ts_rank({NOTE_DOCUMENT}, q.query) AS rank
+            FROM {notes_table}, q
+            WHERE user_id = :user_id AND {NOTE_DOCUMENT} @@ q.query
+            """
+        )
+    if "experiment" in kinds:
+        hits.append(
+            f"""
+            SELECT 'experiment' AS kind, id,
+                   ts_rank({EXPERIMENT_DOCUMENT}, q.query) AS rank
+            FROM {experiments_table}, q
+            WHERE user_id = :user_id AND {EXPERIMENT_DOCUMENT} @@ q.query
+            """
+        )
+
+    # Headlines are costly, so they are only built for the page being returned.
+    rows = db.session.execute(
+        text(
+            f"""
+            WITH q AS (SELECT websearch_to_tsquery('english', :query) AS query),
+            hits AS (
+                {" UNION ALL ".join(hits)}
+                ORDER BY rank DESC, id
+                LIMIT :limit OFFSET :offset
+            )
+            SELECT hits.kind, hits.id, hits.rank,
+                   coalesce(n.title, e.title) AS title,
+                   ts_headline(
+                       'english',
+                       coalesce(
+                           n.content,
+                           concat_ws(' ', e.hypothesis, e.methods,
+                                     e.results, e.conclusion)
+                       ),
+                       q.query,
+                       :options
+                   ) AS snippet
+            FROM hits
+            CROSS JOIN q
+            LEFT JOIN {notes_table} n ON hits.kind = 'note' AND n.id = hits.id
+            LEFT JOIN {experiments_table} e
+                ON hits.kind = 'experiment' AND e.id = hits.id
+            ORDER BY hits.rank DESC, hits.id
+            """
+        ),
+        {
+            "query": query,
+            "user_id": str(user_id),
+            "limit": limit,
+            "offset": offset,
+            "options": HEADLINE_OPTIONS,
+        },
+    )
+    return [
+        {
+            "type": row.kind,
+            "id": str(row.id),
+            "title": _marked(row.title),
+            "snippet": _marked(row.snippet),
+            "rank": row.rank,
+        }
+        for row in rows
+    ]
+
+
+def search(user_id, query, kinds=SEARCH_KINDS, limit=20, offset=0):
+    """Return ranked hits for ``query`` across the user's notes and experiments."""
+    if db.engine.dialect.name == "postgresql":
+        return _search_postgres(user_id, query, kinds, limit, offset)
+    return _search_sqlite(user_id, query, kinds, limit, offset)
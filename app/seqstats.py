@@ -0,0 +1,174 @@
+import math
+
+import numpy as np
+from Bio.Data.IUPACData import unambiguous_dna_weights
+from Bio.SeqUtils.MeltingTemp import DNA_NN3
+
+# Batch statistics for many DNA sequences at once. Sequences are concatenated
+# into one byte array and mapped to small integer codes, so every statistic is
+# a handful of array operations per batch instead of a Python loop per
+# sequence. Results match Bio.SeqUtils (gc_fraction, molecular_weight and
+# MeltingTemp.Tm_Wallace, Tm_GC and Tm_NN with their default settings).
+
+A, C, G, T, S, W, OTHER = range(7)
+CODE_COUNT = 7
+
+CODES = np.full(256, OTHER, dtype=np.uint8)
+for letters, code in (("Aa", A), ("Cc", C), ("Gg", G), ("TtUu", T), ("Ss", S)):
+    for letter in letters:
+        CODES[ord(letter)] = code
+for letter in "Ww":
+    CODES[ord(letter)] = W
+
+BASES = "ACGT"
+WEIGHTS = np.array([unambiguous_dna_weights[base] for base in BASES])
+WATER = 18.0153
+
+# Nearest-neighbour enthalpy (kcal/mol) and entropy (cal/K/mol) for every
+# dinucleotide, indexed by first * 4 + second.
+NN_ENTHALPY = np.zeros(16)
+NN_ENTROPY = np.zeros(16)
+COMPLEMENT = {"A": "T", "C": "G", "G": "C", "T": "A"}
+for first, first_base in enumerate(BASES):
+    for second, second_base in enumerate(BASES):
+        pair = first_base + second_base
+        key = f"{pair}/{COMPLEMENT[first_base]}{COMPLEMENT[second_base]}"
+        enthalpy, entropy = DNA_NN3[key] if key in DNA_NN3 else DNA_NN3[key[::-1]]
+        NN_ENTHALPY[first * 4 + second] = enthalpy
+        NN_ENTROPY[first * 4 + second] = entropy
+
+GAS_CONSTANT = 1.987
+
+COLUMNS = (
+    "id",
+    "length",
+    "a",
+    "c",
+    "g",
+    "t",
+    "other",
+    "gc_fraction",
+    "molecular_weight",
+    "tm_wallace",
+    "tm_gc",
+    "tm_nn",
+)
+
+# Residues per batch; bounds the size of the temporary arrays.
+BATCH_RESIDUES = 4_000_000
+
+
+def _terminal_terms(first, last):
+    """Initiation enthalpy and entropy from each sequence's terminal bases."""
+    enthalpy = np.full(first.shape, DNA_NN3["init"][0], dtype=float)
+    entropy = np.full(first.shape, DNA_NN3["init"][1], dtype=float)
+    for end in (first, last):
+        at = (end == A) | (end == T)
+        enthalpy += np.where(at, DNA_NN3["init_A/T"][0], DNA_NN3["init_G/C"][0])
+        entropy += np.where(at, DNA_NN3["init_A/T"][1], DNA_NN3["init_G/C"][1])
+    penalty = (first == T).astype(int) + (last == A)
+    enthalpy += penalty * DNA_NN3["init_5T/A"][0]
+    entropy += penalty * DNA_NN3["init_5T/A"][1]
+    return enthalpy, entropy
+
+
+def _batch_stats(sequences, na, dnac1, dnac2):
+    count = len(sequences)
+    lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=count)
+    data = "".join(sequences).encode("ascii", "replace")
+    codes = CODES[np.frombuffer(data, dtype=np.uint8)]
+    owner = np.repeat(np.arange(count), lengths)
+
+    counts = np.bincount(
+        owner * CODE_COUNT + codes, minlength=count * CODE_COUNT
+    ).reshape(count, CODE_COUNT)
+    a, c, g, t, s, w, other = counts.T
+    plain = other == 0
+    unambiguous = plain & (s == 0) & (w == 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gc = c + g + s
+        known = a + c + g + t + s + w
+        gc_fraction = np.where(known > 0, gc / known, 0.0)
+
+        molecular_weight = counts[:, :4] @ WEIGHTS - (lengths - 1) * WATER
+        molecular_weight = np.where(unambiguous, molecular_weight, np.nan)
+
+        tm_wallace = np.where(plain, 2 * (a + t + w) + 4 * gc, np.nan)
+
+        tm_gc = (
+            81.5
+            + 0.41 * (gc / lengths * 100)
+            - 600 / lengths
+            + 16.6 * math.log10(na * 1e-3)
+        )
+        tm_gc = np.where(plain, tm_gc, np.nan)
+
+        # Dinucleotide steps that lie within one sequence.
+        same = owner[:-1] == owner[1:]
+        steps = codes[:-1].astype(np.intp) * 4 + codes[1:]
+        steps = np.where(same & (codes[:-1] < 4) & (codes[1:] < 4), steps, 0)
+        step_owner = owner[:-1][same]
+        steps = steps[same]
+        enthalpy = np.bincount(step_owner, NN_ENTHALPY[steps], minlength=count)
+        entropy = np.bincount(step_owner, NN_ENTROPY[steps], minlength=count)
+
+        starts = np.cumsum(lengths) - lengths
+        first = codes[np.minimum(starts, len(codes) - 1)]
+        last = codes[np.maximum(starts + lengths - 1, 0)]
+        terminal_enthalpy, terminal_entropy = _terminal_terms(first, last)
+        enthalpy += terminal_enthalpy
+        entropy += terminal_entropy
+        entropy += 0.368 * (lengths - 1) * math.log(na * 1e-3)
+
+        k = (dnac1 - dnac2 / 2.0) * 1e-9
+        tm_nn = 1000 * enthalpy / (entropy + GAS_CONSTANT * math.log(k)) - 273.15
+        tm_nn = np.where(unambiguous & (lengths > 1), tm_nn, np.nan)
+
+    return {
+        "length": lengths,
+        "a": a,
+        "c": c,
+        "g": g,
+        "t": t,
+        "other": s + w + other,
+        "gc_fraction": gc_fraction,
+        "molecular_weight": molecular_weight,
+        "tm_wallace": tm_wallace,
+        "tm_gc": tm_gc,
+        "tm_nn": tm_nn,
+    }
+
+
+def _batches(sequences):
+    batch, residues = [], 0
+    for sequence in sequences:
+        if batch and residues + len(sequence) > BATCH_RESIDUES:
+            yield batch
+            batch, residues = [], 0
+        batch.append(sequence)
+        residues += len(sequence)
+    if batch:
+        yield batch
+
+
+def sequence_stats(sequences, na=50, dnac1=25, dnac2=25):
+    """Statistics for non-empty ASCII sequences as a dict of column arrays.
+
+    ``na`` is the Na+ concentration in mM and ``dnac1``/``dnac2`` the strand
+    concentrations in nM. Values that Biopython would refuse to compute, such
+    as a melting temperature with ambiguous bases, are NaN.
+    """
+    parts = [_batch_stats(batch, na, dnac1, dnac2) for batch in _batches(sequences)]
+    if not parts:
+        return {name: np.array([]) for name in COLUMNS[1:]}
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def column_values(values, decimals=None):
+    """Convert a column to a JSON-friendly list with NaN as None."""
+    if values.dtype.kind != "f":
+        return values.tolist()
+    if decimals is not None:
+        values = np.round(values, decimals)
+    return np.where(np.isnan(values), None, values).tolist()
@@ -0,0 +1,282 @@
+import io
+import mmap
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+from Bio import SeqIO
+from flask import current_app
+
+from .models import db, RestrictionSite, SequenceRecord, SequenceSketch
+from .restriction import map_record
+from .sketches import sketch_record
+from .storage import storage
+
+FORMATS = {
+    ".fa": "fasta",
+    ".fas": "fasta",
+    ".fasta": "fasta",
+    ".fna": "fasta",
+    ".ffn": "fasta",
+    ".faa": "fasta",
+    ".gb": "genbank",
+    ".gbk": "genbank",
+    ".genbank": "genbank",
+}
+
+NEWLINE = ord("\n")
+CARRIAGE_RETURN = ord("\r")
+SPACE = ord(" ")
+
+# GenBank ORIGIN lines hold a right-aligned 9-column base number, then blocks
+# of 10 residues that each follow a space:
+#         1 gatcctccat atacaacggt atctccacct caggtttaga tctcaacaac ggaaccattg
+GENBANK_NUMBER_WIDTH = 9
+GENBANK_BLOCK = 10
+ORIGIN = re.compile(rb"^ORIGIN[^\n]*\n", re.M)
+
+
+def detect_format(file_name):
+    return FORMATS.get(os.path.splitext(file_name.lower())[1])
+
+
+@lru_cache(maxsize=64)
+def _open_map(path):
+    # Blobs are immutable, so a mapping can be shared for the process lifetime.
+    with open(path, "rb") as handle:
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _fasta_geometry(mm, start, end):
+    """Return ``(length, line_bases, line_width)`` for a FASTA sequence block.
+
+    Geometry is only usable for random access when every line but the last
+    has the same width, as with samtools faidx. Irregular blocks return None
+    for the geometry and are served by re-parsing the record.
+    """
+    block = np.frombuffer(mm, dtype=np.uint8, count=end - start, offset=start)
+    newlines = np.flatnonzero(block == NEWLINE)
+    carriage_returns = np.count_nonzero(block == CARRIAGE_RETURN)
+    length = len(block) - len(newlines) - int(carriage_returns)
+    if length == 0:
+        return 0, None, None
+
+    # Width of every line including its terminator. An unterminated last line
+    # is measured as if it had one.
+    bounds = newlines if block[-1] == NEWLINE else np.append(newlines, len(block))
+    widths = np.diff(bounds, prepend=-1)
+    line_width = int(widths[0])
+    crlf = len(newlines) > 0 and block[newlines[0] - 1] == CARRIAGE_RETURN
+    line_bases = line_width - (2 if crlf else 1)
+
+    regular = (
+        line_bases > 0
+        and bool(np.all(widths[:-1] == line_width))
+        and widths[-1] <= line_width
+    )
+    if not regular:
+        return length, None, None
+    return length, line_bases, line_width
+
+
+def _index_fasta(mm):
+    starts = [match.start() for match in re.finditer(rb"^>", mm, re.M)]
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else len(mm)
+        header_end = mm.find(b"\n", start, end)
+        header_end = end if header_end == -1 else header_end
+        seq_offset = min(header_end + 1, end)
+
+        header = mm[start + 1 : header_end].decode(errors="replace").strip()
+        record_id, _, description = header.partition(" ")
+        length, line_bases, line_width = _fasta_geometry(mm, seq_offset, end)
+
+        yield {
+            "record_id": record_id or f"record_{i + 1}",
+            "description": description,
+            "format": "fasta",
+            "length": length,
+            "circular": False,
+            "offset": start,
+            "raw_length": end - start,
+            "seq_offset": seq_offset,
+            "line_bases": line_bases,
+            "line_width": line_width,
+        }
+
+
+def _genbank_column(column):
+    # Byte position of a residue within its ORIGIN line.
+    return GENBANK_NUMBER_WIDTH + 1 + column + column // GENBANK_BLOCK
+
+
+def _slice_genbank(mm, seq_offset, line_bases, line_width, start, end):
+    def offset(index):
+        row, column = divmod(index, line_bases)
+        return seq_offset + row * line_width + _genbank_column(column)
+
+    # Biopython upper-cases GenBank sequences; match it.
+    residues = mm[offset(start) : offset(end - 1) + 1]
+    return residues.translate(None, b" \r\n0123456789").decode().upper()
+
+
+def _genbank_geometry(mm, start, end, sequence):
+    """Return ``(seq_offset, line_bases, line_width)`` for a GenBank ORIGIN block.
+
+    As with FASTA, the block is only usable for random access when every line
+    but the last has the same width. The residues it yields must also match
+    the parsed ``sequence``; otherwise the geometry is None and the record is
+    served by re-parsing it.
+    """
+    origin = ORIGIN.search(mm, start, end)
+    if not origin or not sequence:
+        return None, None, None
+    seq_offset = origin.end()
+    seq_end = mm.find(b"\n//", seq_offset - 1, end)
+    if seq_end < seq_offset:
+        return None, None, None
+
+    block = np.frombuffer(
+        mm, dtype=np.uint8, count=seq_end + 1 - seq_offset, offset=seq_offset
+    )
+    newlines = np.flatnonzero(block == NEWLINE)
+    widths = np.diff(newlines, prepend=-1)
+    line_width = int(widths[0])
+    crlf = block[newlines[0] - 1] == CARRIAGE_RETURN
+    text_width = line_width - (2 if crlf else 1) - GENBANK_NUMBER_WIDTH
+    full_blocks, partial = divmod(text_width, GENBANK_BLOCK + 1)
+    line_bases = full_blocks * GENBANK_BLOCK + max(partial - 1, 0)
+    if line_bases <= 0 or not (
+        np.all(widths[:-1] == line_width) and widths[-1] <= line_width
+    ):
+        return None, None, None
+
+    # Each full line must have its separators where the layout puts them.
+    rows = block[: (len(newlines) - 1) * line_width].reshape(-1, line_width)
+    separators = [
+        _genbank_column(column) - 1
+        for column in range(0, line_bases, GENBANK_BLOCK)
+    ]
+    if not np.all(rows[:, separators] == SPACE):
+        return None, None, None
+
+    geometry = seq_offset, line_bases, line_width
+    if _slice_genbank(mm, *geometry, 0, len(sequence)) != sequence:
+        return None, None, None
+    return geometry
+
+
+def _index_genbank(mm):
+    starts = [match.start() for match in re.finditer(rb"^LOCUS", mm, re.M)]
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else len(mm)
+        raw = mm[start:end].decode(errors="replace")
+        record = SeqIO.read(io.StringIO(raw), "genbank")
+        seq_offset, line_bases, line_width = _genbank_geometry(
+            mm, start, end, str(record.seq)
+        )
+
+        yield {
+            "record_id": record.id,
+            "description": record.description,
+            "format": "genbank",
+            "length": len(record.seq),
+            "circular": record.annotations.get("topology") == "circular",
+            "offset": start,
+            "raw_length": end - start,
+            "seq_offset": seq_offset,
+            "line_bases": line_bases,
+            "line_width": line_width,
+        }
+
+
+INDEXERS = {"fasta": _index_fasta, "genbank": _index_genbank}
+
+
+def delete_records(record_ids):
+    """Bulk-delete the records selected by ``record_ids`` (a select of ids)
+    together with the rows derived from them."""
+    for model in (SequenceSketch, RestrictionSite):
+        db.session.execute(
+            db.delete(model)
+            .where(model.sequence_id.in_(record_ids))
+            .execution_options(synchronize_session=False)
+        )
+    db.session.execute(
+        db.delete(SequenceRecord)
+        .where(SequenceRecord.id.in_(record_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def derive(record, user_id, sequence):
+    """Precompute the similarity sketch and restriction map of a record."""
+    sketch_record(record, user_id, sequence)
+    map_record(record, sequence, current_app.config["RESTRICTION_MAX_LENGTH"])
+
+
+def ingest_attachment(attachment, user_id, format=None):
+    """(Re)build the offset index for an attachment's sequence records.
+
+    The blob is scanned once. Afterwards any record or range is read straight
+    from a memory map using the stored offsets. Sketches and restriction maps
+    are derived here too, so reads never recompute them.
+    """
+    format = format or detect_format(attachment.file_name)
+    if format not in INDEXERS:
+        raise ValueError("Unsupported sequence format")
+    if not attachment.sha256:
+        raise ValueError("Attachment has no stored content")
+
+    delete_records(
+        db.select(SequenceRecord.id).where(
+            SequenceRecord.attachment_id == attachment.id
+        )
+    )
+    if not attachment.size_bytes:
+        return []
+
+    mm = _open_map(storage.path(attachment.sha256))
+    records = [
+        SequenceRecord(user_id=user_id, attachment=attachment, **fields)
+        for fields in INDEXERS[format](mm)
+    ]
+    db.session.add_all(records)
+    for record in records:
+        derive(record, user_id, fetch_sequence(record))
+    return records
+
+
+def _residue_offset(record, index):
+    row, column = divmod(index, record.line_bases)
+    return record.seq_offset + row * record.line_width + column
+
+
+def fetch_sequence(record, start=0, end=None):
+    """Return residues ``[start, end)`` of a stored record as a string."""
+    end = record.length if end is None else min(end, record.length)
+    start = max(start, 0)
+    if start >= end:
+        return ""
+
+    mm = _open_map(storage.path(record.attachment.sha256))
+
+    if record.line_bases and record.format == "genbank":
+        return _slice_genbank(
+            mm, record.seq_offset, record.line_bases, record.line_width, start, end
+        )
+    if record.line_bases:
+        first = _residue_offset(record, start)
+        last = _residue_offset(record, end - 1) + 1
+        return mm[first:last].replace(b"\n", b"").replace(b"\r", b"").decode()
+
+    raw = mm[record.offset : record.offset + record.raw_length].decode()
+    parsed = SeqIO.read(io.StringIO(raw), record.format)
+    return str(parsed.seq[start:end])
+
+
+def iter_sequences(records):
+    """Yield ``(record, sequence)`` for each record, reading whole sequences."""
+    for record in records:
+        yield record, fetch_sequence(record)
@@ -0,0 +1,176 @@
+import math
+import threading
+
+import numpy as np
+
+from .models import db, SequenceRecord, SequenceSketch
+
+# MinHash sketches of canonical k-mers (as in Mash). Each sequence keeps the
+# SKETCH_SIZE smallest hashes of its k-mers; the overlap of two sketches
+# estimates the Jaccard index of the k-mer sets, which maps to an approximate
+# identity without aligning anything.
+K = 21
+SKETCH_SIZE = 1000
+# Positions hashed per pass; bounds the temporary arrays for long sequences.
+WINDOW = 1 << 20
+
+CODES = np.full(256, 4, dtype=np.uint8)
+for letters, code in (("Aa", 0), ("Cc", 1), ("Gg", 2), ("TtUu", 3)):
+    for letter in letters:
+        CODES[ord(letter)] = code
+
+EMPTY = np.iinfo(np.uint64).max
+
+
+def _mix(values):
+    # splitmix64 finaliser: spreads k-mer codes uniformly over 64 bits.
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def _kmer_hashes(codes, k):
+    """Hashes of every canonical k-mer in ``codes`` without an ambiguous base."""
+    count = len(codes) - k + 1
+    if count < 1:
+        return np.empty(0, dtype=np.uint64)
+
+    forward = np.zeros(count, dtype=np.uint64)
+    reverse = np.zeros(count, dtype=np.uint64)
+    bases = np.minimum(codes, 3).astype(np.uint64)
+    for offset in range(k):
+        window = bases[offset : offset + count]
+        forward = (forward << np.uint64(2)) | window
+        reverse |= (np.uint64(3) - window) << np.uint64(2 * offset)
+
+    ambiguous = np.concatenate(([0], np.cumsum(codes > 3)))
+    valid = ambiguous[k:] == ambiguous[:-k]
+    return _mix(np.minimum(forward, reverse)[valid])
+
+
+def sketch(sequence, k=K, size=SKETCH_SIZE):
+    """Return ``(hashes, kmer_count)``: the sorted bottom-``size`` hashes of
+    ``sequence`` and how many valid k-mers it contains."""
+    codes = CODES[np.frombuffer(sequence.encode("ascii", "replace"), np.uint8)]
+    bottom = np.empty(0, dtype=np.uint64)
+    kmer_count = 0
+    # Windows overlap by k - 1 so no k-mer is lost at a boundary.
+    for start in range(0, max(len(codes) - k + 1, 1), WINDOW):
+        hashes = _kmer_hashes(codes[start : start + WINDOW + k - 1], k)
+        kmer_count += len(hashes)
+        bottom = np.union1d(bottom, hashes)[:size]
+    return bottom, kmer_count
+
+
+def sketch_record(record, user_id, sequence):
+    """Add a sketch of ``sequence`` for ``record`` to the session, unless it
+    has no valid k-mer (e.g. a protein)."""
+    hashes, kmer_count = sketch(sequence)
+    if len(hashes):
+        db.session.add(
+            SequenceSketch(
+                sequence=record,
+                user_id=user_id,
+                k=K,
+                kmer_count=kmer_count,
+                hashes=hashes.astype("<u8").tobytes(),
+            )
+        )
+
+
+class SketchMatrix:
+    """All of one user's sketches as a padded 2-D array, for vectorised search."""
+
+    def __init__(self, rows):
+        self.ids = [sequence_id for sequence_id, _ in rows]
+        self.hashes = np.full((len(rows), SKETCH_SIZE), EMPTY, dtype=np.uint64)
+        self.sizes = np.zeros(len(rows), dtype=np.int64)
+        for index, (_, data) in enumerate(rows):
+            hashes = np.frombuffer(data, dtype="<u8")[:SKETCH_SIZE]
+            self.hashes[index, : len(hashes)] = hashes
+            self.sizes[index] = len(hashes)
+        last = np.maximum(self.sizes - 1, 0)
+        self.largest = self.hashes[np.arange(len(rows)), last]
+
+    def search(self, query, limit, k=K):
+        """Best matches for a query sketch as ``(id, jaccard, identity, shared)``.
+
+        Each pair is compared below the smaller of the two sketches' largest
+        hash, which is the bottom-s estimate of the Jaccard index.
+        """
+        if not self.ids or not len(query):
+            return []
+
+        threshold = np.minimum(self.largest, query[-1])[:, None]
+        below = self.hashes <= threshold
+        found = query[np.minimum(np.searchsorted(query, self.hashes), len(query) - 1)]
+        shared = ((found == self.hashes) & below).sum(axis=1)
+        union = (
+            below.sum(axis=1)
+            + np.searchsorted(query, threshold[:, 0], side="right")
+            - shared
+        )
+        jaccard = np.where(union > 0, shared / np.maximum(union, 1), 0.0)
+
+        order = np.argsort(-jaccard, kind="stable")[:limit]
+        order = order[jaccard[order] > 0]
+        return [
+            (self.ids[i], float(jaccard[i]), identity(jaccard[i], k), int(shared[i]))
+            for i in order
+        ]
+
+
+def identity(jaccard, k=K):
+    """Approximate sequence identity from a Jaccard index (1 - Mash distance)."""
+    if jaccard <= 0:
+        return 0.0
+    return max(0.0, 1 + math.log(2 * jaccard / (1 + jaccard)) / k)
+
+
+# Per-process cache of sketch matrices, keyed by user and invalidated when
+# the user's sketch count or newest sketch changes (a cheap aggregate query).
+_matrices = {}
+_lock = threading.Lock()
+
+
+def user_matrix(user_id):
+    version = db.session.execute(
+        db.select(
+            db.func.count(), db.func.max(SequenceSketch.created_at)
+        ).where(SequenceSketch.user_id == user_id)
+    ).one()
+    version = tuple(version)
+
+    with _lock:
+        cached = _matrices.get(user_id)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    rows = db.session.execute(
+        db.select(SequenceSketch.sequence_id, SequenceSketch.hashes)
+        .where(SequenceSketch.user_id == user_id, SequenceSketch.k == K)
+        .order_by(SequenceSketch.sequence_id)
+    ).all()
+    matrix = SketchMatrix(rows)
+    with _lock:
+        _matrices[user_id] = (version, matrix)
+    return matrix
+
+
+def unsketched_records(batch_size=100):
+    """Yield batches of records that have no sketch yet."""
+    last_id = None
+    while True:
+        query = SequenceRecord.query.outerjoin(SequenceSketch).filter(
+            SequenceSketch.sequence_id.is_(None)
+        )
+        if last_id is not None:
+            query = query.filter(SequenceRecord.id > last_id)
+        records = query.order_by(SequenceRecord.id).limit(batch_size).all()
+        if not records:
+            return
+        # Records without any valid k-mer stay unsketched, so page by id.
+        last_id = records[-1].id
+        yield records
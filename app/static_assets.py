@@ -0,0 +1,205 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from datetime import datetime, timezone
+
+from flask import Response, abort, jsonify, request
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - assets are served gzip-only
+    brotli = None
+
+# Vite's default output name, assets/[name]-[hash].[ext]
+HASHED = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8}\.\w+$")
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+COMPRESSIBLE = (
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/wasm",
+    "application/xml",
+    "image/svg+xml",
+)
+MIN_COMPRESS_BYTES = 1024
+# Server preference when a client accepts several encodings equally.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _compress(data, encoding, best=False):
+    if encoding == "gzip":
+        return gzip.compress(data, 9, mtime=0)
+    # Quality 11 is several times slower than 5; worth it once per deploy,
+    # not in every worker at startup.
+    return brotli.compress(data, quality=11 if best else 5)
+
+
+def _available(encoding):
+    return encoding == "gzip" or brotli is not None
+
+
+def _compressible(mimetype, size):
+    return size >= MIN_COMPRESS_BYTES and (
+        mimetype.startswith("text/") or mimetype in COMPRESSIBLE
+    )
+
+
+class Asset:
+    def __init__(self, path, mimetype, data):
+        self.path = path
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(data).hexdigest()[:16]
+        self.mtime = os.stat(path).st_mtime
+        self.modified = datetime.fromtimestamp(int(self.mtime), timezone.utc)
+        self.variants = {"identity": data}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as handle:
+            data = handle.read()
+        mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        asset = cls(path, mimetype, data)
+        if not _compressible(mimetype, len(data)):
+            return asset
+
+        for encoding, suffix in ENCODINGS:
+            built = path + suffix
+            if os.path.exists(built) and os.stat(built).st_mtime >= asset.mtime:
+                with open(built, "rb") as handle:
+                    compressed = handle.read()
+            elif _available(encoding):
+                compressed = _compress(data, encoding)
+            else:
+                continue
+            # Not worth a Vary and a second cache entry for a few bytes.
+            if len(compressed) < 0.9 * len(data):
+                asset.variants[encoding] = compressed
+        return asset
+
+
+class StaticAssets:
+    """Serves the built SPA from memory, precompressed.
+
+    Every file under the static folder is read once per process, with gzip
+    and (if the brotli package is installed) brotli variants. Variants
+    written next to a file by ``flask assets compress`` are used as they are;
+    missing ones are compressed at startup. The variant is picked by
+    Accept-Encoding. Hashed build output is cached by browsers for a year as
+    immutable; everything else, index.html included, is revalidated against
+    its ETag. Under debug the files are re-read when they change on disk.
+    """
+
+    def __init__(self, app=None):
+        self.assets = {}
+        self.root = None
+        self.reload = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.root = app.static_folder
+        self.reload = app.debug
+        self.assets = {}
+        for name in self._files():
+            self._load(name)
+        # Replaces Flask's static view; url_for("static", ...) is unchanged.
+        app.view_functions["static"] = self.send_static
+        app.extensions["static_assets"] = self
+
+    def _files(self):
+        if not self.root or not os.path.isdir(self.root):
+            return
+        for directory, _, files in os.walk(self.root):
+            for file in files:
+                if file.endswith(tuple(suffix for _, suffix in ENCODINGS)):
+                    continue
+                path = os.path.join(directory, file)
+                yield os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def _load(self, name):
+        path = os.path.join(self.root, *name.split("/"))
+        try:
+            self.assets[name] = Asset.load(path)
+        except OSError:
+            self.assets.pop(name, None)
+        return self.assets.get(name)
+
+    def _get(self, name):
+        asset = self.assets.get(name)
+        if not self.reload or not self.root:
+            return asset
+        path = safe_join(self.root, name)
+        if path is None or not os.path.isfile(path):
+            return None
+        if asset is None or os.stat(path).st_mtime != asset.mtime:
+            asset = self._load(name)
+        return asset
+
+    def _encoding(self, asset):
+        for encoding, _ in ENCODINGS:
+            if encoding in asset.variants and request.accept_encodings[encoding]:
+                return encoding
+        return "identity"
+
+    def _respond(self, name, asset):
+        encoding = self._encoding(asset)
+        response = Response(asset.variants[encoding], mimetype=asset.mimetype)
+        if encoding != "identity":
+            response.content_encoding = encoding
+        if len(asset.variants) > 1:
+            response.vary.add("Accept-Encoding")
+        # Each encoding is a different representation, so a different ETag.
+        response.set_etag(
+            asset.etag if encoding == "identity" else f"{asset.etag}-{encoding}"
+        )
+        response.last_modified = asset.modified
+        if HASHED.match(name):
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def send_static(self, filename):
+        asset = self._get(filename)
+        if asset is None:
+            abort(404)
+        return self._respond(filename, asset)
+
+    def index(self):
+        asset = self._get("index.html")
+        if asset is None:
+            return jsonify({"error": "Frontend not built", "status_code": 404}), 404
+        return self._respond("index.html", asset)
+
+    def compress(self, force=False):
+        """Write best-quality variants next to each compressible file, for
+        deploys that build them once instead of in every worker. Returns the
+        number of files written."""
+        written = 0
+        for name in self._files():
+            path = os.path.join(self.root, *name.split("/"))
+            with open(path, "rb") as handle:
+                data = handle.read()
+            mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            if not _compressible(mimetype, len(data)):
+                continue
+            for encoding, suffix in ENCODINGS:
+                built = path + suffix
+                if not _available(encoding) or (
+                    not force
+                    and os.path.exists(built)
+                    and os.stat(built).st_mtime >= os.stat(path).st_mtime
+                ):
+                    continue
+                with open(built, "wb") as handle:
+                    handle.write(_compress(data, encoding, best=True))
+                written += 1
+        return written
+
+
+assets = StaticAssets()
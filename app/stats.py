@@ -0,0 +1,134 @@
+from collections import Counter
+
+from sqlalchemy import bindparam
+
+from .bulk import insert_ignore
+from .models import db, Experiment, Note, UserStat
+
+
+def status_name(status):
+    return f"experiments:{status or 'none'}"
+
+
+def experiment_deltas(statuses, sign=1):
+    """Count changes for experiments with ``statuses`` created (or, with
+    ``sign=-1``, deleted)."""
+    deltas = Counter()
+    for status in statuses:
+        deltas["experiments"] += sign
+        deltas[status_name(status)] += sign
+    return deltas
+
+
+def status_change(old, new):
+    if old == new:
+        return Counter()
+    return Counter({status_name(old): -1, status_name(new): 1})
+
+
+def record_stats(user_id, deltas):
+    """Apply count changes for ``user_id`` in the caller's transaction.
+
+    Counts are incremented in SQL rather than read and written back, so
+    concurrent requests never lose each other's changes. Rows are updated in
+    name order so two writers can't deadlock on them.
+    """
+    names = sorted(name for name, delta in deltas.items() if delta)
+    if not names:
+        return
+
+    table = UserStat.__table__
+    db.session.execute(
+        insert_ignore(table),
+        [{"user_id": user_id, "name": name, "value": 0} for name in names],
+    )
+    db.session.execute(
+        db.update(table)
+        .where(
+            table.c.user_id == bindparam("stat_user_id"),
+            table.c.name == bindparam("stat_name"),
+        )
+        .values(value=table.c.value + bindparam("delta")),
+        [
+            {"stat_user_id": user_id, "stat_name": name, "delta": deltas[name]}
+            for name in names
+        ],
+    )
+
+
+def read_stats(user_id):
+    values = dict(
+        db.session.execute(
+            db.select(UserStat.name, UserStat.value).where(
+                UserStat.user_id == user_id
+            )
+        ).all()
+    )
+    by_status = dict.fromkeys(Experiment.STATUSES, 0)
+    for name, value in values.items():
+        if name.startswith("experiments:") and value:
+            by_status[name.split(":", 1)[1]] = value
+    return {
+        "notes": values.get("notes", 0),
+        "experiments": values.get("experiments", 0),
+        "experiments_by_status": by_status,
+    }
+
+
+def rebuild_stats(user_id=None):
+    """Recount every user's stats (or one user's) from the notes and
+    experiments tables, replacing what is stored. Returns the rows written.
+
+    Writes that commit while this runs may be counted twice or not at all;
+    run it when the app is quiet, or run it again.
+    """
+    counts = Counter()
+    notes = db.select(Note.user_id, db.func.count()).group_by(Note.user_id)
+    experiments = db.select(
+        Experiment.user_id, Experiment.status, db.func.count()
+    ).group_by(Experiment.user_id, Experiment.status)
+    clear = db.delete(UserStat)
+    if user_id is not None:
+        notes = notes.where(Note.user_id == user_id)
+        experiments = experiments.where(Experiment.user_id == user_id)
+        clear = clear.where(UserStat.user_id == user_id)
+
+    for owner, count in db.session.execute(notes):
+        counts[owner, "notes"] += count
+    for owner, status, count in db.session.execute(experiments):
+        counts[owner, "experiments"] += count
+        counts[owner, status_name(status)] += count
+
+    db.session.execute(clear)
+    rows = [
+        {"user_id": owner, "name": name, "value": value}
+        for (owner, name), value in counts.items()
+    ]
+    if rows:
+        db.session.execute(db.insert(UserStat), rows)
+    return len(rows)
+
+
+def recent_activity(user_id, limit):
+    """The ``limit`` most recently updated notes and experiments, newest
+    first. Each side is a short scan of its (user_id, updated_at, id) index.
+    """
+    items = []
+    for kind, model in (("note", Note), ("experiment", Experiment)):
+        rows = db.session.execute(
+            db.select(model.id, model.title, model.updated_at)
+            .where(model.user_id == user_id)
+            .order_by(model.updated_at.desc(), model.id.desc())
+            .limit(limit)
+        )
+        items.extend(
+            {
+                "type": kind,
+                "id": str(row_id),
+                "title": title,
+                "updated_at": updated_at.isoformat(),
+            }
+            for row_id, title, updated_at in rows
+        )
+    items.sort(key=lambda item: item["updated_at"], reverse=True)
+    return items[:limit]
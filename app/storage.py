@@ -0,0 +1,106 @@
+import hashlib
+import os
+import tempfile
+import time
+
+from flask import current_app, request
+
+
+def large_upload(view):
+    """Let ``view`` take request bodies up to MAX_UPLOAD_BYTES rather than
+    the app-wide MAX_CONTENT_LENGTH."""
+    view.large_upload = True
+    return view
+
+
+class LocalStorage:
+    """Content-addressed blob store on the local filesystem.
+
+    Blobs are named by the SHA-256 of their bytes, so identical uploads are
+    stored once. Uploads are streamed to a temporary file while being hashed
+    and then renamed into place, so a file is never held in memory and a
+    partially written blob is never visible.
+    """
+
+    def __init__(self, app=None):
+        self.root = None
+        self.chunk_size = 1024 * 1024
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.root = app.config.get("STORAGE_ROOT") or os.path.join(
+            app.instance_path, "uploads"
+        )
+        self.chunk_size = app.config.get("STORAGE_CHUNK_SIZE", self.chunk_size)
+        self.max_upload = app.config["MAX_UPLOAD_BYTES"]
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        app.before_request(self._upload_limit)
+        app.extensions["storage"] = self
+
+    def _upload_limit(self):
+        view = current_app.view_functions.get(request.endpoint)
+        if getattr(view, "large_upload", False):
+            request.max_content_length = self.max_upload
+
+    @property
+    def tmp_dir(self):
+        return os.path.join(self.root, "tmp")
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def save(self, stream):
+        """Copy ``stream`` into the store and return ``(sha256, size)``."""
+        hasher = hashlib.sha256()
+        size = 0
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while chunk := stream.read(self.chunk_size):
+                    hasher.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+
+            digest = hasher.hexdigest()
+            final_path = self.path(digest)
+            if os.path.exists(final_path):
+                # Refresh the mtime so garbage collection's grace period
+                # covers the row about to reference this blob.
+                os.utime(final_path)
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(tmp_path, final_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return digest, size
+
+    def open(self, digest):
+        return open(self.path(digest), "rb")
+
+    def delete(self, digest):
+        try:
+            os.remove(self.path(digest))
+        except FileNotFoundError:
+            pass
+
+    def digests(self, older_than=0):
+        """Yield stored digests whose files are at least ``older_than`` seconds old."""
+        cutoff = time.time() - older_than
+        for directory, subdirectories, files in os.walk(self.root):
+            if directory == self.root:
+                subdirectories[:] = [d for d in subdirectories if d != "tmp"]
+            for name in files:
+                if os.path.getmtime(os.path.join(directory, name)) <= cutoff:
+                    yield name
+
+
+storage = LocalStorage()
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask_login import UserMixin
+from sqlalchemy import event
+
+from .models import db, User
+
+
+class CachedUser(UserMixin):
+    """Read-only snapshot of a User, enough to serve as ``current_user``."""
+
+    def __init__(self, id, username, email):
+        self.id = id
+        self.username = username
+        self.email = email
+
+    def to_dict(self):
+        return User.plan().one(self)
+
+
+class UserCache:
+    """Per-process TTL cache behind Flask-Login's user_loader.
+
+    Updates and deletes of a User flushed in this process evict it at once;
+    other processes see the change when their entry expires, so
+    USER_CACHE_TTL bounds how long a stale profile can be served.
+    """
+
+    def __init__(self, app=None):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config["USER_CACHE_TTL"]
+        self.size = app.config["USER_CACHE_SIZE"]
+        if not event.contains(User, "after_update", self._evict_target):
+            event.listen(User, "after_update", self._evict_target)
+            event.listen(User, "after_delete", self._evict_target)
+        if "metrics" in app.extensions:
+            app.extensions["metrics"].register(self.render_metrics)
+        app.extensions["user_cache"] = self
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        row = db.session.execute(
+            db.select(User.id, User.username, User.email).where(User.id == user_id)
+        ).first()
+        user = CachedUser(*row) if row else None
+        if user is not None and self.ttl > 0:
+            with self._lock:
+                self._entries[user_id] = (now + self.ttl, user)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.size:
+                    self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _evict_target(self, mapper, connection, target):
+        self.invalidate(target.id)
+
+    def render_metrics(self):
+        with self._lock:
+            hits, misses, entries = self.hits, self.misses, len(self._entries)
+        return [
+            "# HELP user_cache_requests_total User loads by cache result.",
+            "# TYPE user_cache_requests_total counter",
+            f'user_cache_requests_total{{result="hit"}} {hits}',
+            f'user_cache_requests_total{{result="miss"}} {misses}',
+            "# HELP user_cache_entries Users currently cached.",
+            "# TYPE user_cache_entries gauge",
+            f"user_cache_entries {entries}",
+        ]
+
+
+user_cache = UserCache()
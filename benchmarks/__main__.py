@@ -0,0 +1,155 @@
+"""Seed a scratch database and benchmark the API.
+
+    python -m benchmarks --scale small
+    python -m benchmarks --target gunicorn --workers 1 --concurrency 8
+    python -m benchmarks --database-url postgresql://localhost/exon_bench --reset
+    python -m benchmarks --output baseline.json
+    python -m benchmarks --compare baseline.json
+
+Without --database-url a fresh SQLite file is created in a temporary
+directory. A Postgres database is migrated to head and seeded, so point it
+at a scratch database; --reset downgrades it to an empty schema first.
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+
+from sqlalchemy.engine import make_url
+
+from .drivers import ROOT, ClientSession, GunicornServer
+
+
+def _arguments(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file.")
+    parser.add_argument("--reset", action="store_true", help="Drop the schema first.")
+    parser.add_argument("--target", choices=("client", "gunicorn"), default="client")
+    parser.add_argument("--workers", type=int, default=1, help="gunicorn workers.")
+    parser.add_argument("--threads", type=int, default=1, help="gunicorn threads.")
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="Parallel clients (gunicorn only)."
+    )
+    parser.add_argument(
+        "--scale", choices=("small", "medium", "large"), default="small"
+    )
+    for name in ("users", "notes", "experiments", "steps"):
+        parser.add_argument(f"--{name}", type=int, help=f"Override the scale's {name}.")
+    parser.add_argument("--requests", type=int, default=200, help="Per scenario.")
+    parser.add_argument("--warmup", type=int, default=5, help="Per client.")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        help="Glob of scenarios to run, e.g. 'notes.*'. Repeatable.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results as JSON.")
+    parser.add_argument("--compare", help="Fail on regressions against saved JSON.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed p50 slowdown against --compare.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _arguments(argv)
+    workdir = tempfile.mkdtemp(prefix="exon-bench-")
+    database_url = args.database_url or f"sqlite:///{workdir}/bench.db"
+    # The app reads its configuration from the environment at import time.
+    os.environ.update(
+        DATABASE_URL=database_url,
+        STORAGE_ROOT=os.path.join(workdir, "uploads"),
+        SECRET_KEY=os.environ.get("SECRET_KEY", "benchmark"),
+        SQLALCHEMY_ECHO="false",
+        METRICS_TOKEN="",
+    )
+
+    from flask_migrate import downgrade, upgrade
+
+    from app import app
+    from .runner import compare, format_report, run_scenario
+    from .scenarios import SCENARIOS, Fixture
+    from .seed import SCALES, seed
+
+    scale = dict(SCALES[args.scale])
+    for name in scale:
+        if getattr(args, name) is not None:
+            scale[name] = getattr(args, name)
+
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if not args.scenario
+        or any(fnmatch.fnmatch(scenario.name, pattern) for pattern in args.scenario)
+    ]
+
+    migrations = os.path.join(ROOT, "migrations")
+    with app.app_context():
+        if args.reset:
+            downgrade(directory=migrations, revision="base")
+        upgrade(directory=migrations)
+        print(f"Seeding {scale} into {database_url}", file=sys.stderr)
+        fixtures = [Fixture.load(email) for email in seed(**scale, seed=args.seed)]
+
+    def run(new_session, concurrency):
+        results = {}
+        for scenario in scenarios:
+            print(f"Running {scenario.name}", file=sys.stderr)
+            results[scenario.name] = run_scenario(
+                scenario,
+                new_session,
+                fixtures,
+                args.requests,
+                concurrency=concurrency,
+                warmup=args.warmup,
+                seed=args.seed,
+            )
+        return results
+
+    try:
+        if args.target == "client":
+            results = run(lambda: ClientSession(app), 1)
+        else:
+            with GunicornServer(
+                dict(os.environ), workers=args.workers, threads=args.threads
+            ) as server:
+                results = run(server.session, args.concurrency)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(format_report(results))
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(
+                {
+                    "created_at": datetime.utcnow().isoformat(),
+                    "target": args.target,
+                    "database": make_url(database_url).get_backend_name(),
+                    "scale": scale,
+                    "scenarios": results,
+                },
+                handle,
+                indent=2,
+            )
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
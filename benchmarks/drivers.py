@@ -0,0 +1,146 @@
+import http.client
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from http.cookies import SimpleCookie
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SQL_SERIES = re.compile(
+    r'^http_request_sql_statements_(sum|count)\{[^}]*endpoint="([^"]+)"[^}]*\} (\S+)$',
+    re.M,
+)
+
+
+class Session:
+    """One API client with its own cookies and CSRF token."""
+
+    def __init__(self):
+        self.csrf_token = None
+
+    def request(self, method, path, json_body=None, body=None, content_type=None):
+        """Send a request and return ``(status, body)``."""
+        headers = {}
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            content_type = "application/json"
+        if content_type:
+            headers["Content-Type"] = content_type
+        if method not in ("GET", "HEAD") and self.csrf_token:
+            headers["X-CSRFToken"] = self.csrf_token
+        return self._send(method, path, body, headers)
+
+    def json(self, method, path, json_body=None, **kwargs):
+        status, body = self.request(method, path, json_body, **kwargs)
+        if status >= 400:
+            raise RuntimeError(f"{method} {path} returned {status}: {body[:200]!r}")
+        return json.loads(body) if body else None
+
+    def login(self, email, password):
+        self.csrf_token = self.json("GET", "/api/auth/csrf/restore")["csrf_token"]
+        self.json("POST", "/api/auth/login", {"email": email, "password": password})
+
+    def sql_statements(self):
+        """Per-endpoint ``{endpoint: [statements, requests]}`` from /api/metrics."""
+        status, body = self.request("GET", "/api/metrics")
+        if status != 200:
+            raise RuntimeError(f"GET /api/metrics returned {status}")
+        totals = {}
+        for kind, endpoint, value in SQL_SERIES.findall(body.decode()):
+            series = totals.setdefault(endpoint, [0.0, 0.0])
+            series[kind == "count"] += float(value)
+        return totals
+
+    def _send(self, method, path, body, headers):
+        raise NotImplementedError
+
+
+class ClientSession(Session):
+    """Drives the app in-process through the Flask test client."""
+
+    def __init__(self, app):
+        super().__init__()
+        self.client = app.test_client()
+
+    def _send(self, method, path, body, headers):
+        response = self.client.open(path, method=method, data=body, headers=headers)
+        return response.status_code, response.get_data()
+
+
+class HttpSession(Session):
+    """Drives a running server over one keep-alive HTTP connection."""
+
+    def __init__(self, host, port):
+        super().__init__()
+        self.connection = http.client.HTTPConnection(host, port, timeout=120)
+        self.cookies = SimpleCookie()
+
+    def _send(self, method, path, body, headers):
+        if self.cookies:
+            headers["Cookie"] = "; ".join(
+                f"{name}={morsel.value}" for name, morsel in self.cookies.items()
+            )
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        data = response.read()
+        for header in response.headers.get_all("Set-Cookie") or []:
+            self.cookies.load(header)
+        return response.status, data
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class GunicornServer:
+    """Runs ``gunicorn app:app`` on a free local port for the benchmark."""
+
+    def __init__(self, env, workers=1, threads=1, timeout=30):
+        self.env = env
+        self.workers = workers
+        self.threads = threads
+        self.timeout = timeout
+        self.host = "127.0.0.1"
+        self.port = _free_port()
+
+    def __enter__(self):
+        command = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--bind",
+            f"{self.host}:{self.port}",
+            "--workers",
+            str(self.workers),
+            "--threads",
+            str(self.threads),
+            "app:app",
+        ]
+        self.process = subprocess.Popen(command, cwd=ROOT, env=self.env)
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("gunicorn exited during startup")
+            try:
+                socket.create_connection((self.host, self.port), timeout=1).close()
+                return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise RuntimeError("gunicorn did not start listening in time")
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+    def session(self):
+        return HttpSession(self.host, self.port)
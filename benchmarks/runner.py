@@ -0,0 +1,140 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .seed import PASSWORD
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[round(fraction * (len(ordered) - 1))]
+
+
+def _worker(scenario, session, fixture, rng, warmup, count):
+    session.login(fixture.email, PASSWORD)
+    latencies, errors = [], 0
+    for i in range(warmup + count):
+        prepared = scenario.prepare(session, fixture, rng) if scenario.prepare else None
+        started = time.perf_counter()
+        status, _ = scenario.run(session, fixture, rng, prepared)
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            latencies.append(elapsed)
+            errors += status >= 400
+    return latencies, errors
+
+
+def _background(scenario, session, fixture, rng, stop):
+    session.login(fixture.email, PASSWORD)
+    while not stop.is_set():
+        scenario.background(session, fixture, rng, None)
+
+
+def run_scenario(
+    scenario, new_session, fixtures, requests, concurrency=1, warmup=5, seed=0
+):
+    """Time ``requests`` calls of ``scenario`` spread over ``concurrency``
+    logged-in sessions, each acting as one of the seeded users.
+
+    Throughput counts only the timed requests, not their untimed preparation,
+    so it is requests over the busiest session's time spent waiting on them.
+    A scenario with ``background`` load gets another ``concurrency`` sessions
+    running it until the timed ones finish.
+    """
+    monitor = new_session()
+    before = monitor.sql_statements().get(scenario.endpoint, [0.0, 0.0])
+
+    counts = [requests // concurrency] * concurrency
+    for i in range(requests % concurrency):
+        counts[i] += 1
+    stop = threading.Event()
+    loaders = [
+        threading.Thread(
+            target=_background,
+            args=(
+                scenario,
+                new_session(),
+                fixtures[index % len(fixtures)],
+                random.Random(f"{seed}:{scenario.name}:background:{index}"),
+                stop,
+            ),
+            daemon=True,
+        )
+        for index in range(concurrency if scenario.background else 0)
+    ]
+    for loader in loaders:
+        loader.start()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(
+            pool.map(
+                lambda index: _worker(
+                    scenario,
+                    new_session(),
+                    fixtures[index % len(fixtures)],
+                    random.Random(f"{seed}:{scenario.name}:{index}"),
+                    warmup,
+                    counts[index],
+                ),
+                range(concurrency),
+            )
+        )
+    stop.set()
+    for loader in loaders:
+        loader.join()
+
+    after = monitor.sql_statements().get(scenario.endpoint, [0.0, 0.0])
+    statements, calls = after[0] - before[0], after[1] - before[1]
+
+    latencies = [latency for worker, _ in results for latency in worker]
+    busiest = max(sum(worker) for worker, _ in results)
+    return {
+        "endpoint": scenario.endpoint,
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "throughput": len(latencies) / busiest if busiest else 0.0,
+        "mean_ms": 1000 * sum(latencies) / len(latencies),
+        "p50_ms": 1000 * _percentile(latencies, 0.5),
+        "p99_ms": 1000 * _percentile(latencies, 0.99),
+        "sql_per_request": statements / calls if calls else None,
+    }
+
+
+def format_report(results):
+    header = (
+        f"{'scenario':<26} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} "
+        f"{'sql/req':>8} {'errors':>7}"
+    )
+    lines = [header, "-" * len(header)]
+    for name, result in results.items():
+        sql = result["sql_per_request"]
+        lines.append(
+            f"{name:<26} {result['throughput']:>9.1f} {result['p50_ms']:>9.2f} "
+            f"{result['p99_ms']:>9.2f} {'-' if sql is None else f'{sql:.1f}':>8} "
+            f"{result['errors']:>7}"
+        )
+    return "\n".join(lines)
+
+
+def compare(results, baseline_path, tolerance):
+    """Regressions against a saved run: slower p50 beyond ``tolerance``, or
+    more SQL statements per request at all."""
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)["scenarios"]
+
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["p50_ms"] > base["p50_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p50 {result['p50_ms']:.2f} ms, was {base['p50_ms']:.2f} ms"
+            )
+        sql, base_sql = result["sql_per_request"], base["sql_per_request"]
+        if sql is not None and base_sql is not None and sql > base_sql + 0.5:
+            regressions.append(
+                f"{name}: {sql:.1f} SQL statements per request, was {base_sql:.1f}"
+            )
+    return regressions
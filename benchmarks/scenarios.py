@@ -0,0 +1,561 @@
+import uuid
+
+from app.models import db, Experiment, ExperimentStep, Note, User
+
+from .seed import PASSWORD, TAGS
+
+# Sequence uploaded by the attachment scenarios; indexed on upload.
+FASTA = b">bench_seq benchmark sequence\n" + b"ACGTTGCAAGGCTTAACCGGTA" * 40 + b"\n"
+
+
+class Fixture:
+    """Ids owned by one seeded user, for picking request targets."""
+
+    def __init__(self, email, notes, experiments, steps):
+        self.email = email
+        self.notes = notes
+        self.experiments = experiments
+        self.steps = steps
+        self.attachment = None
+        self.sequence = None
+
+    @classmethod
+    def load(cls, email, sample=2000, step_experiments=5):
+        user_id = db.session.scalar(db.select(User.id).where(User.email == email))
+        notes = db.session.scalars(
+            db.select(Note.id).where(Note.user_id == user_id).limit(sample)
+        ).all()
+        experiments = db.session.scalars(
+            db.select(Experiment.id).where(Experiment.user_id == user_id)
+        ).all()
+        steps = {
+            experiment_id: [
+                str(step_id)
+                for step_id in db.session.scalars(
+                    db.select(ExperimentStep.id).where(
+                        ExperimentStep.experiment_id == experiment_id
+                    )
+                )
+            ]
+            for experiment_id in experiments[:step_experiments]
+        }
+        return cls(
+            email,
+            [str(note_id) for note_id in notes],
+            [str(experiment_id) for experiment_id in experiments],
+            {str(experiment_id): ids for experiment_id, ids in steps.items()},
+        )
+
+
+class Scenario:
+    def __init__(self, name, endpoint, run, prepare=None, background=None):
+        self.name = name
+        self.endpoint = endpoint
+        self.run = run
+        self.prepare = prepare
+        self.background = background
+
+
+SCENARIOS = []
+
+
+def scenario(name, endpoint, prepare=None, background=None):
+    """Register ``run(session, fixture, rng, prepared)`` as a scenario.
+
+    ``prepare(session, fixture, rng)`` runs untimed before each request and
+    its return value is passed to ``run`` as ``prepared``. ``background``,
+    another run function, is called in a loop by as many extra sessions as
+    there are timed ones while the scenario is measured.
+    """
+
+    def register(run):
+        SCENARIOS.append(Scenario(name, endpoint, run, prepare, background))
+        return run
+
+    return register
+
+
+def _note(rng):
+    return {
+        "title": f"Benchmark note {uuid.uuid4().hex[:8]}",
+        "content": "Observed the expected band at 1.2 kb. " * rng.randint(1, 20),
+        "tags": rng.sample(TAGS, rng.randint(0, 3)),
+    }
+
+
+def _experiment(rng, steps=10):
+    return {
+        "title": f"Benchmark experiment {uuid.uuid4().hex[:8]}",
+        "hypothesis": "The construct expresses in E. coli.",
+        "methods": "Transform, induce with IPTG, lyse and run a gel. " * 3,
+        "steps": [{"description": f"Step {i + 1}"} for i in range(steps)],
+    }
+
+
+def _step_target(fixture, rng):
+    experiment_id = rng.choice(list(fixture.steps))
+    return experiment_id, fixture.steps[experiment_id]
+
+
+# auth
+
+
+@scenario("auth.csrf", "auth.restore_csrf")
+def csrf(session, fixture, rng, prepared):
+    return session.request("GET", "/api/auth/csrf/restore")
+
+
+@scenario("auth.login", "auth.login")
+def login(session, fixture, rng, prepared):
+    return session.request(
+        "POST", "/api/auth/login", {"email": fixture.email, "password": PASSWORD}
+    )
+
+
+@scenario("auth.me", "auth.get_current_user")
+def me(session, fixture, rng, prepared):
+    return session.request("GET", "/api/auth/me")
+
+
+def _log_in(session, fixture, rng):
+    session.login(fixture.email, PASSWORD)
+
+
+@scenario("auth.me_during_logins", "auth.get_current_user", background=login)
+def me_during_logins(session, fixture, rng, prepared):
+    return session.request("GET", "/api/auth/me")
+
+
+@scenario("auth.logout", "auth.logout", prepare=_log_in)
+def logout(session, fixture, rng, prepared):
+    return session.request("DELETE", "/api/auth/logout")
+
+
+@scenario("auth.register", "auth.signup")
+def register(session, fixture, rng, prepared):
+    name = f"bench-{uuid.uuid4().hex}"
+    return session.request(
+        "POST",
+        "/api/auth/register",
+        {"username": name, "email": f"{name}@example.com", "password": PASSWORD},
+    )
+
+
+# stats
+
+
+@scenario("stats.get", "stats.get_stats")
+def get_stats(session, fixture, rng, prepared):
+    return session.request("GET", "/api/stats")
+
+
+# notes
+
+
+@scenario("notes.list", "notes.get_notes")
+def list_notes(session, fixture, rng, prepared):
+    return session.request("GET", "/api/notes")
+
+
+@scenario("notes.list_summary", "notes.get_notes")
+def list_notes_summary(session, fixture, rng, prepared):
+    return session.request("GET", "/api/notes?view=summary")
+
+
+@scenario("notes.list_fields", "notes.get_notes")
+def list_notes_fields(session, fixture, rng, prepared):
+    return session.request("GET", "/api/notes?fields=id,title,updated_at")
+
+
+@scenario("notes.list_tagged", "notes.get_notes")
+def list_notes_tagged(session, fixture, rng, prepared):
+    return session.request("GET", f"/api/notes?tag={rng.choice(TAGS)}")
+
+
+@scenario("notes.tags", "notes.get_tag_facets")
+def tag_facets(session, fixture, rng, prepared):
+    return session.request("GET", "/api/notes/tags")
+
+
+@scenario("notes.get", "notes.get_note")
+def get_note(session, fixture, rng, prepared):
+    return session.request("GET", f"/api/notes/{rng.choice(fixture.notes)}")
+
+
+@scenario("notes.create", "notes.create_note")
+def create_note(session, fixture, rng, prepared):
+    return session.request("POST", "/api/notes", _note(rng))
+
+
+@scenario("notes.update", "notes.update_note")
+def update_note(session, fixture, rng, prepared):
+    return session.request(
+        "PUT", f"/api/notes/{rng.choice(fixture.notes)}", _note(rng)
+    )
+
+
+def _new_note(session, fixture, rng):
+    return session.json("POST", "/api/notes", _note(rng))["id"]
+
+
+@scenario("notes.delete", "notes.delete_note", prepare=_new_note)
+def delete_note(session, fixture, rng, note_id):
+    return session.request("DELETE", f"/api/notes/{note_id}")
+
+
+@scenario("notes.batch", "notes.batch_notes")
+def batch_notes(session, fixture, rng, prepared):
+    operations = [{"op": "create", "data": _note(rng)} for _ in range(25)]
+    operations += [
+        {"op": "update", "id": note_id, "data": {"title": "Batch-updated note"}}
+        for note_id in rng.sample(fixture.notes, min(25, len(fixture.notes)))
+    ]
+    return session.request("POST", "/api/notes/batch", operations)
+
+
+# experiments
+
+
+@scenario("experiments.list", "experiments.get_experiments")
+def list_experiments(session, fixture, rng, prepared):
+    return session.request("GET", "/api/experiments")
+
+
+@scenario("experiments.list_summary", "experiments.get_experiments")
+def list_experiments_summary(session, fixture, rng, prepared):
+    return session.request("GET", "/api/experiments?view=summary")
+
+
+@scenario("experiments.get", "experiments.get_experiment")
+def get_experiment(session, fixture, rng, prepared):
+    return session.request("GET", f"/api/experiments/{rng.choice(fixture.experiments)}")
+
+
+@scenario("experiments.create", "experiments.create_experiment")
+def create_experiment(session, fixture, rng, prepared):
+    return session.request("POST", "/api/experiments", _experiment(rng))
+
+
+@scenario("experiments.update", "experiments.update_experiment")
+def update_experiment(session, fixture, rng, prepared):
+    return session.request(
+        "PUT",
+        f"/api/experiments/{rng.choice(fixture.experiments)}",
+        {"results": "Updated by the benchmark.", "status": "in_progress"},
+    )
+
+
+def _new_experiment(session, fixture, rng):
+    return session.json("POST", "/api/experiments", _experiment(rng, steps=3))["id"]
+
+
+@scenario(
+    "experiments.delete", "experiments.delete_experiment", prepare=_new_experiment
+)
+def delete_experiment(session, fixture, rng, experiment_id):
+    return session.request("DELETE", f"/api/experiments/{experiment_id}")
+
+
+@scenario("experiments.batch", "experiments.batch_experiments")
+def batch_experiments(session, fixture, rng, prepared):
+    operations = [
+        {"op": "create", "data": _experiment(rng, steps=5)} for _ in range(10)
+    ]
+    operations += [
+        {"op": "update", "id": experiment_id, "data": {"conclusion": "Batched."}}
+        for experiment_id in rng.sample(
+            fixture.experiments, min(10, len(fixture.experiments))
+        )
+    ]
+    return session.request("POST", "/api/experiments/batch", operations)
+
+
+@scenario("steps.add", "experiments.add_experiment_step")
+def add_step(session, fixture, rng, prepared):
+    experiment_id, steps = _step_target(fixture, rng)
+    return session.request(
+        "POST",
+        f"/api/experiments/{experiment_id}/steps",
+        {"description": "Inserted step", "after_step_id": rng.choice(steps)},
+    )
+
+
+@scenario("steps.move", "experiments.move_experiment_step")
+def move_step(session, fixture, rng, prepared):
+    experiment_id, steps = _step_target(fixture, rng)
+    step_id, after_step_id = rng.sample(steps, 2)
+    return session.request(
+        "POST",
+        f"/api/experiments/{experiment_id}/steps/{step_id}/move",
+        {"after_step_id": after_step_id},
+    )
+
+
+@scenario("steps.update", "experiments.update_experiment_step")
+def update_step(session, fixture, rng, prepared):
+    experiment_id, steps = _step_target(fixture, rng)
+    return session.request(
+        "PUT",
+        f"/api/experiments/{experiment_id}/steps/{rng.choice(steps)}",
+        {"observation": "Updated by the benchmark."},
+    )
+
+
+def _new_step(session, fixture, rng):
+    experiment_id, _ = _step_target(fixture, rng)
+    step = session.json(
+        "POST",
+        f"/api/experiments/{experiment_id}/steps",
+        {"description": "Step to delete"},
+    )
+    return experiment_id, step["id"]
+
+
+@scenario("steps.delete", "experiments.delete_experiment_step", prepare=_new_step)
+def delete_step(session, fixture, rng, prepared):
+    experiment_id, step_id = prepared
+    return session.request(
+        "DELETE", f"/api/experiments/{experiment_id}/steps/{step_id}"
+    )
+
+
+def _attachment_metadata():
+    return {"file_name": "bench.fasta", "file_type": "text/x-fasta"}
+
+
+def _new_attachment(session, fixture, rng):
+    experiment_id = rng.choice(fixture.experiments)
+    attachment = session.json(
+        "POST",
+        f"/api/experiments/{experiment_id}/attachments",
+        _attachment_metadata(),
+    )
+    return experiment_id, attachment["id"]
+
+
+def _stored_attachment(session, fixture, rng):
+    if fixture.attachment is None:
+        experiment_id, attachment_id = _new_attachment(session, fixture, rng)
+        session.json(
+            "PUT",
+            f"/api/experiments/{experiment_id}/attachments/{attachment_id}/content",
+            body=FASTA,
+            content_type="application/octet-stream",
+        )
+        fixture.attachment = (experiment_id, attachment_id)
+    return fixture.attachment
+
+
+@scenario("attachments.create", "experiments.add_experiment_attachment")
+def create_attachment(session, fixture, rng, prepared):
+    return session.request(
+        "POST",
+        f"/api/experiments/{rng.choice(fixture.experiments)}/attachments",
+        _attachment_metadata(),
+    )
+
+
+@scenario(
+    "attachments.upload",
+    "experiments.upload_attachment_content",
+    prepare=_new_attachment,
+)
+def upload_attachment(session, fixture, rng, prepared):
+    experiment_id, attachment_id = prepared
+    return session.request(
+        "PUT",
+        f"/api/experiments/{experiment_id}/attachments/{attachment_id}/content",
+        body=FASTA,
+        content_type="application/octet-stream",
+    )
+
+
+@scenario(
+    "attachments.download",
+    "experiments.download_attachment_content",
+    prepare=_stored_attachment,
+)
+def download_attachment(session, fixture, rng, prepared):
+    experiment_id, attachment_id = prepared
+    return session.request(
+        "GET", f"/api/experiments/{experiment_id}/attachments/{attachment_id}/content"
+    )
+
+
+@scenario(
+    "attachments.delete",
+    "experiments.delete_experiment_attachment",
+    prepare=_new_attachment,
+)
+def delete_attachment(session, fixture, rng, prepared):
+    experiment_id, attachment_id = prepared
+    return session.request(
+        "DELETE", f"/api/experiments/{experiment_id}/attachments/{attachment_id}"
+    )
+
+
+@scenario("jobs.list", "experiments.get_experiment_jobs")
+def list_jobs(session, fixture, rng, prepared):
+    return session.request(
+        "GET", f"/api/experiments/{rng.choice(fixture.experiments)}/jobs"
+    )
+
+
+# search
+
+
+@scenario("search.query", "search.search_notebook")
+def search(session, fixture, rng, prepared):
+    return session.request("GET", f"/api/search?q={rng.choice(TAGS)}")
+
+
+# sequences
+
+
+def _stored_sequence(session, fixture, rng):
+    if fixture.sequence is None:
+        _, attachment_id = _stored_attachment(session, fixture, rng)
+        records = session.json("GET", f"/api/sequences?attachment_id={attachment_id}")
+        fixture.sequence = records[0]["id"]
+    return fixture.sequence
+
+
+def _sequence_attachment(session, fixture, rng):
+    return _stored_attachment(session, fixture, rng)[1]
+
+
+@scenario("sequences.list", "sequences.get_sequences", prepare=_sequence_attachment)
+def list_sequences(session, fixture, rng, attachment_id):
+    return session.request("GET", f"/api/sequences?attachment_id={attachment_id}")
+
+
+@scenario("sequences.get", "sequences.get_sequence", prepare=_stored_sequence)
+def get_sequence(session, fixture, rng, sequence_id):
+    return session.request("GET", f"/api/sequences/{sequence_id}")
+
+
+@scenario(
+    "sequences.residues", "sequences.get_sequence_residues", prepare=_stored_sequence
+)
+def sequence_residues(session, fixture, rng, sequence_id):
+    start = rng.randrange(0, 400)
+    return session.request(
+        "GET", f"/api/sequences/{sequence_id}/sequence?start={start}&end={start + 400}"
+    )
+
+
+@scenario("sequences.stats", "sequences.get_sequence_stats", prepare=_stored_sequence)
+def sequence_stats(session, fixture, rng, sequence_id):
+    return session.request(
+        "POST", "/api/sequences/stats", {"sequence_ids": [sequence_id]}
+    )
+
+
+@scenario(
+    "sequences.similar", "sequences.find_similar_sequences", prepare=_stored_sequence
+)
+def similar_sequences(session, fixture, rng, sequence_id):
+    return session.request(
+        "POST", "/api/sequences/similar", {"sequence_id": sequence_id}
+    )
+
+
+@scenario("sequences.align", "sequences.align_sequences", prepare=_stored_sequence)
+def align_sequences(session, fixture, rng, sequence_id):
+    query = "".join(rng.choice("ACGT") for _ in range(60))
+    return session.request(
+        "POST",
+        "/api/sequences/align",
+        {"target": {"sequence_id": sequence_id}, "query": query},
+    )
+
+
+@scenario(
+    "sequences.enzymes", "sequences.get_sequence_enzymes", prepare=_stored_sequence
+)
+def sequence_enzymes(session, fixture, rng, sequence_id):
+    return session.request("GET", f"/api/sequences/{sequence_id}/enzymes")
+
+
+@scenario(
+    "sequences.fragments", "sequences.get_sequence_fragments", prepare=_stored_sequence
+)
+def sequence_fragments(session, fixture, rng, sequence_id):
+    return session.request(
+        "GET", f"/api/sequences/{sequence_id}/fragments?enzyme=HpaII"
+    )
+
+
+def _ingest_target(session, fixture, rng):
+    # Re-ingesting replaces an attachment's records, so not the shared one.
+    experiment_id, attachment_id = _new_attachment(session, fixture, rng)
+    session.json(
+        "PUT",
+        f"/api/experiments/{experiment_id}/attachments/{attachment_id}/content",
+        body=FASTA,
+        content_type="application/octet-stream",
+    )
+    return attachment_id
+
+
+@scenario("sequences.ingest", "sequences.ingest_sequences", prepare=_ingest_target)
+def ingest_sequences(session, fixture, rng, attachment_id):
+    return session.request(
+        "POST", "/api/sequences/ingest", {"attachment_id": attachment_id}
+    )
+
+
+# export
+
+
+@scenario("export.ndjson", "export.export_notebook")
+def export_ndjson(session, fixture, rng, prepared):
+    return session.request("GET", "/api/export?format=ndjson")
+
+
+@scenario("export.zip", "export.export_notebook")
+def export_zip(session, fixture, rng, prepared):
+    return session.request("GET", "/api/export?format=zip")
+
+
+# import
+
+
+def _multipart(file_name, data):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{file_name}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def _import_file(session, fixture, rng, rows=100):
+    lines = ["title,content"]
+    lines += [f"Imported {uuid.uuid4().hex[:8]},Imported body" for _ in range(rows)]
+    return _multipart("notes.csv", "\n".join(lines).encode())
+
+
+@scenario("import.notes", "imports.import_file", prepare=_import_file)
+def import_notes(session, fixture, rng, prepared):
+    body, content_type = prepared
+    return session.request(
+        "POST", "/api/import/notes", body=body, content_type=content_type
+    )
+
+
+@scenario("import.notes_dry_run", "imports.import_file", prepare=_import_file)
+def import_notes_dry_run(session, fixture, rng, prepared):
+    body, content_type = prepared
+    return session.request(
+        "POST", "/api/import/notes?dry_run=1", body=body, content_type=content_type
+    )
+
+
+# metrics
+
+
+@scenario("metrics.get", "metrics.get_metrics")
+def get_metrics(session, fixture, rng, prepared):
+    return session.request("GET", "/api/metrics")
@@ -0,0 +1,149 @@
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from app.bulk import chunked
+from app.models import db, Experiment, ExperimentStep, Note, Tag, User, note_tags
+from app.ordering import GAP
+from app.passwords import passwords
+from app.stats import rebuild_stats
+
+# Rows per user at each preset scale; steps are per experiment.
+SCALES = {
+    "small": {"users": 2, "notes": 500, "experiments": 20, "steps": 200},
+    "medium": {"users": 4, "notes": 5_000, "experiments": 100, "steps": 300},
+    "large": {"users": 8, "notes": 50_000, "experiments": 200, "steps": 500},
+}
+PASSWORD = "benchmark-password"
+TAGS = tuple(
+    "cloning pcr gel western elisa crispr qpcr sequencing plasmid culture "
+    "primer ligation digest transformation miniprep assay buffer stock "
+    "protocol imaging".split()
+)
+WORDS = tuple(
+    "sample buffer incubate overnight centrifuge pellet supernatant wash "
+    "resuspend dilute aliquot measure absorbance record observe colony plate "
+    "agar antibiotic ligase enzyme template primer anneal extend denature "
+    "cycle band ladder expected result control replicate".split()
+)
+
+
+def email(index):
+    return f"bench{index}@example.com"
+
+
+def _text(rng, words):
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _insert(table, rows):
+    for chunk in chunked(rows, 1000):
+        db.session.execute(db.insert(table), chunk)
+
+
+def _timestamps(rng, now):
+    created = now - timedelta(minutes=rng.randrange(365 * 24 * 60))
+    updated = created + timedelta(minutes=rng.randrange(30 * 24 * 60))
+    return created, min(updated, now)
+
+
+def seed(users, notes, experiments, steps, seed=0):
+    """Insert synthetic users, notes and experiments with Core inserts.
+
+    Every user logs in with ``PASSWORD``. The same ``seed`` always produces
+    the same ids and content. Passwords are hashed with the configured
+    method so logging in never triggers a rehash.
+    """
+    rng = random.Random(seed)
+    hashed_password = passwords.hash(PASSWORD)
+    now = datetime.utcnow()
+
+    for index in range(users):
+        user_id = _uuid(rng)
+        _insert(
+            User.__table__,
+            [
+                {
+                    "id": user_id,
+                    "username": f"bench{index}",
+                    "email": email(index),
+                    "hashed_password": hashed_password,
+                }
+            ],
+        )
+
+        tag_ids = {name: _uuid(rng) for name in TAGS}
+        _insert(
+            Tag.__table__,
+            [
+                {"id": tag_id, "user_id": user_id, "name": name}
+                for name, tag_id in tag_ids.items()
+            ],
+        )
+
+        note_rows, links = [], []
+        for n in range(notes):
+            note_id = _uuid(rng)
+            created, updated = _timestamps(rng, now)
+            tags = rng.sample(TAGS, rng.randint(0, 3))
+            note_rows.append(
+                {
+                    "id": note_id,
+                    "user_id": user_id,
+                    "title": f"Note {n}: {_text(rng, 4)}",
+                    "content": _text(rng, rng.randint(20, 200)),
+                    "created_at": created,
+                    "updated_at": updated,
+                    "tags": ",".join(tags),
+                }
+            )
+            links.extend({"note_id": note_id, "tag_id": tag_ids[t]} for t in tags)
+        _insert(Note.__table__, note_rows)
+        _insert(note_tags, links)
+
+        for e in range(experiments):
+            experiment_id = _uuid(rng)
+            created, updated = _timestamps(rng, now)
+            _insert(
+                Experiment.__table__,
+                [
+                    {
+                        "id": experiment_id,
+                        "user_id": user_id,
+                        "title": f"Experiment {e}: {_text(rng, 4)}",
+                        "hypothesis": _text(rng, 30),
+                        "materials": _text(rng, 40),
+                        "methods": _text(rng, 80),
+                        "results": _text(rng, 40),
+                        "conclusion": _text(rng, 20),
+                        "status": rng.choice(Experiment.STATUSES),
+                        "created_at": created,
+                        "updated_at": updated,
+                    }
+                ],
+            )
+            _insert(
+                ExperimentStep.__table__,
+                [
+                    {
+                        "id": _uuid(rng),
+                        "experiment_id": experiment_id,
+                        "position": GAP * (s + 1),
+                        "description": _text(rng, rng.randint(5, 40)),
+                        "observation": _text(rng, rng.randint(0, 20)),
+                        "created_at": created,
+                        "updated_at": updated,
+                    }
+                    for s in range(steps)
+                ],
+            )
+        db.session.commit()
+
+    # The Core inserts above bypass the views that keep the counts.
+    rebuild_stats()
+    db.session.commit()
+    return [email(index) for index in range(users)]
@@ -11,6 +11,9 @@ interface ExperimentsListProps {
   selectedExperimentId?: string;
   onSelect: (experiment: Experiment) => void;
   onCreateNew: () => void;
+  hasMore?: boolean;
+  isLoadingMore?: boolean;
+  onLoadMore?: () => void;
 }
 
 export default function ExperimentsList({
@@ -18,6 +21,9 @@ export default function ExperimentsList({
   selectedExperimentId,
   onSelect,
   onCreateNew,
+  hasMore = false,
+  isLoadingMore = false,
+  onLoadMore,
 }: ExperimentsListProps) {
   const [searchQuery, setSearchQuery] = useState('');
   const [filteredExperiments, setFilteredExperiments] = useState<Experiment[]>([]);
@@ -139,6 +145,17 @@ export default function ExperimentsList({
             ))}
           </ul>
         }
+        {hasMore && (
+          <Button
+            variant='outline'
+            size='sm'
+            className='mt-2 w-full'
+            disabled={isLoadingMore}
+            onClick={onLoadMore}
+          >
+            {isLoadingMore ? 'Loading...' : 'Load more'}
+          </Button>
+        )}
       </div>
     </div>
   );
@@ -11,9 +11,20 @@ interface NotesListProps {
   selectedNoteId?: string;
   onSelect: (note: Note) => void;
   onCreateNew: () => void;
+  hasMore?: boolean;
+  isLoadingMore?: boolean;
+  onLoadMore?: () => void;
 }
 
-export default function NotesList({ notes, selectedNoteId, onSelect, onCreateNew }: NotesListProps) {
+export default function NotesList({
+  notes,
+  selectedNoteId,
+  onSelect,
+  onCreateNew,
+  hasMore = false,
+  isLoadingMore = false,
+  onLoadMore,
+}: NotesListProps) {
   const [searchQuery, setSearchQuery] = useState('');
   const [filteredNotes, setFilteredNotes] = useState<Note[]>([]);
 
@@ -92,6 +103,17 @@ export default function NotesList({ notes, selectedNoteId, onSelect, onCreateNew
             ))}
           </ul>
         }
+        {hasMore && (
+          <Button
+            variant='outline'
+            size='sm'
+            className='mt-2 w-full'
+            disabled={isLoadingMore}
+            onClick={onLoadMore}
+          >
+            {isLoadingMore ? 'Loading...' : 'Load more'}
+          </Button>
+        )}
       </div>
     </div>
   );
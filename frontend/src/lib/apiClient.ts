@@ -56,6 +56,29 @@ const request = async <T, D = JsonData>(endpoint: string, method: RequestMethod
 
 const get = <T>(endpoint: string): Promise<T> => request<T>(endpoint, 'GET');
 
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+// One page of a keyset-paginated list; pass nextCursor back for the next one.
+const getPage = async <T>(endpoint: string, cursor?: string | null): Promise<Page<T>> => {
+  const separator = endpoint.includes('?') ? '&' : '?';
+  const url = cursor ? `${endpoint}${separator}cursor=${encodeURIComponent(cursor)}` : endpoint;
+  const res = await fetch(url, { credentials: 'include' });
+
+  if (!res.ok) {
+    const errorData = await res.json().catch(() => ({}));
+    const error = new Error(errorData.error || errorData.message || 'API request failed');
+    throw Object.assign(error, { status: res.status, data: errorData });
+  }
+
+  return {
+    items: (await res.json()) as T[],
+    nextCursor: res.headers.get('X-Next-Cursor'),
+  };
+};
+
 const post = <T, D = JsonData>(endpoint: string, data?: D): Promise<T> => request<T, D>(endpoint, 'POST', data);
 
 const put = <T, D = JsonData>(endpoint: string, data?: D): Promise<T> => request<T, D>(endpoint, 'PUT', data);
@@ -68,6 +91,7 @@ const invalidateCsrfToken = (): void => {
 
 const apiClient = {
   get,
+  getPage,
   post,
   put,
   delete: del,
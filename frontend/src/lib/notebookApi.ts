@@ -1,4 +1,4 @@
-import apiClient from './apiClient';
+import apiClient, { Page } from './apiClient';
 
 export interface Note {
   id: string;
@@ -29,6 +29,8 @@ export interface ExperimentAttachment {
   file_type: string;
   file_path: string;
   description: string | null;
+  size_bytes: number | null;
+  sha256: string | null;
   created_at: string;
 }
 
@@ -90,7 +92,8 @@ export type UpdateExperimentDto = Partial<{
 }>;
 
 // Notes API
-export const fetchNotes = (): Promise<Note[]> => apiClient.get<Note[]>('/api/notes');
+export const fetchNotes = (cursor?: string | null): Promise<Page<Note>> =>
+  apiClient.getPage<Note>('/api/notes', cursor);
 
 export const fetchNote = (id: string): Promise<Note> => apiClient.get<Note>(`/api/notes/${id}`);
 
@@ -103,7 +106,8 @@ export const deleteNote = (id: string): Promise<{ message: string }> =>
   apiClient.delete<{ message: string }>(`/api/notes/${id}`);
 
 // Experiments API
-export const fetchExperiments = (): Promise<Experiment[]> => apiClient.get<Experiment[]>('/api/experiments');
+export const fetchExperiments = (cursor?: string | null): Promise<Page<Experiment>> =>
+  apiClient.getPage<Experiment>('/api/experiments', cursor);
 
 export const fetchExperiment = (id: string): Promise<Experiment> => apiClient.get<Experiment>(`/api/experiments/${id}`);
 
@@ -143,14 +147,14 @@ export const deleteExperimentAttachment = (experimentId: string, attachmentId: s
 
 export default {
   notes: {
-    fetchAll: fetchNotes,
+    fetchPage: fetchNotes,
     fetchOne: fetchNote,
     create: createNote,
     update: updateNote,
     delete: deleteNote,
   },
   experiments: {
-    fetchAll: fetchExperiments,
+    fetchPage: fetchExperiments,
     fetchOne: fetchExperiment,
     create: createExperiment,
     update: updateExperiment,
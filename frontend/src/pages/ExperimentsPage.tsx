@@ -22,6 +22,9 @@ export default function ExperimentsPage({ sidebarMode = false }: ExperimentsPage
     currentExperiment,
     isLoading,
     refetchExperiments,
+    hasMoreExperiments,
+    loadMoreExperiments,
+    isLoadingMoreExperiments,
     createExperiment,
     updateExperiment,
     deleteExperiment,
@@ -126,6 +129,9 @@ export default function ExperimentsPage({ sidebarMode = false }: ExperimentsPage
             selectedExperimentId={currentExperiment?.id}
             onSelect={handleSelectExperiment}
             onCreateNew={handleCreateNew}
+            hasMore={hasMoreExperiments}
+            isLoadingMore={isLoadingMoreExperiments}
+            onLoadMore={() => loadMoreExperiments()}
           />
         </div>
 
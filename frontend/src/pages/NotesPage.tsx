@@ -15,8 +15,19 @@ interface NotesPageProps {
 }
 
 export default function NotesPage({ sidebarMode = false }: NotesPageProps) {
-  const { notes, currentNote, isLoading, refetchNotes, createNote, updateNote, deleteNote, setCurrentNote } =
-    useNotes();
+  const {
+    notes,
+    currentNote,
+    isLoading,
+    refetchNotes,
+    hasMoreNotes,
+    loadMoreNotes,
+    isLoadingMoreNotes,
+    createNote,
+    updateNote,
+    deleteNote,
+    setCurrentNote,
+  } = useNotes();
 
   const [isEditing, setIsEditing] = useState(false);
   const [isCreating, setIsCreating] = useState(false);
@@ -87,6 +98,9 @@ export default function NotesPage({ sidebarMode = false }: NotesPageProps) {
             selectedNoteId={currentNote?.id}
             onSelect={handleSelectNote}
             onCreateNew={handleCreateNew}
+            hasMore={hasMoreNotes}
+            isLoadingMore={isLoadingMoreNotes}
+            onLoadMore={() => loadMoreNotes()}
           />
         </div>
 
@@ -1,5 +1,12 @@
-import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
-import { useState } from 'react';
+import {
+  InfiniteData,
+  infiniteQueryOptions,
+  useInfiniteQuery,
+  useMutation,
+  useQueryClient,
+} from '@tanstack/react-query';
+import { useMemo, useState } from 'react';
+import apiClient, { Page } from '@/lib/apiClient';
 
 export interface Note {
   id: string;
@@ -30,6 +37,8 @@ export interface ExperimentAttachment {
   file_type: string;
   file_path: string;
   description: string | null;
+  size_bytes: number | null;
+  sha256: string | null;
   created_at: string;
 }
 
@@ -149,20 +158,36 @@ const makeRequest = async <T>(endpoint: string, method: string = 'GET', data?: u
   return response.json();
 };
 
+type Pages<T> = InfiniteData<Page<T>, string | null>;
+
+// Lists are fetched a page at a time as the user asks for more; cached pages
+// are edited in place after a mutation instead of refetching them all.
+const editPages = <T>(data: Pages<T> | undefined, edit: (items: T[], index: number) => T[]) =>
+  data && { ...data, pages: data.pages.map((page, index) => ({ ...page, items: edit(page.items, index) })) };
+
+const listQuery = <T>(key: string, endpoint: string) =>
+  infiniteQueryOptions({
+    queryKey: [key],
+    queryFn: ({ pageParam }) => apiClient.getPage<T>(`${API_BASE_URL}${endpoint}`, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: lastPage => lastPage.nextCursor,
+    staleTime: 5 * 60 * 1000, // 5 minutes
+  });
+
 export const useNotes = () => {
   const queryClient = useQueryClient();
   const [currentNote, setCurrentNote] = useState<Note | null>(null);
   const [error, setError] = useState<string | null>(null);
 
   const {
-    data: notes = [],
+    data,
     isLoading: isLoadingNotes,
     refetch: refetchNotes,
-  } = useQuery({
-    queryKey: ['notes'],
-    queryFn: () => makeRequest<Note[]>('/notes'),
-    staleTime: 5 * 60 * 1000, // 5 minutes
-  });
+    hasNextPage: hasMoreNotes,
+    fetchNextPage: loadMoreNotes,
+    isFetchingNextPage: isLoadingMoreNotes,
+  } = useInfiniteQuery(listQuery<Note>('notes', '/notes'));
+  const notes = useMemo(() => data?.pages.flatMap(page => page.items) ?? [], [data]);
 
   const fetchNote = async (id: string) => {
     try {
@@ -178,7 +203,9 @@ export const useNotes = () => {
   const createNoteMutation = useMutation({
     mutationFn: (data: CreateNoteDto) => makeRequest<Note>('/notes', 'POST', data),
     onSuccess: newNote => {
-      queryClient.setQueryData(['notes'], (old: Note[] = []) => [newNote, ...old]);
+      queryClient.setQueryData(['notes'], (old?: Pages<Note>) =>
+        editPages(old, (items, index) => (index === 0 ? [newNote, ...items] : items))
+      );
       setCurrentNote(newNote);
       setError(null);
     },
@@ -190,8 +217,8 @@ export const useNotes = () => {
   const updateNoteMutation = useMutation({
     mutationFn: ({ id, data }: { id: string; data: UpdateNoteDto }) => makeRequest<Note>(`/notes/${id}`, 'PUT', data),
     onSuccess: updatedNote => {
-      queryClient.setQueryData(['notes'], (old: Note[] = []) =>
-        old.map(note => (note.id === updatedNote.id ? updatedNote : note))
+      queryClient.setQueryData(['notes'], (old?: Pages<Note>) =>
+        editPages(old, items => items.map(note => (note.id === updatedNote.id ? updatedNote : note)))
       );
 
       // Update current note if it's the one being edited
@@ -209,7 +236,9 @@ export const useNotes = () => {
   const deleteNoteMutation = useMutation({
     mutationFn: (id: string) => makeRequest<{ message: string }>(`/notes/${id}`, 'DELETE'),
     onSuccess: (_, id) => {
-      queryClient.setQueryData(['notes'], (old: Note[] = []) => old.filter(note => note.id !== id));
+      queryClient.setQueryData(['notes'], (old?: Pages<Note>) =>
+        editPages(old, items => items.filter(note => note.id !== id))
+      );
 
       // Clear current note if it was deleted
       if (currentNote?.id === id) {
@@ -262,6 +291,9 @@ export const useNotes = () => {
     updateNote,
     deleteNote,
     refetchNotes,
+    hasMoreNotes,
+    loadMoreNotes,
+    isLoadingMoreNotes,
   };
 };
 
@@ -271,14 +303,14 @@ export const useExperiments = () => {
   const [error, setError] = useState<string | null>(null);
 
   const {
-    data: experiments = [],
+    data,
     isLoading: isLoadingExperiments,
     refetch: refetchExperiments,
-  } = useQuery({
-    queryKey: ['experiments'],
-    queryFn: () => makeRequest<Experiment[]>('/experiments'),
-    staleTime: 5 * 60 * 1000, // 5 minutes
-  });
+    hasNextPage: hasMoreExperiments,
+    fetchNextPage: loadMoreExperiments,
+    isFetchingNextPage: isLoadingMoreExperiments,
+  } = useInfiniteQuery(listQuery<Experiment>('experiments', '/experiments'));
+  const experiments = useMemo(() => data?.pages.flatMap(page => page.items) ?? [], [data]);
 
   const fetchExperiment = async (id: string) => {
     try {
@@ -294,7 +326,9 @@ export const useExperiments = () => {
   const createExperimentMutation = useMutation({
     mutationFn: (data: CreateExperimentDto) => makeRequest<Experiment>('/experiments', 'POST', data),
     onSuccess: newExperiment => {
-      queryClient.setQueryData(['experiments'], (old: Experiment[] = []) => [newExperiment, ...old]);
+      queryClient.setQueryData(['experiments'], (old?: Pages<Experiment>) =>
+        editPages(old, (items, index) => (index === 0 ? [newExperiment, ...items] : items))
+      );
       setCurrentExperiment(newExperiment);
       setError(null);
     },
@@ -307,8 +341,8 @@ export const useExperiments = () => {
     mutationFn: ({ id, data }: { id: string; data: UpdateExperimentDto }) =>
       makeRequest<Experiment>(`/experiments/${id}`, 'PUT', data),
     onSuccess: updatedExperiment => {
-      queryClient.setQueryData(['experiments'], (old: Experiment[] = []) =>
-        old.map(exp => (exp.id === updatedExperiment.id ? updatedExperiment : exp))
+      queryClient.setQueryData(['experiments'], (old?: Pages<Experiment>) =>
+        editPages(old, items => items.map(exp => (exp.id === updatedExperiment.id ? updatedExperiment : exp)))
       );
 
       // Update current experiment if it's the one being edited
@@ -326,7 +360,9 @@ export const useExperiments = () => {
   const deleteExperimentMutation = useMutation({
     mutationFn: (id: string) => makeRequest<{ message: string }>(`/experiments/${id}`, 'DELETE'),
     onSuccess: (_, id) => {
-      queryClient.setQueryData(['experiments'], (old: Experiment[] = []) => old.filter(exp => exp.id !== id));
+      queryClient.setQueryData(['experiments'], (old?: Pages<Experiment>) =>
+        editPages(old, items => items.filter(exp => exp.id !== id))
+      );
 
       // Clear current experiment if it was deleted
       if (currentExperiment?.id === id) {
@@ -382,5 +418,8 @@ export const useExperiments = () => {
     updateExperiment,
     deleteExperiment,
     refetchExperiments,
+    hasMoreExperiments,
+    loadMoreExperiments,
+    isLoadingMoreExperiments,
   };
 };
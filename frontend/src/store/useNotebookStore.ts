@@ -11,12 +11,14 @@ import notebookApi, {
 interface NotebookState {
   // Notes state
   notes: Note[];
+  notesCursor: string | null;
   currentNote: Note | null;
   isLoadingNotes: boolean;
   noteError: string | null;
 
   // Experiments state
   experiments: Experiment[];
+  experimentsCursor: string | null;
   currentExperiment: Experiment | null;
   isLoadingExperiments: boolean;
   experimentError: string | null;
@@ -25,6 +27,7 @@ interface NotebookState {
 interface NotebookActions {
   // Notes actions
   fetchNotes: () => Promise<void>;
+  fetchMoreNotes: () => Promise<void>;
   fetchNote: (id: string) => Promise<void>;
   createNote: (data: CreateNoteDto) => Promise<Note>;
   updateNote: (id: string, data: UpdateNoteDto) => Promise<Note>;
@@ -34,6 +37,7 @@ interface NotebookActions {
 
   // Experiments actions
   fetchExperiments: () => Promise<void>;
+  fetchMoreExperiments: () => Promise<void>;
   fetchExperiment: (id: string) => Promise<void>;
   createExperiment: (data: CreateExperimentDto) => Promise<Experiment>;
   updateExperiment: (id: string, data: UpdateExperimentDto) => Promise<Experiment>;
@@ -44,15 +48,17 @@ interface NotebookActions {
 
 type NotebookStore = NotebookState & NotebookActions;
 
-const useNotebookStore = create<NotebookStore>(set => ({
+const useNotebookStore = create<NotebookStore>((set, get) => ({
   // Notes state
   notes: [],
+  notesCursor: null,
   currentNote: null,
   isLoadingNotes: false,
   noteError: null,
 
   // Experiments state
   experiments: [],
+  experimentsCursor: null,
   currentExperiment: null,
   isLoadingExperiments: false,
   experimentError: null,
@@ -61,8 +67,22 @@ const useNotebookStore = create<NotebookStore>(set => ({
   fetchNotes: async () => {
     try {
       set({ isLoadingNotes: true, noteError: null });
-      const notes = await notebookApi.notes.fetchAll();
-      set({ notes, isLoadingNotes: false });
+      const page = await notebookApi.notes.fetchPage();
+      set({ notes: page.items, notesCursor: page.nextCursor, isLoadingNotes: false });
+    } catch (error) {
+      console.error('Error fetching notes:', error);
+      set({ noteError: 'Failed to fetch notes', isLoadingNotes: false });
+    }
+  },
+
+  fetchMoreNotes: async () => {
+    const { notesCursor } = get();
+    if (!notesCursor) return;
+
+    try {
+      set({ isLoadingNotes: true, noteError: null });
+      const page = await notebookApi.notes.fetchPage(notesCursor);
+      set(state => ({ notes: [...state.notes, ...page.items], notesCursor: page.nextCursor, isLoadingNotes: false }));
     } catch (error) {
       console.error('Error fetching notes:', error);
       set({ noteError: 'Failed to fetch notes', isLoadingNotes: false });
@@ -138,8 +158,26 @@ const useNotebookStore = create<NotebookStore>(set => ({
   fetchExperiments: async () => {
     try {
       set({ isLoadingExperiments: true, experimentError: null });
-      const experiments = await notebookApi.experiments.fetchAll();
-      set({ experiments, isLoadingExperiments: false });
+      const page = await notebookApi.experiments.fetchPage();
+      set({ experiments: page.items, experimentsCursor: page.nextCursor, isLoadingExperiments: false });
+    } catch (error) {
+      console.error('Error fetching experiments:', error);
+      set({ experimentError: 'Failed to fetch experiments', isLoadingExperiments: false });
+    }
+  },
+
+  fetchMoreExperiments: async () => {
+    const { experimentsCursor } = get();
+    if (!experimentsCursor) return;
+
+    try {
+      set({ isLoadingExperiments: true, experimentError: null });
+      const page = await notebookApi.experiments.fetchPage(experimentsCursor);
+      set(state => ({
+        experiments: [...state.experiments, ...page.items],
+        experimentsCursor: page.nextCursor,
+        isLoadingExperiments: false,
+      }));
     } catch (error) {
       console.error('Error fetching experiments:', error);
       set({ experimentError: 'Failed to fetch experiments', isLoadingExperiments: false });
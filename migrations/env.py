@@ -86,10 +86,14 @@ def run_migrations_online():
             process_revision_directives=process_revision_directives,
             **current_app.extensions["migrate"].configure_args,
         )
-        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}"))  # pyright: ignore
+        # Only production Postgres has a schema; SQLite has none to create.
+        use_schema = SCHEMA and connection.dialect.name == "postgresql"
+        if use_schema:
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}"))
 
         with context.begin_transaction():
-            context.execute(text(f"SET search_path TO {SCHEMA}"))
+            if use_schema:
+                context.execute(text(f"SET search_path TO {SCHEMA}"))
             context.run_migrations()
 
 
@@ -0,0 +1,70 @@
+"""sparse step positions
+
+Revision ID: 2d0e6e487499
+Revises: 2d71834b0be9
+Create Date: 2026-10-18 12:21:36.402978
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "2d0e6e487499"
+down_revision = "2d71834b0be9"
+branch_labels = None
+depends_on = None
+
+GAP = 1024
+
+
+def upgrade():
+    with op.batch_alter_table("experiment_steps") as batch_op:
+        batch_op.add_column(sa.Column("position", sa.BigInteger(), nullable=True))
+
+    # Rank by the old step_number, breaking duplicate numbers by id, so every
+    # experiment gets distinct, evenly spaced keys.
+    op.execute(
+        f"""
+        UPDATE experiment_steps SET position = {GAP} * (
+            SELECT COUNT(*) FROM experiment_steps AS s
+            WHERE s.experiment_id = experiment_steps.experiment_id
+              AND (s.step_number < experiment_steps.step_number
+                   OR (s.step_number = experiment_steps.step_number
+                       AND s.id <= experiment_steps.id))
+        )
+        """
+    )
+
+    with op.batch_alter_table("experiment_steps") as batch_op:
+        batch_op.alter_column(
+            "position", existing_type=sa.BigInteger(), nullable=False
+        )
+        batch_op.create_unique_constraint(
+            "uq_experiment_steps_experiment_id_position",
+            ["experiment_id", "position"],
+        )
+        batch_op.drop_column("step_number")
+
+
+def downgrade():
+    with op.batch_alter_table("experiment_steps") as batch_op:
+        batch_op.add_column(sa.Column("step_number", sa.Integer(), nullable=True))
+
+    op.execute(
+        """
+        UPDATE experiment_steps SET step_number = (
+            SELECT COUNT(*) FROM experiment_steps AS s
+            WHERE s.experiment_id = experiment_steps.experiment_id
+              AND s.position <= experiment_steps.position
+        )
+        """
+    )
+
+    with op.batch_alter_table("experiment_steps") as batch_op:
+        batch_op.alter_column("step_number", existing_type=sa.Integer(), nullable=False)
+        batch_op.drop_constraint(
+            "uq_experiment_steps_experiment_id_position", type_="unique"
+        )
+        batch_op.drop_column("position")
@@ -0,0 +1,102 @@
+"""normalize note tags
+
+Revision ID: 2d71834b0be9
+Revises: cb184182bb94
+Create Date: 2026-10-18 10:48:05.274410
+
+"""
+
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "2d71834b0be9"
+down_revision = "cb184182bb94"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tags = op.create_table(
+        "tags",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "name", name="uq_tags_user_id_name"),
+    )
+    note_tags = op.create_table(
+        "note_tags",
+        sa.Column("note_id", sa.UUID(), nullable=False),
+        sa.Column("tag_id", sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(["note_id"], ["notes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("note_id", "tag_id"),
+    )
+    op.create_index(
+        "ix_note_tags_tag_id_note_id", "note_tags", ["tag_id", "note_id"], unique=False
+    )
+
+    connection = op.get_bind()
+
+    # SQLite ignores VARCHAR lengths, and rebuilding the table there would
+    # drop the search triggers on notes.
+    if connection.dialect.name != "sqlite":
+        op.alter_column(
+            "notes",
+            "tags",
+            existing_type=sa.String(length=255),
+            type_=sa.Text(),
+            existing_nullable=True,
+        )
+
+    notes = sa.table(
+        "notes",
+        sa.column("id", sa.UUID()),
+        sa.column("user_id", sa.UUID()),
+        sa.column("tags", sa.Text()),
+    )
+
+    tag_ids = {}
+    tag_rows = []
+    link_rows = []
+    for note_id, user_id, tags_string in connection.execute(
+        sa.select(notes.c.id, notes.c.user_id, notes.c.tags).where(
+            notes.c.tags.isnot(None), notes.c.tags != ""
+        )
+    ):
+        names = dict.fromkeys(
+            name.strip()[:100] for name in tags_string.split(",") if name.strip()
+        )
+        for name in names:
+            key = (user_id, name)
+            if key not in tag_ids:
+                tag_ids[key] = uuid.uuid4()
+                tag_rows.append({"id": tag_ids[key], "user_id": user_id, "name": name})
+            link_rows.append({"note_id": note_id, "tag_id": tag_ids[key]})
+
+    if tag_rows:
+        op.bulk_insert(tags, tag_rows)
+        op.bulk_insert(note_tags, link_rows)
+
+
+def downgrade():
+    op.drop_index("ix_note_tags_tag_id_note_id", table_name="note_tags")
+    op.drop_table("note_tags")
+    op.drop_table("tags")
+
+    if op.get_bind().dialect.name != "sqlite":
+        op.alter_column(
+            "notes",
+            "tags",
+            existing_type=sa.Text(),
+            type_=sa.String(length=255),
+            existing_nullable=True,
+        )
@@ -30,7 +30,8 @@ def upgrade():
         sa.UniqueConstraint("email"),
         sa.UniqueConstraint("username"),
     )
-    op.execute(f"ALTER TABLE users SET SCHEMA {SCHEMA};")
+    if SCHEMA and op.get_bind().dialect.name == "postgresql":
+        op.execute(f"ALTER TABLE users SET SCHEMA {SCHEMA};")
     # ### end Alembic commands ###
 
 
@@ -0,0 +1,45 @@
+"""add sequence sketches
+
+Revision ID: 4f8d2b6a9c31
+Revises: e7a2c94d1f06
+Create Date: 2026-10-18 15:02:47.630518
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4f8d2b6a9c31"
+down_revision = "e7a2c94d1f06"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "sequence_sketches",
+        sa.Column("sequence_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("k", sa.SmallInteger(), nullable=False),
+        sa.Column("kmer_count", sa.BigInteger(), nullable=False),
+        sa.Column("hashes", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["sequence_id"], ["sequence_records.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("sequence_id"),
+    )
+    op.create_index(
+        "ix_sequence_sketches_user_id", "sequence_sketches", ["user_id"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("ix_sequence_sketches_user_id", table_name="sequence_sketches")
+    op.drop_table("sequence_sketches")
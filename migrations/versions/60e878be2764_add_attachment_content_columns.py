@@ -0,0 +1,33 @@
+"""add attachment content columns
+
+Revision ID: 60e878be2764
+Revises: 2d0e6e487499
+Create Date: 2026-10-18 13:05:52.817640
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "60e878be2764"
+down_revision = "2d0e6e487499"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("experiment_attachments") as batch_op:
+        batch_op.add_column(sa.Column("size_bytes", sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column("sha256", sa.String(length=64), nullable=True))
+        batch_op.create_index(
+            "ix_experiment_attachments_sha256", ["sha256"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("experiment_attachments") as batch_op:
+        batch_op.drop_index("ix_experiment_attachments_sha256")
+        batch_op.drop_column("sha256")
+        batch_op.drop_column("size_bytes")
@@ -0,0 +1,37 @@
+"""add keyset pagination indexes
+
+Revision ID: 91296b42e993
+Revises: 930723eebc8b
+Create Date: 2026-10-18 09:12:41.118302
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "91296b42e993"
+down_revision = "930723eebc8b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_notes_user_id_updated_at_id",
+        "notes",
+        ["user_id", "updated_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_experiments_user_id_updated_at_id",
+        "experiments",
+        ["user_id", "updated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_experiments_user_id_updated_at_id", table_name="experiments")
+    op.drop_index("ix_notes_user_id_updated_at_id", table_name="notes")
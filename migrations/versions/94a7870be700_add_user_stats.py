@@ -0,0 +1,68 @@
+"""add user stats
+
+Revision ID: 94a7870be700
+Revises: c2f7e1d94a58
+Create Date: 2026-10-18 18:02:37.518460
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "94a7870be700"
+down_revision = "c2f7e1d94a58"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    user_stats = op.create_table(
+        "user_stats",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=80), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "name"),
+    )
+
+    # Same counts as `flask stats rebuild`, done in SQL.
+    notes = sa.table("notes", sa.column("user_id", sa.UUID()))
+    experiments = sa.table(
+        "experiments",
+        sa.column("user_id", sa.UUID()),
+        sa.column("status", sa.String()),
+    )
+    columns = ["user_id", "name", "value"]
+    op.execute(
+        user_stats.insert().from_select(
+            columns,
+            sa.select(notes.c.user_id, sa.literal("notes"), sa.func.count()).group_by(
+                notes.c.user_id
+            ),
+        )
+    )
+    op.execute(
+        user_stats.insert().from_select(
+            columns,
+            sa.select(
+                experiments.c.user_id, sa.literal("experiments"), sa.func.count()
+            ).group_by(experiments.c.user_id),
+        )
+    )
+    status_name = sa.literal("experiments:") + sa.func.coalesce(
+        experiments.c.status, "none"
+    )
+    op.execute(
+        user_stats.insert().from_select(
+            columns,
+            sa.select(experiments.c.user_id, status_name, sa.func.count()).group_by(
+                experiments.c.user_id, experiments.c.status
+            ),
+        )
+    )
+
+
+def downgrade():
+    op.drop_table("user_stats")
@@ -0,0 +1,31 @@
+"""add alignment results
+
+Revision ID: a83c5e0f7b12
+Revises: 4f8d2b6a9c31
+Create Date: 2026-10-18 15:41:09.287354
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a83c5e0f7b12"
+down_revision = "4f8d2b6a9c31"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "alignment_results",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade():
+    op.drop_table("alignment_results")
@@ -0,0 +1,65 @@
+"""add sequence records
+
+Revision ID: b5e19a0c47d3
+Revises: 60e878be2764
+Create Date: 2026-10-18 13:42:10.518273
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b5e19a0c47d3"
+down_revision = "60e878be2764"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "sequence_records",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("attachment_id", sa.UUID(), nullable=False),
+        sa.Column("record_id", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("format", sa.String(length=20), nullable=False),
+        sa.Column("length", sa.BigInteger(), nullable=False),
+        sa.Column("circular", sa.Boolean(), nullable=False),
+        sa.Column("offset", sa.BigInteger(), nullable=False),
+        sa.Column("raw_length", sa.BigInteger(), nullable=False),
+        sa.Column("seq_offset", sa.BigInteger(), nullable=True),
+        sa.Column("line_bases", sa.Integer(), nullable=True),
+        sa.Column("line_width", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["attachment_id"], ["experiment_attachments.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_sequence_records_attachment_id",
+        "sequence_records",
+        ["attachment_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_sequence_records_user_id_record_id",
+        "sequence_records",
+        ["user_id", "record_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_sequence_records_user_id_record_id", table_name="sequence_records"
+    )
+    op.drop_index("ix_sequence_records_attachment_id", table_name="sequence_records")
+    op.drop_table("sequence_records")
@@ -0,0 +1,58 @@
+"""add restriction sites
+
+Revision ID: c2f7e1d94a58
+Revises: a83c5e0f7b12
+Create Date: 2026-10-18 16:18:52.471093
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c2f7e1d94a58"
+down_revision = "a83c5e0f7b12"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "restriction_sites",
+        sa.Column("sequence_id", sa.UUID(), nullable=False),
+        sa.Column("enzyme", sa.String(length=40), nullable=False),
+        sa.Column("cut_count", sa.Integer(), nullable=False),
+        sa.Column("positions", sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["sequence_id"], ["sequence_records.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("sequence_id", "enzyme"),
+    )
+    op.create_index(
+        "ix_restriction_sites_sequence_id_cut_count",
+        "restriction_sites",
+        ["sequence_id", "cut_count"],
+        unique=False,
+    )
+
+    # Existing records are mapped by `flask sequences map-restriction`.
+    with op.batch_alter_table("sequence_records") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "restriction_mapped",
+                sa.Boolean(),
+                server_default=sa.false(),
+                nullable=False,
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("sequence_records") as batch_op:
+        batch_op.drop_column("restriction_mapped")
+
+    op.drop_index(
+        "ix_restriction_sites_sequence_id_cut_count", table_name="restriction_sites"
+    )
+    op.drop_table("restriction_sites")
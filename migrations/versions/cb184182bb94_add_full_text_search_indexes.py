@@ -0,0 +1,179 @@
+"""add full text search indexes
+
+Revision ID: cb184182bb94
+Revises: 91296b42e993
+Create Date: 2026-10-18 10:02:17.530941
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "cb184182bb94"
+down_revision = "91296b42e993"
+branch_labels = None
+depends_on = None
+
+NOTE_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "to_tsvector('english', coalesce(content, '') || ' ' || "
+    "replace(coalesce(tags, ''), ',', ' '))"
+)
+EXPERIMENT_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "to_tsvector('english', coalesce(hypothesis, '') || ' ' || "
+    "coalesce(methods, '') || ' ' || coalesce(results, '') || ' ' || "
+    "coalesce(conclusion, ''))"
+)
+
+# A copy of the statements in app.search_index, so later changes there can't
+# alter what this migration does.
+SQLITE_INDEX_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS search_documents (
+        docid INTEGER PRIMARY KEY,
+        kind VARCHAR(20) NOT NULL,
+        ref_id CHAR(32) NOT NULL,
+        user_id CHAR(32) NOT NULL,
+        UNIQUE (kind, ref_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_user_id "
+    "ON search_documents (user_id)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index "
+    "USING fts5(title, body, tokenize = 'porter unicode61')",
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_search_insert AFTER INSERT ON notes BEGIN
+        INSERT INTO search_documents (kind, ref_id, user_id)
+        VALUES ('note', new.id, new.user_id);
+        INSERT INTO search_index (rowid, title, body)
+        VALUES (
+            (SELECT docid FROM search_documents
+             WHERE kind = 'note' AND ref_id = new.id),
+            new.title,
+            new.content || ' ' || replace(coalesce(new.tags, ''), ',', ' ')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_search_update AFTER UPDATE ON notes BEGIN
+        UPDATE search_index
+        SET title = new.title,
+            body = new.content || ' ' || replace(coalesce(new.tags, ''), ',', ' ')
+        WHERE rowid = (SELECT docid FROM search_documents
+                       WHERE kind = 'note' AND ref_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_search_delete AFTER DELETE ON notes BEGIN
+        DELETE FROM search_index
+        WHERE rowid = (SELECT docid FROM search_documents
+                       WHERE kind = 'note' AND ref_id = old.id);
+        DELETE FROM search_documents WHERE kind = 'note' AND ref_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS experiments_search_insert
+    AFTER INSERT ON experiments BEGIN
+        INSERT INTO search_documents (kind, ref_id, user_id)
+        VALUES ('experiment', new.id, new.user_id);
+        INSERT INTO search_index (rowid, title, body)
+        VALUES (
+            (SELECT docid FROM search_documents
+             WHERE kind = 'experiment' AND ref_id = new.id),
+            new.title,
+            new.hypothesis || ' ' || new.methods || ' ' ||
+            coalesce(new.results, '') || ' ' || coalesce(new.conclusion, '')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS experiments_search_update
+    AFTER UPDATE ON experiments BEGIN
+        UPDATE search_index
+        SET title = new.title,
+            body = new.hypothesis || ' ' || new.methods || ' ' ||
+                   coalesce(new.results, '') || ' ' || coalesce(new.conclusion, '')
+        WHERE rowid = (SELECT docid FROM search_documents
+                       WHERE kind = 'experiment' AND ref_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS experiments_search_delete
+    AFTER DELETE ON experiments BEGIN
+        DELETE FROM search_index
+        WHERE rowid = (SELECT docid FROM search_documents
+                       WHERE kind = 'experiment' AND ref_id = old.id);
+        DELETE FROM search_documents
+        WHERE kind = 'experiment' AND ref_id = old.id;
+    END
+    """,
+]
+
+SQLITE_BACKFILL = [
+    "DELETE FROM search_index",
+    "DELETE FROM search_documents",
+    """
+    INSERT INTO search_documents (kind, ref_id, user_id)
+    SELECT 'note', id, user_id FROM notes
+    UNION ALL
+    SELECT 'experiment', id, user_id FROM experiments
+    """,
+    """
+    INSERT INTO search_index (rowid, title, body)
+    SELECT d.docid, n.title,
+           n.content || ' ' || replace(coalesce(n.tags, ''), ',', ' ')
+    FROM notes n JOIN search_documents d ON d.kind = 'note' AND d.ref_id = n.id
+    """,
+    """
+    INSERT INTO search_index (rowid, title, body)
+    SELECT d.docid, e.title,
+           e.hypothesis || ' ' || e.methods || ' ' ||
+           coalesce(e.results, '') || ' ' || coalesce(e.conclusion, '')
+    FROM experiments e
+    JOIN search_documents d ON d.kind = 'experiment' AND d.ref_id = e.id
+    """,
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        op.create_index(
+            "ix_notes_search",
+            "notes",
+            [sa.text(f"({NOTE_DOCUMENT})")],
+            postgresql_using="gin",
+        )
+        op.create_index(
+            "ix_experiments_search",
+            "experiments",
+            [sa.text(f"({EXPERIMENT_DOCUMENT})")],
+            postgresql_using="gin",
+        )
+    elif dialect == "sqlite":
+        for statement in SQLITE_INDEX_DDL + SQLITE_BACKFILL:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        op.drop_index("ix_experiments_search", table_name="experiments")
+        op.drop_index("ix_notes_search", table_name="notes")
+    elif dialect == "sqlite":
+        for trigger in (
+            "notes_search_insert",
+            "notes_search_update",
+            "notes_search_delete",
+            "experiments_search_insert",
+            "experiments_search_update",
+            "experiments_search_delete",
+        ):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS search_index")
+        op.execute("DROP TABLE IF EXISTS search_documents")
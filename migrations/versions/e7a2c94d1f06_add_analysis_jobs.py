@@ -0,0 +1,62 @@
+"""add analysis jobs
+
+Revision ID: e7a2c94d1f06
+Revises: b5e19a0c47d3
+Create Date: 2026-10-18 14:20:31.904117
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e7a2c94d1f06"
+down_revision = "b5e19a0c47d3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "analysis_jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("experiment_id", sa.UUID(), nullable=False),
+        sa.Column("kind", sa.String(length=50), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("progress", sa.Float(), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["experiment_id"], ["experiments.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_analysis_jobs_experiment_id_created_at",
+        "analysis_jobs",
+        ["experiment_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_analysis_jobs_status", "analysis_jobs", ["status"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("ix_analysis_jobs_status", table_name="analysis_jobs")
+    op.drop_index(
+        "ix_analysis_jobs_experiment_id_created_at", table_name="analysis_jobs"
+    )
+    op.drop_table("analysis_jobs")
@@ -0,0 +1,45 @@
+import os
+import tempfile
+import uuid
+
+import pytest
+
+# app reads its config from the environment when it is imported.
+_instance = tempfile.mkdtemp(prefix="exon-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_instance, 'test.db')}"
+os.environ["STORAGE_ROOT"] = os.path.join(_instance, "uploads")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("JOB_WORKERS", "1")
+os.environ.setdefault("PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
+
+
+@pytest.fixture(scope="session")
+def app():
+    from flask_migrate import upgrade
+
+    from app import app
+
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+    yield app
+
+
+@pytest.fixture
+def migrations():
+    return MIGRATIONS
+
+
+@pytest.fixture
+def client(app):
+    """A test client signed in as a new user."""
+    client = app.test_client()
+    name = uuid.uuid4().hex[:12]
+    response = client.post(
+        "/api/auth/register",
+        json={"email": f"{name}@example.com", "username": name, "password": "x"},
+    )
+    assert response.status_code == 201
+    return client
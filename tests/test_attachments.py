@@ -0,0 +1,63 @@
+import io
+
+import pytest
+
+
+@pytest.fixture
+def attachment_url(client):
+    experiment = client.post(
+        "/api/experiments",
+        json={"title": "Gel", "hypothesis": "h", "methods": "m"},
+    ).get_json()
+    attachment = client.post(
+        f"/api/experiments/{experiment['id']}/attachments",
+        json={"file_name": "page.html", "file_type": "text/html"},
+    ).get_json()
+    return f"/api/experiments/{experiment['id']}/attachments/{attachment['id']}"
+
+
+def test_download_is_never_inline(client, attachment_url):
+    client.put(
+        f"{attachment_url}/content",
+        data=b"<script>alert(1)</script>",
+        content_type="application/octet-stream",
+    )
+
+    response = client.get(f"{attachment_url}/content")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"].startswith("attachment;")
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+
+
+def test_upload_limit_applies_to_upload_routes_only(app, client, attachment_url):
+    limit = app.config["MAX_CONTENT_LENGTH"]
+    body = b"A" * (limit + 1)
+
+    upload = client.put(
+        f"{attachment_url}/content",
+        data=body,
+        content_type="application/octet-stream",
+    )
+    assert upload.status_code == 200
+    assert upload.get_json()["size_bytes"] == limit + 1
+
+    note = client.post("/api/notes", data=body, content_type="application/json")
+    assert note.status_code == 413
+
+
+def test_multipart_upload_takes_large_files(app, client):
+    experiment = client.post(
+        "/api/experiments",
+        json={"title": "Scan", "hypothesis": "h", "methods": "m"},
+    ).get_json()
+    size = app.config["MAX_CONTENT_LENGTH"] + 1
+
+    response = client.post(
+        f"/api/experiments/{experiment['id']}/attachments",
+        data={"file": (io.BytesIO(b"A" * size), "scan.tif")},
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 201
+    assert response.get_json()["size_bytes"] == size
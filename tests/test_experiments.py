@@ -0,0 +1,142 @@
+import pytest
+from flask import Flask
+
+from app.api.experiments import experiments
+
+EXPERIMENT = {"title": "PCR", "hypothesis": "It amplifies", "methods": "Run it"}
+
+
+def _by_status(client):
+    return client.get("/api/stats?recent=0").get_json()["experiments_by_status"]
+
+
+def test_steps_load_in_order(client):
+    steps = [{"description": f"Step {i}"} for i in range(3)]
+    created = client.post("/api/experiments", json={**EXPERIMENT, "steps": steps})
+    assert created.status_code == 201
+
+    experiment = client.get(f"/api/experiments/{created.get_json()['id']}")
+    assert [step["description"] for step in experiment.get_json()["steps"]] == [
+        "Step 0",
+        "Step 1",
+        "Step 2",
+    ]
+
+
+def test_update_rejects_unknown_status(client):
+    experiment = client.post("/api/experiments", json=EXPERIMENT).get_json()
+
+    response = client.put(
+        f"/api/experiments/{experiment['id']}", json={"status": "bogus"}
+    )
+
+    assert response.status_code == 400
+    stored = client.get(f"/api/experiments/{experiment['id']}").get_json()
+    assert stored["status"] == "planned"
+    assert "bogus" not in _by_status(client)
+
+
+def test_batch_update_rejects_unknown_status(client):
+    first, second = (
+        client.post("/api/experiments", json=EXPERIMENT).get_json() for _ in range(2)
+    )
+
+    response = client.post(
+        "/api/experiments/batch",
+        json=[
+            {"op": "update", "id": first["id"], "data": {"status": "bogus"}},
+            {"op": "update", "id": second["id"], "data": {"status": "failed"}},
+        ],
+    )
+
+    assert [result["status"] for result in response.get_json()] == [400, 200]
+    by_status = _by_status(client)
+    assert (by_status["planned"], by_status["failed"]) == (1, 1)
+    assert "bogus" not in by_status
+
+
+def test_unknown_load_strategy_fails_at_startup():
+    app = Flask(__name__)
+    app.config["EXPERIMENT_LOAD_STRATEGY"] = "eager"
+
+    with pytest.raises(ValueError, match="EXPERIMENT_LOAD_STRATEGY"):
+        app.register_blueprint(experiments, url_prefix="/api/experiments")
+
+
+def test_batch_create_keeps_status_and_checks_field_types(client):
+    response = client.post(
+        "/api/experiments/batch",
+        json=[
+            {"op": "create", "data": {**EXPERIMENT, "status": "in_progress"}},
+            {"op": "create", "data": {**EXPERIMENT, "title": 42}},
+            {"op": "create", "data": {**EXPERIMENT, "results": ["x"]}},
+            {"op": "create", "data": {**EXPERIMENT, "status": "bogus"}},
+        ],
+    )
+
+    assert response.status_code == 200
+    results = response.get_json()
+    assert [result["status"] for result in results] == [201, 400, 400, 400]
+    assert results[1]["error"] == "title must be a string"
+
+    created = client.get(f"/api/experiments/{results[0]['id']}").get_json()
+    assert created["status"] == "in_progress"
+    assert created["started_at"] is not None
+    assert _by_status(client)["in_progress"] == 1
+
+
+def test_batch_rejects_bad_step_timestamps_per_item(client):
+    def step(started_at):
+        return {"description": "Step", "started_at": started_at}
+
+    response = client.post(
+        "/api/experiments/batch",
+        json=[
+            {"op": "create", "data": {**EXPERIMENT, "steps": [step(123)]}},
+            {"op": "create", "data": {**EXPERIMENT, "steps": [step("soon")]}},
+            {"op": "create", "data": {**EXPERIMENT, "steps": [step(None)]}},
+        ],
+    )
+
+    assert response.status_code == 200
+    results = response.get_json()
+    assert [result["status"] for result in results] == [400, 400, 201]
+    assert results[0]["error"] == "Invalid step timestamp"
+
+
+def test_create_checks_field_types(client):
+    response = client.post("/api/experiments", json={**EXPERIMENT, "methods": 7})
+    assert response.status_code == 400
+
+
+def test_update_keeps_matched_step_ids(client):
+    steps = [{"description": "Mix"}, {"description": "Heat"}]
+    created = client.post(
+        "/api/experiments", json={**EXPERIMENT, "steps": steps}
+    ).get_json()
+    mix, heat = created["steps"]
+
+    response = client.put(
+        f"/api/experiments/{created['id']}",
+        json={"steps": [{**heat, "observation": "Boiled"}, {"description": "Cool"}]},
+    )
+
+    assert response.status_code == 200
+    updated = response.get_json()["steps"]
+    assert [step["description"] for step in updated] == ["Heat", "Cool"]
+    assert updated[0]["id"] == heat["id"]
+    assert updated[0]["observation"] == "Boiled"
+    assert mix["id"] not in {step["id"] for step in updated}
+
+
+@pytest.mark.parametrize("started_at", ["yesterday", 123, ["2024-01-01"]])
+def test_update_rejects_bad_step_timestamps(client, started_at):
+    created = client.post("/api/experiments", json=EXPERIMENT).get_json()
+
+    response = client.put(
+        f"/api/experiments/{created['id']}",
+        json={"steps": [{"description": "Step", "started_at": started_at}]},
+    )
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid step timestamp"}
@@ -0,0 +1,28 @@
+def test_delete_note_removes_its_tags(client):
+    kept = client.post(
+        "/api/notes", json={"title": "Kept", "content": "c", "tags": ["pcr"]}
+    ).get_json()
+    deleted = client.post(
+        "/api/notes",
+        json={"title": "Deleted", "content": "c", "tags": ["pcr", "gel"]},
+    ).get_json()
+
+    assert client.delete(f"/api/notes/{deleted['id']}").status_code == 200
+
+    facets = client.get("/api/notes/tags").get_json()
+    assert facets == [{"name": "pcr", "count": 1}]
+    assert client.get(f"/api/notes/{kept['id']}").status_code == 200
+
+
+def test_batch_checks_field_types(client):
+    response = client.post(
+        "/api/notes/batch",
+        json=[
+            {"op": "create", "data": {"title": "Fine", "content": "c"}},
+            {"op": "create", "data": {"title": 42, "content": "c"}},
+            {"op": "create", "data": {"title": "x" * 256, "content": "c"}},
+        ],
+    )
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.get_json()] == [201, 400, 400]
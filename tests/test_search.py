@@ -0,0 +1,17 @@
+def test_search_escapes_highlighted_text(client):
+    client.post(
+        "/api/notes",
+        json={
+            "title": "<img src=x onerror=alert(1)> plasmid",
+            "content": "<script>alert(1)</script> plasmid prep",
+        },
+    )
+
+    hits = client.get("/api/search?q=plasmid").get_json()
+
+    assert hits[0]["title"] == (
+        "&lt;img src=x onerror=alert(1)&gt; <mark>plasmid</mark>"
+    )
+    assert "<script>" not in hits[0]["snippet"]
+    assert "&lt;script&gt;" in hits[0]["snippet"]
+    assert "<mark>plasmid</mark>" in hits[0]["snippet"]
@@ -0,0 +1,101 @@
+import io
+import random
+import uuid
+
+import pytest
+from Bio import SeqIO
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+
+SEQUENCE = "".join(random.Random(10).choice("ACGT") for _ in range(250))
+# Line starts and ends, GenBank block edges and the final partial line.
+RANGES = [(0, 1), (0, 60), (9, 11), (59, 61), (60, 120), (69, 141), (239, 250)]
+
+
+def _fasta(lines, newline="\n"):
+    return newline.join([">seq1 first", *lines, ""]).encode()
+
+
+def _wrap(line_bases):
+    return [SEQUENCE[i : i + line_bases] for i in range(0, len(SEQUENCE), line_bases)]
+
+
+def _genbank(newline="\n"):
+    record = SeqRecord(
+        Seq(SEQUENCE),
+        id="SEQ1",
+        name="SEQ1",
+        description="first",
+        annotations={"molecule_type": "DNA"},
+    )
+    handle = io.StringIO()
+    SeqIO.write(record, handle, "genbank")
+    return handle.getvalue().replace("\n", newline).encode()
+
+
+@pytest.fixture
+def upload(app, client):
+    """Upload a sequence file and return its only indexed record."""
+    from app.models import SequenceRecord, db
+
+    experiment = client.post(
+        "/api/experiments",
+        json={"title": "Clone", "hypothesis": "h", "methods": "m"},
+    ).get_json()
+
+    def upload(file_name, content):
+        attachment = client.post(
+            f"/api/experiments/{experiment['id']}/attachments",
+            data={"file": (io.BytesIO(content), file_name)},
+            content_type="multipart/form-data",
+        ).get_json()
+        records = client.get(
+            f"/api/sequences?attachment_id={attachment['id']}"
+        ).get_json()
+        assert len(records) == 1
+        with app.app_context():
+            return db.session.get(SequenceRecord, uuid.UUID(records[0]["id"]))
+
+    return upload
+
+
+def _assert_ranges(client, record):
+    for start, end in RANGES:
+        response = client.get(
+            f"/api/sequences/{record.id}/sequence?start={start}&end={end}"
+        )
+        assert response.get_json()["sequence"] == SEQUENCE[start:end]
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_fasta_ingest_indexes_lines(client, upload, newline):
+    content = _fasta(_wrap(70), newline)
+
+    record = upload("clone.fasta", content)
+
+    assert (record.record_id, record.length) == ("seq1", len(SEQUENCE))
+    assert content[record.seq_offset :].startswith(SEQUENCE[:70].encode())
+    assert (record.line_bases, record.line_width) == (70, 70 + len(newline))
+    _assert_ranges(client, record)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_genbank_ingest_indexes_origin_block(client, upload, newline):
+    content = _genbank(newline)
+
+    record = upload("clone.gb", content)
+
+    assert (record.record_id, record.length) == ("SEQ1", len(SEQUENCE))
+    assert content[record.seq_offset :].startswith(b"        1 ")
+    assert (record.line_bases, record.line_width) == (60, 75 + len(newline))
+    _assert_ranges(client, record)
+
+
+def test_irregular_lines_fall_back_to_parsing(client, upload):
+    lines = _wrap(70)
+    lines[:2] = [lines[0][:-1], lines[0][-1] + lines[1]]
+
+    record = upload("irregular.fasta", _fasta(lines))
+
+    assert record.line_bases is None
+    _assert_ranges(client, record)
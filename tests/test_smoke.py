@@ -0,0 +1,28 @@
+from flask_migrate import downgrade, upgrade
+
+from app.models import db, Experiment, ExperimentStep, User
+
+
+def test_migrations_round_trip(app, migrations):
+    with app.app_context():
+        downgrade(directory=migrations, revision="base")
+        assert db.inspect(db.engine).get_table_names() == ["alembic_version"]
+        upgrade(directory=migrations)
+        assert "experiment_steps" in db.inspect(db.engine).get_table_names()
+
+
+def test_step_number(app):
+    with app.app_context():
+        user = User(username="smoke", email="smoke@example.com", password="x")
+        db.session.add(user)
+        db.session.flush()
+        experiment = Experiment(
+            user_id=user.id, title="Smoke", hypothesis="h", methods="m"
+        )
+        experiment.steps = [
+            ExperimentStep(description=f"Step {i}", position=i * 1024) for i in range(3)
+        ]
+        db.session.add(experiment)
+        db.session.commit()
+
+        assert [step.step_number for step in experiment.steps] == [1, 2, 3]
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+import time
+
+
+def test_workers_do_not_import_the_app():
+    code = (
+        "import sys, workers.jobs, workers.alignment; "
+        "assert not {'flask', 'app'} & set(sys.modules), sorted(sys.modules)"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_job_runs_in_the_pool(client):
+    experiment = client.post(
+        "/api/experiments",
+        json={"title": "Translate", "hypothesis": "h", "methods": "m"},
+    ).get_json()
+    jobs_url = f"/api/experiments/{experiment['id']}/jobs"
+
+    response = client.post(jobs_url, json={"kind": "translate", "sequence": "ATGGCC"})
+    assert response.status_code == 202
+
+    job_url = f"{jobs_url}/{response.get_json()['id']}"
+    deadline = time.monotonic() + 60
+    while client.get(job_url).get_json()["status"] in ("queued", "running"):
+        assert time.monotonic() < deadline
+        time.sleep(0.1)
+
+    assert client.get(job_url).get_json()["status"] == "succeeded"
+    translations = client.get(f"{job_url}/result").get_json()
+    assert translations[0]["protein"] == "MA"
@@ -0,0 +1,5 @@
+"""Code run in the job and alignment process pools.
+
+Nothing here imports Flask or the app package, so a spawned worker loads
+Biopython and little else instead of the whole web app.
+"""
@@ -0,0 +1,24 @@
+from Bio.Align import PairwiseAligner, substitution_matrices
+
+
+def align(target, query, options):
+    """Best alignment of ``query`` against ``target`` as a JSON-ready dict."""
+    options = dict(options)
+    matrix = options.pop("substitution_matrix")
+    aligner = PairwiseAligner(**options)
+    if matrix:
+        aligner.substitution_matrix = substitution_matrices.load(matrix)
+
+    alignments = aligner.align(target.upper(), query.upper())
+    alignment = alignments[0]
+    counts = alignment.counts()
+    return {
+        "score": alignment.score,
+        "length": alignment.length,
+        "identities": counts.identities,
+        "mismatches": counts.mismatches,
+        "gaps": counts.gaps,
+        "identity": counts.identities / alignment.length if alignment.length else 0,
+        "aligned": alignment.aligned.tolist(),
+        "alignment": alignment.format(),
+    }
@@ -0,0 +1,78 @@
+from Bio.Seq import Seq
+
+# CPU-bound sequence analyses run by app.jobs in worker processes. Each takes
+# the sequence text, a ``report(fraction)`` callback and keyword options, and
+# returns a JSON-serialisable result.
+
+
+def _frames(sequence):
+    """Yield ``(strand, frame, nucleotides)`` for the six reading frames."""
+    forward = Seq(sequence.upper())
+    for strand, nucleotides in ((1, forward), (-1, forward.reverse_complement())):
+        for frame in range(3):
+            usable = (len(nucleotides) - frame) // 3 * 3
+            yield strand, frame, nucleotides[frame : frame + usable]
+
+
+def six_frame_translation(sequence, report, table=1):
+    translations = []
+    for index, (strand, frame, nucleotides) in enumerate(_frames(sequence)):
+        translations.append(
+            {
+                "strand": strand,
+                "frame": frame,
+                "protein": str(nucleotides.translate(table=table)),
+            }
+        )
+        report((index + 1) / 6)
+    return translations
+
+
+def find_orfs(sequence, report, table=1, min_protein_length=30):
+    """Open reading frames from a start codon (M) to the next stop on all six
+    frames, with coordinates on the forward strand (0-based, end exclusive)."""
+    length = len(sequence)
+    orfs = []
+
+    for index, (strand, frame, nucleotides) in enumerate(_frames(sequence)):
+        protein = str(nucleotides.translate(table=table))
+        segment_start = 0
+        while segment_start < len(protein):
+            stop = protein.find("*", segment_start)
+            segment_end = len(protein) if stop == -1 else stop
+            start = protein.find("M", segment_start, segment_end)
+
+            if start != -1 and segment_end - start >= min_protein_length:
+                begin = frame + start * 3
+                end = frame + segment_end * 3 + (0 if stop == -1 else 3)
+                if strand == -1:
+                    begin, end = length - end, length - begin
+                orfs.append(
+                    {
+                        "start": begin,
+                        "end": end,
+                        "strand": strand,
+                        "frame": frame,
+                        "complete": stop != -1,
+                        "protein_length": segment_end - start,
+                        "protein": protein[start:segment_end],
+                    }
+                )
+
+            segment_start = segment_end + 1
+        report((index + 1) / 6)
+
+    orfs.sort(key=lambda orf: (orf["start"], orf["strand"]))
+    return orfs
+
+
+ANALYSES = {
+    "orfs": find_orfs,
+    "translate": six_frame_translation,
+}
+
+# Options each analysis accepts from the API, with their types.
+ANALYSIS_OPTIONS = {
+    "orfs": {"table": int, "min_protein_length": int},
+    "translate": {"table": int},
+}
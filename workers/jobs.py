@@ -0,0 +1,25 @@
+from .analyses import ANALYSES
+
+# Set in each worker process by init_worker.
+_progress = None
+_cancelled = None
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def init_worker(progress, cancelled):
+    global _progress, _cancelled
+    _progress, _cancelled = progress, cancelled
+
+
+def run(job_id, kind, sequence, options):
+    def report(fraction):
+        # Reporting progress doubles as the cancellation point.
+        if job_id in _cancelled:
+            raise JobCancelled()
+        _progress.put((job_id, fraction))
+
+    report(0.0)
+    return ANALYSES[kind](sequence, report, **options)